@@ -9,10 +9,7 @@ class ABTurbojet(pyc.Cycle):
 
     def setup(self):
 
-        USE_TABULAR = True
-
-        if USE_TABULAR: 
-            self.options['thermo_method'] = 'TABULAR'
+        if self.options['thermo_method'] == 'TABULAR':
             self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
             FUEL_TYPE = "FAR"
         else: 
@@ -166,10 +163,18 @@ def viewer(prob, pt, file=sys.stdout):
 
 class MPABTurbojet(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='TABULAR', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
+        thermo_method = self.options['thermo_method']
+
         # DESIGN CASE
-        self.pyc_add_pnt('DESIGN', ABTurbojet(design=True, thermo_method='CEA'))
+        self.pyc_add_pnt('DESIGN', ABTurbojet(design=True, thermo_method=thermo_method))
 
         self.set_input_defaults('DESIGN.Nmech', 8070.0, units='rpm'),
         self.set_input_defaults('DESIGN.inlet.MN', 0.60),
@@ -202,7 +207,7 @@ class MPABTurbojet(pyc.MPCycle):
         self.od_Rlines = [2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0, 2.0]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, ABTurbojet(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt(pt, ABTurbojet(design=False, thermo_method=thermo_method))
 
             self.set_input_defaults(pt+'.fc.MN', val=self.od_MNs[i])
             self.set_input_defaults(pt+'.fc.alt', val=self.od_alts[i], units='ft')
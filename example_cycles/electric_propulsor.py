@@ -9,9 +9,7 @@ class Propulsor(pyc.Cycle):
 
         design = self.options['design']
 
-        USE_TABULAR = True
-        if USE_TABULAR: 
-            self.options['thermo_method'] = 'TABULAR'
+        if self.options['thermo_method'] == 'TABULAR':
             self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
         else: 
             self.options['thermo_method'] = 'CEA'
@@ -110,9 +108,17 @@ def map_plots(prob, pt):
 
 class MPpropulsor(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='TABULAR', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
-        design = self.pyc_add_pnt('design', Propulsor(design=True, thermo_method='CEA'))
+        thermo_method = self.options['thermo_method']
+
+        design = self.pyc_add_pnt('design', Propulsor(design=True, thermo_method=thermo_method))
         self.pyc_add_cycle_param('pwr_target', 100.)
 
         # define the off-design conditions we want to run
@@ -122,7 +128,7 @@ class MPpropulsor(pyc.MPCycle):
         self.od_Rlines = [2.2,]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, Propulsor(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt(pt, Propulsor(design=False, thermo_method=thermo_method))
 
             self.set_input_defaults(pt+'.fc.MN', val=self.od_MNs[i])
             self.set_input_defaults(pt+'.fc.alt', val=self.od_alts, units='m') 
@@ -11,10 +11,7 @@ class MixedFlowTurbofan(pyc.Cycle):
     def setup(self):
         design = self.options['design']
 
-        USE_TABULAR = False
-
-        if USE_TABULAR: 
-            self.options['thermo_method'] = 'TABULAR'
+        if self.options['thermo_method'] == 'TABULAR':
             self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
             FUEL_TYPE = "FAR"
         else: 
@@ -227,9 +224,17 @@ def page_viewer(point):
 
 class MPMixedFlowTurbofan(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='CEA', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
-        self.pyc_add_pnt('DESIGN', MixedFlowTurbofan(design=True, thermo_method='CEA'))
+        thermo_method = self.options['thermo_method']
+
+        self.pyc_add_pnt('DESIGN', MixedFlowTurbofan(design=True, thermo_method=thermo_method))
 
         self.set_input_defaults('DESIGN.balance.rhs:BPR', 1.05 ,units=None) # defined as 1 over 2
         self.set_input_defaults('DESIGN.inlet.MN', 0.751)
@@ -279,7 +284,7 @@ class MPMixedFlowTurbofan(pyc.MPCycle):
         self.od_MNs = [0.8, ]
 
         for i,pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, MixedFlowTurbofan(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt(pt, MixedFlowTurbofan(design=False, thermo_method=thermo_method))
 
             self.set_input_defaults(pt+'.balance.rhs:FAR_core', self.od_T4s[i], units='degR')
             self.set_input_defaults(pt+'.fc.alt', self.od_alts[i], units='ft')
@@ -16,8 +16,14 @@ class MultiSpoolTurboshaft(pyc.Cycle):
 
         design = self.options['design']
         maxiter = self.options['maxiter']
-        self.options['thermo_method'] = 'CEA'
-        self.options['thermo_data'] = pyc.species_data.janaf
+
+        if self.options['thermo_method'] == 'TABULAR':
+            self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
+            FUEL_TYPE = 'FAR'
+        else:
+            self.options['thermo_method'] = 'CEA'
+            self.options['thermo_data'] = pyc.species_data.janaf
+            FUEL_TYPE = 'Jet-A(g)'
 
         self.add_subsystem('fc', pyc.FlightConditions())
         self.add_subsystem('inlet', pyc.Inlet())
@@ -32,7 +38,7 @@ class MultiSpoolTurboshaft(pyc.Cycle):
                            promotes_inputs=[('Nmech','HP_Nmech')])
         self.add_subsystem('bld3', pyc.BleedOut(bleed_names=['cool3','cool4']))
         self.add_subsystem('duct6', pyc.Duct())
-        self.add_subsystem('burner', pyc.Combustor(fuel_type='Jet-A(g)'))
+        self.add_subsystem('burner', pyc.Combustor(fuel_type=FUEL_TYPE))
         self.add_subsystem('hpt', pyc.Turbine(map_data=pyc.HPTMap, bleed_names=['cool3','cool4']),
                            promotes_inputs=[('Nmech','HP_Nmech')])
         self.add_subsystem('duct43', pyc.Duct())
@@ -196,9 +202,17 @@ def viewer(prob, pt, file=sys.stdout):
 
 class MPMultiSpool(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='CEA', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
-        self.pyc_add_pnt('DESIGN', MultiSpoolTurboshaft(thermo_method='CEA'))
+        thermo_method = self.options['thermo_method']
+
+        self.pyc_add_pnt('DESIGN', MultiSpoolTurboshaft(thermo_method=thermo_method))
 
         self.set_input_defaults('DESIGN.inlet.MN', 0.4),
         self.set_input_defaults('DESIGN.duct1.MN', 0.4),
@@ -246,7 +260,7 @@ class MPMultiSpool(pyc.MPCycle):
         self.od_MNs = [.5,]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, MultiSpoolTurboshaft(design=False, thermo_method='CEA', maxiter=10))
+            self.pyc_add_pnt(pt, MultiSpoolTurboshaft(design=False, thermo_method=thermo_method, maxiter=10))
 
             self.set_input_defaults(pt+'.balance.rhs:FAR', self.od_pwrs[i], units='hp')
             self.set_input_defaults(pt+'.LP_Nmech', self.od_Nmechs[i], units='rpm')
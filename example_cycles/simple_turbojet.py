@@ -9,10 +9,7 @@ class Turbojet(pyc.Cycle):
 
     def setup(self):
 
-        USE_TABULAR = True
-
-        if USE_TABULAR: 
-            self.options['thermo_method'] = 'TABULAR'
+        if self.options['thermo_method'] == 'TABULAR':
             self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
             FUEL_TYPE = "FAR"
         else: 
@@ -156,10 +153,18 @@ def map_plots(prob, pt):
 
 class MPTurbojet(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='TABULAR', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
+        thermo_method = self.options['thermo_method']
+
         # Create design instance of model
-        self.pyc_add_pnt('DESIGN', Turbojet(thermo_method='CEA'))
+        self.pyc_add_pnt('DESIGN', Turbojet(thermo_method=thermo_method))
 
         self.set_input_defaults('DESIGN.Nmech', 8070.0, units='rpm')
         self.set_input_defaults('DESIGN.inlet.MN', 0.60)
@@ -178,7 +183,7 @@ class MPTurbojet(pyc.MPCycle):
         self.od_Fns =[11000.0, 8000.0]
 
         for i,pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, Turbojet(design=False))
+            self.pyc_add_pnt(pt, Turbojet(design=False, thermo_method=thermo_method))
 
             self.set_input_defaults(pt+'.fc.MN', val=self.od_MNs[i])
             self.set_input_defaults(pt+'.fc.alt', self.od_alts[i], units='ft')
@@ -6,19 +6,23 @@ import pycycle.api as pyc
 
 class SingleSpoolTurboshaft(pyc.Cycle):
 
+    def initialize(self):
+        self.options.declare('fuel_type', default='JP-7',
+                             desc='fuel burned with CEA thermo. The TABULAR thermo data is for Jet-A')
+
+        super().initialize()
+
     def setup(self):
 
         design = self.options['design']
 
-        USE_TABULAR = False
-        if USE_TABULAR: 
-            self.options['thermo_method'] = 'TABULAR'
+        if self.options['thermo_method'] == 'TABULAR':
             self.options['thermo_data'] = pyc.AIR_JETA_TAB_SPEC
             FUEL_TYPE = "FAR"
         else: 
             self.options['thermo_method'] = 'CEA'
             self.options['thermo_data'] = pyc.species_data.janaf
-            FUEL_TYPE = 'JP-7'
+            FUEL_TYPE = self.options['fuel_type']
     
         # Add engine elements
         self.add_subsystem('fc', pyc.FlightConditions())
@@ -161,10 +165,21 @@ def viewer(prob, pt, file=sys.stdout):
 
 class MPSingleSpool(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='CEA', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+        self.options.declare('fuel_type', default='JP-7',
+                             desc='fuel burned with CEA thermo. The TABULAR thermo data is for Jet-A')
+
+        super().initialize()
+
     def setup(self):
 
+        thermo_method = self.options['thermo_method']
+        fuel_type = self.options['fuel_type']
+
         # Create design instance of model
-        self.pyc_add_pnt('DESIGN', SingleSpoolTurboshaft(thermo_method='CEA'))
+        self.pyc_add_pnt('DESIGN', SingleSpoolTurboshaft(thermo_method=thermo_method, fuel_type=fuel_type))
 
         self.set_input_defaults('DESIGN.HP_Nmech', 8070.0, units='rpm')
         self.set_input_defaults('DESIGN.LP_Nmech', 5000.0, units='rpm')
@@ -183,7 +198,7 @@ class MPSingleSpool(pyc.MPCycle):
         self.od_nmechs =[5000., 5000.]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, SingleSpoolTurboshaft(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt(pt, SingleSpoolTurboshaft(design=False, thermo_method=thermo_method, fuel_type=fuel_type))
 
             self.set_input_defaults(pt+'.fc.alt', self.od_alts[i], units='ft')
             self.set_input_defaults(pt+'.fc.MN', self.od_MNs[i])
@@ -1,12 +1,14 @@
 import numpy as np
 import unittest
 import os
+import time
 
 import openmdao.api as om
 import pycycle.api as pyc
 from openmdao.utils.assert_utils import assert_near_equal
 
 from example_cycles.high_bypass_turbofan import MPhbtf
+from pycycle.thermo.cea.chem_eq import ChemEq
 
 
 class HBTFTestCase(unittest.TestCase):
@@ -64,6 +66,54 @@ class HBTFTestCase(unittest.TestCase):
             self.prob[pt+'.hpc.map.RlineMap'] = 2.0
 
 
+    def _flight_env_sweep(self, cache_size):
+        """ run the flight envelope sweep from high_bypass_turbofan.py, counting the ChemEq newton iterations """
+
+        prob = self.prob
+        counter = [0]
+        for comp in prob.model.system_iter(recurse=True, typ=ChemEq):
+            comp.options['warm_start_cache'] = cache_size
+
+            solver = comp.nonlinear_solver
+            def _solve(solver=solver, _solve=solver._solve):
+                _solve()
+                counter[0] += solver._iter_count
+            solver._solve = _solve
+
+        prob.set_solver_print(level=-1)
+        prob.run_model()
+
+        flight_env = [(0.8, 35000), (0.7, 35000), (0.4, 35000),
+                      (0.4, 20000), (0.6, 20000), (0.8, 20000),
+                      (0.8, 10000), (0.6, 10000), (0.4, 10000), (0.2, 10000), (0.001, 10000),
+                      (.001, 1000), (0.2, 1000), (0.4, 1000), (0.6, 1000),
+                      (0.6, 0), (0.4, 0), (0.2, 0), (0.001, 0)]
+
+        for MN, alt in flight_env:
+            for pt in ('OD_full_pwr', 'OD_part_pwr'):
+                prob[pt+'.fc.MN'] = MN
+                prob[pt+'.fc.alt'] = alt
+
+            for PC in [1, 0.9, 0.8, .7, 1, 0.85]:
+                prob['OD_part_pwr.PC'] = PC
+                prob.run_model()
+
+        return counter[0], prob['OD_part_pwr.perf.TSFC'][0]
+
+    def benchmark_flight_env_eq_cache(self):
+        st = time.time()
+        iters_off, TSFC_off = self._flight_env_sweep(0)
+        t_off = time.time() - st
+
+        self.setUp()
+        st = time.time()
+        iters_on, TSFC_on = self._flight_env_sweep(256)
+        t_on = time.time() - st
+
+        print('\nChemEq newton iterations over the flight envelope')
+        print(f'cache off: {iters_off} ({t_off:.1f}s)  cache on: {iters_on} ({t_on:.1f}s)')
+        assert_near_equal(TSFC_on, TSFC_off, 1e-5)
+
     def benchmark_case1(self):
         np.seterr(divide='raise')
 
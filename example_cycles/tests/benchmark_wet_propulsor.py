@@ -1,6 +1,7 @@
 import numpy as np
 import unittest
 import os
+import time
 
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_near_equal
@@ -12,11 +13,11 @@ from example_cycles.wet_propulsor import MPWetPropulsor
 class WetPropulsorTestCase(unittest.TestCase): 
 
 
-    def benchmark_case1(self): 
+    def setup_problem(self, thermo_method='CEA'): 
 
         prob = om.Problem()
 
-        prob.model = mp_wet_propulsor = MPWetPropulsor()
+        prob.model = mp_wet_propulsor = MPWetPropulsor(thermo_method=thermo_method)
 
         prob.setup()
 
@@ -44,6 +45,12 @@ class WetPropulsorTestCase(unittest.TestCase):
         prob.model.off_design.nonlinear_solver.options['rtol'] = 1e-6
         prob.model.off_design.nonlinear_solver.options['maxiter'] = 10
 
+        return prob
+
+    def benchmark_case1(self): 
+
+        prob = self.setup_problem()
+
         prob.run_model()
 
         tol = 1e-5
@@ -57,5 +64,25 @@ class WetPropulsorTestCase(unittest.TestCase):
         assert_near_equal(prob['off_design.fan.SMN'], 36.6405753, tol)
         assert_near_equal(prob['off_design.fan.SMW'], 29.886, tol)
 
+    def benchmark_tabular(self): 
+
+        names = ('design.fc.Fl_O:stat:W', 'design.nozz.Fg', 'off_design.fc.Fl_O:stat:W', 'off_design.nozz.Fg')
+
+        results = {}
+        for thermo_method in ('CEA', 'TABULAR'):
+            prob = self.setup_problem(thermo_method)
+
+            st = time.time()
+            prob.run_model()
+            run_time = time.time() - st
+
+            results[thermo_method] = [prob[name][0] for name in names]
+            print(f'{thermo_method} run time: {run_time:.2f} s')
+
+        # the wet tables are interpolated linearly, so they only match CEA to within the table error.
+        # The low pressure ratio of the fan makes this cycle a sensitive check of it
+        for name, cea, tab in zip(names, results['CEA'], results['TABULAR']):
+            assert_near_equal(tab, cea, 1e-2)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
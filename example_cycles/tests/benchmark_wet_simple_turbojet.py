@@ -1,6 +1,7 @@
 import numpy as np
 import unittest
 import os
+import time
 
 import openmdao.api as om
 from openmdao.utils.assert_utils import assert_near_equal
@@ -12,11 +13,11 @@ from example_cycles.wet_simple_turbojet import MPWetTurbojet
 class WetSimpleTurbojetTestCase(unittest.TestCase): 
 
 
-    def benchmark_case1(self): 
+    def setup_problem(self, thermo_method='CEA', fuel_type='JP-7'): 
 
         prob = om.Problem()
 
-        prob.model = mp_wet_turbojet = MPWetTurbojet()
+        prob.model = mp_wet_turbojet = MPWetTurbojet(thermo_method=thermo_method, fuel_type=fuel_type)
         
 
         prob.setup()
@@ -42,6 +43,13 @@ class WetSimpleTurbojetTestCase(unittest.TestCase):
 
         prob.set_solver_print(level=-1)
         prob.set_solver_print(level=2, depth=1)
+
+        return prob
+
+    def benchmark_case1(self): 
+
+        prob = self.setup_problem()
+
         prob.run_model()
 
         tol = 1e-5
@@ -63,5 +71,25 @@ class WetSimpleTurbojetTestCase(unittest.TestCase):
 
         print()
 
+    def benchmark_tabular(self): 
+
+        names = ('DESIGN.inlet.Fl_O:stat:W', 'DESIGN.balance.FAR', 'DESIGN.balance.turb_PR', 'DESIGN.perf.TSFC', 
+                 'OD1.inlet.Fl_O:stat:W', 'OD1.balance.FAR', 'OD1.balance.Nmech', 'OD1.perf.TSFC')
+
+        # the wet tables are for Jet-A, so burn the same fuel in CEA for the comparison
+        results = {}
+        for thermo_method in ('CEA', 'TABULAR'):
+            prob = self.setup_problem(thermo_method, fuel_type='Jet-A(g)')
+
+            st = time.time()
+            prob.run_model()
+            run_time = time.time() - st
+
+            results[thermo_method] = [prob[name][0] for name in names]
+            print(f'{thermo_method} run time: {run_time:.2f} s')
+
+        for name, cea, tab in zip(names, results['CEA'], results['TABULAR']):
+            assert_near_equal(tab, cea, 5e-3)
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,341 @@
+"""
+Runs every example cycle with CEA and with TABULAR thermo, plus a random envelope of
+(FAR, P, T) points, and writes the errors, run times, setup times and Newton iteration counts to
+a json file. Keep the files from each release to spot accuracy or speed regressions.
+
+    python example_cycles/thermo_comparison.py thermo_comparison.json
+
+The machinery is in `pycycle.thermo.tabular.tab_cea_comparison`. Each case here gives the inputs and
+initial guesses of one example, the same ones its benchmark uses, and the outputs to compare.
+"""
+import os
+import sys
+import argparse
+
+import openmdao.api as om
+
+# so the example modules can be imported when this is run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pycycle.thermo.tabular.tab_cea_comparison import envelope_points, compare_points, compare_cycle, \
+    write_results
+
+from example_cycles.simple_turbojet import MPTurbojet
+from example_cycles.afterburning_turbojet import MPABTurbojet
+from example_cycles.electric_propulsor import MPpropulsor
+from example_cycles.high_bypass_turbofan import MPhbtf
+from example_cycles.mixedflow_turbofan import MPMixedFlowTurbofan
+from example_cycles.multi_spool_turboshaft import MPMultiSpool
+from example_cycles.single_spool_turboshaft import MPSingleSpool
+from example_cycles.wet_propulsor import MPWetPropulsor
+from example_cycles.wet_simple_turbojet import MPWetTurbojet
+
+
+def _simple_turbojet(prob):
+    prob.set_val('DESIGN.fc.alt', 0, units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.000001)
+    prob.set_val('DESIGN.balance.Fn_target', 11800.0, units='lbf')
+    prob.set_val('DESIGN.balance.T4_target', 2370.0, units='degR')
+    prob.set_val('DESIGN.comp.PR', 13.5)
+    prob.set_val('DESIGN.comp.eff', 0.83)
+    prob.set_val('DESIGN.turb.eff', 0.86)
+
+    prob['DESIGN.balance.FAR'] = 0.0175506829934
+    prob['DESIGN.balance.W'] = 168.453135137
+    prob['DESIGN.balance.turb_PR'] = 4.46138725662
+    prob['DESIGN.fc.balance.Pt'] = 14.6955113159
+    prob['DESIGN.fc.balance.Tt'] = 518.665288153
+
+    for pt in ('OD0', 'OD1'):
+        prob[pt+'.balance.W'] = 166.073
+        prob[pt+'.balance.FAR'] = 0.01680
+        prob[pt+'.balance.Nmech'] = 8197.38
+        prob[pt+'.fc.balance.Pt'] = 15.703
+        prob[pt+'.fc.balance.Tt'] = 558.31
+        prob[pt+'.turb.PR'] = 4.6690
+
+
+def _ab_turbojet(prob):
+    prob.set_val('DESIGN.comp.PR', 13.5)
+    prob.set_val('DESIGN.comp.eff', 0.83)
+    prob.set_val('DESIGN.turb.eff', 0.86)
+    prob.set_val('DESIGN.fc.alt', 0.0, units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.000001)
+    prob.set_val('DESIGN.balance.rhs:FAR', 2370.0, units='degR')
+    prob.set_val('DESIGN.balance.rhs:W', 11800.0, units='lbf')
+
+    prob['DESIGN.balance.FAR'] = 0.0175506829934
+    prob['DESIGN.balance.W'] = 168.453135137
+    prob['DESIGN.balance.turb_PR'] = 4.46138725662
+    prob['DESIGN.fc.balance.Pt'] = 14.6955113159
+    prob['DESIGN.fc.balance.Tt'] = 518.665288153
+
+    W_guess = [168.0, 225.917, 168.005, 225.917, 166.074, 141.2, 61.70780608, 145.635, 71.53855266, 33.347]
+    FAR_guess = [.01755, .016289, .01755, .01629, .0168, .01689, 0.01872827, .016083, 0.01619524, 0.015170]
+    Nmech_guess = [8070., 8288.85, 8070, 8288.85, 8197.39, 8181.03, 8902.24164717, 8326.586, 8306.00268554, 8467.2404]
+    Pt_guess = [14.696, 22.403, 14.696, 22.403, 15.7034, 13.230, 4.41149502, 14.707, 7.15363767, 3.7009]
+    Tt_guess = [518.67, 585.035, 518.67, 585.04, 558.310, 553.409, 422.29146617, 595.796, 589.9425019, 646.8115]
+    PR_guess = [4.4613, 4.8185, 4.4613, 4.8185, 4.669, 4.6425, 4.42779036, 4.8803, 4.84652723, 5.11582]
+
+    for i, pt in enumerate(prob.model.od_pts):
+        prob[pt+'.balance.W'] = W_guess[i]
+        prob[pt+'.balance.FAR'] = FAR_guess[i]
+        prob[pt+'.balance.Nmech'] = Nmech_guess[i]
+        prob[pt+'.fc.balance.Pt'] = Pt_guess[i]
+        prob[pt+'.fc.balance.Tt'] = Tt_guess[i]
+        prob[pt+'.turb.PR'] = PR_guess[i]
+
+
+def _electric_propulsor(prob):
+    prob.set_val('design.fc.alt', 10000, units='m')
+    prob.set_val('design.fc.MN', 0.8)
+    prob.set_val('design.inlet.MN', 0.6)
+    prob.set_val('design.fan.PR', 1.2)
+    prob.set_val('pwr_target', -3486.657, units='hp')
+    prob.set_val('design.fan.eff', 0.96)
+    prob.set_val('off_design.fc.alt', 12000, units='m')
+
+    prob['design.balance.W'] = 200.
+
+    prob['off_design.fan.PR'] = 1.2
+    prob['off_design.balance.W'] = 406.790
+    prob['off_design.balance.Nmech'] = 1.
+
+    prob.model.off_design.nonlinear_solver.options['maxiter'] = 10
+
+
+def _hbtf(prob):
+    prob.set_val('DESIGN.fan.PR', 1.685)
+    prob.set_val('DESIGN.fan.eff', 0.8948)
+    prob.set_val('DESIGN.lpc.PR', 1.935)
+    prob.set_val('DESIGN.lpc.eff', 0.9243)
+    prob.set_val('DESIGN.hpc.PR', 9.369)
+    prob.set_val('DESIGN.hpc.eff', 0.8707)
+    prob.set_val('DESIGN.hpt.eff', 0.8888)
+    prob.set_val('DESIGN.lpt.eff', 0.8996)
+    prob.set_val('DESIGN.fc.alt', 35000., units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.8)
+    prob.set_val('DESIGN.T4_MAX', 2857, units='degR')
+    prob.set_val('DESIGN.Fn_DES', 5900.0, units='lbf')
+    prob.set_val('OD_full_pwr.T4_MAX', 2857, units='degR')
+    prob.set_val('OD_part_pwr.PC', 0.8)
+
+    prob['DESIGN.balance.FAR'] = 0.025
+    prob['DESIGN.balance.W'] = 100.
+    prob['DESIGN.balance.lpt_PR'] = 4.0
+    prob['DESIGN.balance.hpt_PR'] = 3.0
+    prob['DESIGN.fc.balance.Pt'] = 5.2
+    prob['DESIGN.fc.balance.Tt'] = 440.0
+
+    for pt in ('OD_full_pwr', 'OD_part_pwr'):
+        prob[pt+'.balance.FAR'] = 0.02467
+        prob[pt+'.balance.W'] = 300
+        prob[pt+'.balance.BPR'] = 5.105
+        prob[pt+'.balance.lp_Nmech'] = 5000
+        prob[pt+'.balance.hp_Nmech'] = 15000
+        prob[pt+'.hpt.PR'] = 3.
+        prob[pt+'.lpt.PR'] = 4.
+        prob[pt+'.fan.map.RlineMap'] = 2.0
+        prob[pt+'.lpc.map.RlineMap'] = 2.0
+        prob[pt+'.hpc.map.RlineMap'] = 2.0
+
+
+def _mixedflow_turbofan(prob):
+    prob.set_val('DESIGN.fc.alt', 35000., units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.8)
+    prob.set_val('DESIGN.balance.rhs:W', 5500.0, units='lbf')
+    prob.set_val('DESIGN.balance.rhs:FAR_core', 3200, units='degR')
+    prob.set_val('OD.balance.rhs:FAR_core', 3200, units='degR')
+    prob.set_val('DESIGN.fan.PR', 3.3)
+    prob.set_val('DESIGN.lpc.PR', 1.935)
+    prob.set_val('DESIGN.hpc.PR', 4.9)
+    prob.set_val('DESIGN.fan.eff', 0.8948)
+    prob.set_val('DESIGN.lpc.eff', 0.9243)
+    prob.set_val('DESIGN.hpc.eff', 0.8707)
+    prob.set_val('DESIGN.hpt.eff', 0.8888)
+    prob.set_val('DESIGN.lpt.eff', 0.8996)
+
+    prob['DESIGN.balance.FAR_core'] = 0.025
+    prob['DESIGN.balance.FAR_ab'] = 0.025
+    prob['DESIGN.balance.BPR'] = 1.0
+    prob['DESIGN.balance.W'] = 100.
+    prob['DESIGN.balance.lpt_PR'] = 3.5
+    prob['DESIGN.balance.hpt_PR'] = 2.5
+    prob['DESIGN.fc.balance.Pt'] = 5.2
+    prob['DESIGN.fc.balance.Tt'] = 440.0
+    prob['DESIGN.mixer.balance.P_tot'] = 100
+
+    prob['OD.balance.FAR_core'] = 0.031
+    prob['OD.balance.FAR_ab'] = 0.038
+    prob['OD.balance.BPR'] = 2.2
+    prob['OD.balance.W'] = 60
+    prob['OD.balance.HP_Nmech'] = 15000
+    prob['OD.balance.LP_Nmech'] = 5000
+    prob['OD.fc.balance.Pt'] = 5.2
+    prob['OD.fc.balance.Tt'] = 440.0
+    prob['OD.mixer.balance.P_tot'] = 100
+    prob['OD.hpt.PR'] = 2.5
+    prob['OD.lpt.PR'] = 3.5
+    prob['OD.fan.map.RlineMap'] = 2.0
+    prob['OD.lpc.map.RlineMap'] = 2.0
+    prob['OD.hpc.map.RlineMap'] = 2.0
+
+
+def _multi_spool_turboshaft(prob):
+    prob.set_val('DESIGN.lpc.PR', 5.000)
+    prob.set_val('DESIGN.lpc.eff', 0.8900)
+    prob.set_val('DESIGN.hpc_axi.PR', 3.0)
+    prob.set_val('DESIGN.hpc_axi.eff', 0.8900)
+    prob.set_val('DESIGN.hpc_centri.PR', 2.7)
+    prob.set_val('DESIGN.hpc_centri.eff', 0.8800)
+    prob.set_val('DESIGN.hpt.eff', 0.89)
+    prob.set_val('DESIGN.lpt.eff', 0.9)
+    prob.set_val('DESIGN.pt.eff', 0.85)
+    prob.set_val('DESIGN.fc.alt', 28000., units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.5)
+    prob.set_val('DESIGN.balance.rhs:FAR', 2740.0, units='degR')
+    prob.set_val('DESIGN.balance.rhs:W', 1.1)
+
+    prob['DESIGN.balance.FAR'] = 0.02261
+    prob['DESIGN.balance.W'] = 10.76
+    prob['DESIGN.balance.pt_PR'] = 4.939
+    prob['DESIGN.balance.lpt_PR'] = 1.979
+    prob['DESIGN.balance.hpt_PR'] = 4.236
+    prob['DESIGN.fc.balance.Pt'] = 5.666
+    prob['DESIGN.fc.balance.Tt'] = 440.0
+
+    prob['OD.balance.FAR'] = 0.02135
+    prob['OD.balance.W'] = 10.775
+    prob['OD.balance.HP_Nmech'] = 14800.000
+    prob['OD.balance.IP_Nmech'] = 12000.000
+    prob['OD.hpt.PR'] = 4.233
+    prob['OD.lpt.PR'] = 1.979
+    prob['OD.pt.PR'] = 4.919
+    prob['OD.fc.balance.Pt'] = 5.666
+    prob['OD.fc.balance.Tt'] = 440.0
+    prob['OD.nozzle.PR'] = 1.1
+
+
+def _single_spool_turboshaft(prob):
+    prob.set_val('DESIGN.fc.alt', 0.0, units='ft')
+    prob.set_val('DESIGN.fc.MN', 0.000001)
+    prob.set_val('DESIGN.balance.T4_target', 2370.0, units='degR')
+    prob.set_val('DESIGN.balance.pwr_target', 4000.0, units='hp')
+    prob.set_val('DESIGN.balance.nozz_PR_target', 1.2)
+    prob.set_val('DESIGN.comp.PR', 13.5)
+    prob.set_val('DESIGN.comp.eff', 0.83)
+    prob.set_val('DESIGN.turb.eff', 0.86)
+    prob.set_val('DESIGN.pt.eff', 0.9)
+
+    prob['DESIGN.balance.FAR'] = 0.0175506829934
+    prob['DESIGN.balance.W'] = 27.265
+    prob['DESIGN.balance.turb_PR'] = 3.8768
+    prob['DESIGN.balance.pt_PR'] = 2.8148
+    prob['DESIGN.fc.balance.Pt'] = 14.6955113159
+    prob['DESIGN.fc.balance.Tt'] = 518.665288153
+
+    for pt in prob.model.od_pts:
+        prob[pt+'.balance.W'] = 27.265
+        prob[pt+'.balance.FAR'] = 0.0175506829934
+        prob[pt+'.balance.HP_Nmech'] = 8070.0
+        prob[pt+'.fc.balance.Pt'] = 15.703
+        prob[pt+'.fc.balance.Tt'] = 558.31
+        prob[pt+'.turb.PR'] = 3.8768
+        prob[pt+'.pt.PR'] = 2.8148
+
+
+def _wet_propulsor(prob):
+    prob.set_val('design.fan.PR', 1.2)
+    prob.set_val('design.fan.eff', 0.96)
+
+    prob['design.fc.MN'] = .8
+    prob['design.balance.W'] = 200.
+
+    prob['off_design.fc.MN'] = .8
+    prob['off_design.balance.W'] = 406.790
+    prob['off_design.balance.Nmech'] = 1.
+    prob['off_design.fan.PR'] = 1.2
+    prob['off_design.fan.map.RlineMap'] = 2.2
+
+    prob.model.off_design.nonlinear_solver.options['maxiter'] = 10
+
+
+def _wet_simple_turbojet(prob):
+    prob.set_val('DESIGN.comp.PR', 13.5)
+    prob.set_val('DESIGN.comp.eff', 0.83)
+    prob.set_val('DESIGN.turb.eff', 0.86)
+
+    prob['DESIGN.balance.FAR'] = 0.0175506829934
+    prob['DESIGN.balance.W'] = 168.453135137
+    prob['DESIGN.balance.turb_PR'] = 4.46138725662
+    prob['DESIGN.fc.balance.Pt'] = 14.6955113159
+    prob['DESIGN.fc.balance.Tt'] = 518.665288153
+
+    prob['OD1.balance.W'] = 166.073
+    prob['OD1.balance.FAR'] = 0.01680
+    prob['OD1.balance.Nmech'] = 8197.38
+    prob['OD1.fc.balance.Pt'] = 15.703
+    prob['OD1.fc.balance.Tt'] = 558.31
+    prob['OD1.turb.PR'] = 4.6690
+
+
+# name: (function giving the model for a thermo method, function setting the inputs and guesses, outputs to compare)
+# The TABULAR data is for Jet-A, so every CEA model burns Jet-A too.
+CASES = {
+    'simple_turbojet': (lambda thermo_method: MPTurbojet(thermo_method=thermo_method), _simple_turbojet,
+                        ('DESIGN.balance.W', 'DESIGN.balance.FAR', 'DESIGN.perf.TSFC',
+                         'OD0.balance.FAR', 'OD0.perf.TSFC', 'OD1.balance.FAR', 'OD1.perf.TSFC')),
+    'afterburning_turbojet': (lambda thermo_method: MPABTurbojet(thermo_method=thermo_method), _ab_turbojet,
+                              ('DESIGN.balance.W', 'DESIGN.balance.FAR', 'DESIGN.perf.TSFC', 'OD1.perf.TSFC')),
+    'electric_propulsor': (lambda thermo_method: MPpropulsor(thermo_method=thermo_method), _electric_propulsor,
+                           ('design.fc.Fl_O:stat:W', 'design.nozz.Fg', 'off_design.nozz.Fg')),
+    'high_bypass_turbofan': (lambda thermo_method: MPhbtf(thermo_method=thermo_method), _hbtf,
+                             ('DESIGN.inlet.Fl_O:stat:W', 'DESIGN.balance.FAR', 'DESIGN.perf.TSFC',
+                              'OD_full_pwr.perf.TSFC', 'OD_part_pwr.perf.TSFC')),
+    'mixedflow_turbofan': (lambda thermo_method: MPMixedFlowTurbofan(thermo_method=thermo_method), _mixedflow_turbofan,
+                           ('DESIGN.balance.W', 'DESIGN.balance.FAR_core', 'DESIGN.perf.TSFC', 'OD.perf.TSFC')),
+    'multi_spool_turboshaft': (lambda thermo_method: MPMultiSpool(thermo_method=thermo_method), _multi_spool_turboshaft,
+                               ('DESIGN.balance.W', 'DESIGN.balance.FAR', 'OD.balance.FAR')),
+    'single_spool_turboshaft': (lambda thermo_method: MPSingleSpool(thermo_method=thermo_method, fuel_type='Jet-A(g)'),
+                                _single_spool_turboshaft,
+                                ('DESIGN.balance.W', 'DESIGN.balance.FAR', 'OD.balance.FAR', 'OD2.balance.FAR')),
+    'wet_propulsor': (lambda thermo_method: MPWetPropulsor(thermo_method=thermo_method), _wet_propulsor,
+                      ('design.fc.Fl_O:stat:W', 'design.nozz.Fg', 'off_design.nozz.Fg')),
+    'wet_simple_turbojet': (lambda thermo_method: MPWetTurbojet(thermo_method=thermo_method, fuel_type='Jet-A(g)'),
+                            _wet_simple_turbojet,
+                            ('DESIGN.inlet.Fl_O:stat:W', 'DESIGN.balance.FAR', 'DESIGN.perf.TSFC', 'OD1.perf.TSFC')),
+}
+
+
+def compare_all(cases=None, num_points=200, seed=0, verbose=True):
+    """
+    Compare the two thermo methods over the random envelope and for each of the `cases` (all by default).
+    """
+    if cases is None:
+        cases = list(CASES)
+
+    results = {'envelope': dict(compare_points(*envelope_points(num_points, seed=seed)), seed=seed),
+               'cycles': {}}
+
+    for name in cases:
+        make_model, setup_values, outputs = CASES[name]
+        results['cycles'][name] = res = compare_cycle(lambda thermo_method: om.Problem(make_model(thermo_method)),
+                                                      setup_values, outputs)
+
+        if verbose:
+            print(f"{name}: CEA {res['CEA']['run_time']:.2f} s, TABULAR {res['TABULAR']['run_time']:.2f} s, "
+                  f"max error {max(res['error'].values()):.2e}")
+
+    return results
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Compare TABULAR thermo with CEA for the example cycles')
+    parser.add_argument('out_file', help='json file to write the results to')
+    parser.add_argument('--cases', nargs='*', default=None, choices=list(CASES), help='cycles to run. Defaults to all')
+    parser.add_argument('--num_points', type=int, default=200, help='number of random (FAR, P, T) points')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random points')
+    args = parser.parse_args()
+
+    write_results(args.out_file, compare_all(args.cases, num_points=args.num_points, seed=args.seed))
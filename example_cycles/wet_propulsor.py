@@ -9,13 +9,19 @@ class WetPropulsor(pyc.Cycle):
 
         design = self.options['design']
 
-        # NOTE: DEFAULT TABULAR thermo doesn't include WAR, so must use CEA here
-        # (or build your own thermo tables)
-        self.options['thermo_method'] = 'CEA'
-        self.options['thermo_data'] = pyc.species_data.wet_air
+        # the default TABULAR thermo doesn't include WAR, so use the wet air tables
+        if self.options['thermo_method'] == 'TABULAR':
+            self.options['thermo_data'] = pyc.AIR_JETA_WET_TAB_SPEC
+            COMPOSITION = pyc.TAB_WET_AIR_FUEL_COMPOSITION
+            WATER = 'WAR'
+        else:
+            self.options['thermo_method'] = 'CEA'
+            self.options['thermo_data'] = pyc.species_data.wet_air
+            COMPOSITION = pyc.CEA_AIR_COMPOSITION
+            WATER = 'Water'
 
-        self.add_subsystem('fc', pyc.FlightConditions(composition=pyc.CEA_AIR_COMPOSITION, 
-                                                      reactant='Water',
+        self.add_subsystem('fc', pyc.FlightConditions(composition=COMPOSITION, 
+                                                      reactant=WATER,
                                                       mix_ratio_name='WAR'))
 
         self.add_subsystem('inlet', pyc.Inlet())
@@ -99,9 +105,17 @@ def viewer(prob, pt):
 
 class MPWetPropulsor(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='CEA', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+
+        super().initialize()
+
     def setup(self):
 
-        design = self.pyc_add_pnt('design', WetPropulsor(design=True, thermo_method='CEA'))
+        thermo_method = self.options['thermo_method']
+
+        design = self.pyc_add_pnt('design', WetPropulsor(design=True, thermo_method=thermo_method))
 
         self.set_input_defaults('design.fc.alt', 10000., units="m")
         self.set_input_defaults('design.fc.MN', .72)
@@ -116,7 +130,7 @@ class MPWetPropulsor(pyc.MPCycle):
         self.od_WARs = [.001,]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt('off_design', WetPropulsor(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt('off_design', WetPropulsor(design=False, thermo_method=thermo_method))
 
             self.set_input_defaults(pt+'.fc.alt', self.od_alts[i], units='m')
             self.set_input_defaults(pt+'.fc.MN', self.od_MNs[i])
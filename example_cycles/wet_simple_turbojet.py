@@ -7,26 +7,39 @@ import pycycle.api as pyc
 
 class WetTurbojet(pyc.Cycle):
 
+    def initialize(self):
+        self.options.declare('fuel_type', default='JP-7',
+                             desc='fuel burned with CEA thermo. The wet TABULAR thermo data is for Jet-A')
+
+        super().initialize()
+
     def setup(self):
 
         design = self.options['design']
 
-        # NOTE: DEFAULT TABULAR thermo doesn't include WAR, so must use CEA here
-        # (or build your own thermo tables)
-
-        self.options['thermo_method'] = 'CEA'
-        self.options['thermo_data'] = pyc.species_data.wet_air
+        # the default TABULAR thermo doesn't include WAR, so use the wet air tables
+        if self.options['thermo_method'] == 'TABULAR':
+            self.options['thermo_data'] = pyc.AIR_JETA_WET_TAB_SPEC
+            COMPOSITION = pyc.TAB_WET_AIR_FUEL_COMPOSITION
+            WATER = 'WAR'
+            FUEL_TYPE = 'FAR'
+        else:
+            self.options['thermo_method'] = 'CEA'
+            self.options['thermo_data'] = pyc.species_data.wet_air
+            COMPOSITION = pyc.CEA_AIR_COMPOSITION
+            WATER = 'Water'
+            FUEL_TYPE = self.options['fuel_type']
 
         # Add engine elements
-        self.add_subsystem('fc', pyc.FlightConditions(composition=pyc.CEA_AIR_COMPOSITION, 
-                                                      reactant='Water',
+        self.add_subsystem('fc', pyc.FlightConditions(composition=COMPOSITION, 
+                                                      reactant=WATER,
                                                       mix_ratio_name='WAR')) 
 
         self.add_subsystem('inlet', pyc.Inlet())
         self.add_subsystem('comp', pyc.Compressor(map_data=pyc.AXI5),
                                     promotes_inputs=['Nmech'])
 
-        self.add_subsystem('burner', pyc.Combustor(fuel_type='JP-7'))
+        self.add_subsystem('burner', pyc.Combustor(fuel_type=FUEL_TYPE))
         self.add_subsystem('turb', pyc.Turbine(map_data=pyc.LPT2269),
                                     promotes_inputs=['Nmech'])
         self.add_subsystem('nozz', pyc.Nozzle(nozzType='CD', lossCoef='Cv'))
@@ -150,10 +163,21 @@ def viewer(prob, pt, file=sys.stdout):
 
 class MPWetTurbojet(pyc.MPCycle):
 
+    def initialize(self):
+        self.options.declare('thermo_method', default='CEA', values=('CEA', 'TABULAR'),
+                             desc='thermo used by every point')
+        self.options.declare('fuel_type', default='JP-7',
+                             desc='fuel burned with CEA thermo. The wet TABULAR thermo data is for Jet-A')
+
+        super().initialize()
+
     def setup(self):
 
+        thermo_method = self.options['thermo_method']
+        fuel_type = self.options['fuel_type']
+
         # Create design instance of model
-        self.pyc_add_pnt('DESIGN', WetTurbojet(thermo_method='CEA'))
+        self.pyc_add_pnt('DESIGN', WetTurbojet(thermo_method=thermo_method, fuel_type=fuel_type))
 
         self.set_input_defaults('DESIGN.fc.alt', 0.0, units='ft'),
         self.set_input_defaults('DESIGN.fc.MN', 0.000001),
@@ -175,7 +199,7 @@ class MPWetTurbojet(pyc.MPCycle):
         self.od_pwrs = [11000.0,]
 
         for i, pt in enumerate(self.od_pts):
-            self.pyc_add_pnt(pt, WetTurbojet(design=False, thermo_method='CEA'))
+            self.pyc_add_pnt(pt, WetTurbojet(design=False, thermo_method=thermo_method, fuel_type=fuel_type))
 
             self.set_input_defaults(pt+'.fc.MN', self.od_MNs[i]),
             self.set_input_defaults(pt+'.fc.alt', self.od_alts[i], units='ft'),
@@ -1,7 +1,8 @@
 import warnings
 import os
 import os.path
-import pickle
+
+from pycycle.thermo.tabular.tab_spec import LazySpec
 
 class DeprecatedDict(dict): 
 
@@ -26,16 +27,23 @@ CEA_WET_AIR_COMPOSITION = {'Ar':3.21320739e-04, 'C':1.09451485e-05, 'H':6.862162
 CEA_CO2_CO_O2_COMPOSITION = {'C':0.02272237, 'O':0.04544473}
 
 TAB_AIR_FUEL_COMPOSITION = {'FAR': 0.0}
+TAB_WET_AIR_FUEL_COMPOSITION = {'FAR': 0.0, 'WAR': 0.0}
 # A little fancy code to find the default thermo data in the python package, wherever its installed
 pkg_path = os.path.dirname(os.path.realpath(__file__))
-tab_spec_path = os.path.join(pkg_path, 'thermo', 'tabular', 'air_jetA.pkl')
-with open(tab_spec_path, 'rb') as spec_data:
-    AIR_JETA_TAB_SPEC = pickle.load(spec_data)
+# the default is the coarse table that ships with pycycle. A finer one can be made with 
+# example_cycles/tab_thermo_data_generator.py and loaded with LazySpec(<its directory>)
+tab_spec_path = os.path.join(pkg_path, 'thermo', 'tabular', 'air_jetA_coarse.pkl')
+# the data is only read the first time it gets used
+AIR_JETA_TAB_SPEC = LazySpec(tab_spec_path)
+# wet air and Jet-A, on a (FAR, WAR, P, T) grid
+tab_wet_spec_dir = os.path.join(pkg_path, 'thermo', 'tabular', 'air_jetA_wet')
+AIR_JETA_WET_TAB_SPEC = LazySpec(tab_wet_spec_dir)
 
 
 THERMO_DEFAULT_COMPOSITIONS = {
     'CEA': CEA_AIR_COMPOSITION, 
-    'TABULAR': TAB_AIR_FUEL_COMPOSITION
+    'TABULAR': TAB_AIR_FUEL_COMPOSITION, 
+    'FROZEN': CEA_AIR_COMPOSITION, 
 }
 
 
@@ -69,4 +77,4 @@ P_REF = 1.01325 # 1 atm
 # P_REF = 1.0162 # Not sure why, but this seems to match the SP set to the TP better
 
 
-ALLOWED_THERMOS = ('CEA', 'TABULAR')
\ No newline at end of file
+ALLOWED_THERMOS = ('CEA', 'TABULAR', 'FROZEN')
\ No newline at end of file
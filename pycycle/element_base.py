@@ -1,7 +1,7 @@
 import numpy as np
 import openmdao.api as om
 
-from pycycle.flow_in import FlowIn
+from pycycle.flow_in import FlowIn, PackedOutputs, PACKED_VARS, PACKED_PARTS
 from pycycle.thermo.thermo import Thermo, ThermoAdd
 from pycycle.constants import ALLOWED_THERMOS
 
@@ -18,6 +18,12 @@ class Element(om.Group):
         self.Fl_I_data = {}
         self.Fl_O_data = {}
 
+        # parts of the flow station ('tot', 'stat') that go in and out of each port packed, set by the Cycle
+        self.Fl_I_packed = {}
+        self.Fl_O_packed = {}
+        # input ports that only get the flow station variables the element uses, set by the Cycle
+        self.Fl_I_lean = set()
+
     def initialize(self): 
 
         self.options.declare('design', default=True, 
@@ -27,6 +33,78 @@ class Element(om.Group):
         self.options.declare('thermo_method', default='CEA', values=ALLOWED_THERMOS,
                               desc='Method for computing thermodynamic properties')
 
+    def add_subsystem(self, name, subsys, **kwargs): 
+        """
+        Customized version of the OpenMDAO Group API method that gives the FlowIn of each
+        input port its composition, and sets it up if the flow comes in packed or lean
+        """
+
+        if isinstance(subsys, FlowIn): 
+            fl_name = subsys.options['fl_name']
+            if fl_name in self.Fl_I_data: 
+                subsys.options['composition'] = self.Fl_I_data[fl_name]
+            if fl_name in self.Fl_I_packed: 
+                subsys.options['packed'] = self.Fl_I_packed[fl_name]
+            subsys.options['lean'] = fl_name in self.Fl_I_lean
+
+        return super().add_subsystem(name, subsys, **kwargs)
+
+    def configure(self): 
+
+        # packed inputs are only unpacked into the variables the other subsystems promote
+        flow_ins = [s for s in self._subsystems_myproc if isinstance(s, FlowIn) and s.options['packed']]
+        if flow_ins: 
+            prom_inputs = set()
+            for subsys in self._subsystems_myproc: 
+                if subsys not in flow_ins: 
+                    prom_inputs.update(prom for prom, _, _, _ in subsys._get_promotion_maps()['input'].values())
+            for flow_in in flow_ins: 
+                flow_in.unpack(prom_inputs)
+
+        # packed outputs can only be added once the thermo has set up its outputs
+        for port, parts in self.Fl_O_packed.items(): 
+            for part in parts: 
+                for name in PACKED_PARTS[part]: 
+                    self._add_packed_output(port, name)
+
+    def _add_packed_output(self, port, name): 
+        """
+        Add the packed output `name` ('tot:packed', 'stat:packed' or 'stat:packed_flow') of the
+        output port to the component that gives its flow station variables
+        """
+        variables = PACKED_VARS[name]
+        if name == 'tot:packed': 
+            variables += (('tot:composition', None),)
+
+        for subsys in self._subsystems_myproc: 
+            prom2abs = subsys._var_allprocs_prom2abs_list['output']
+            if f'{port}:{variables[0][0]}' in prom2abs: 
+                break
+        else: 
+            raise RuntimeError(f'{self.msginfo}: Can not pack the flow of {port}, it has no {port}:{variables[0][0]} output.')
+
+        abs_names = []
+        for var, _ in variables: 
+            if f'{port}:{var}' not in prom2abs: 
+                raise RuntimeError(f'{self.msginfo}: Can not pack the flow of {port}, its {name.split(":")[0]} '
+                                   f'variables come from more than one subsystem.')
+            abs_names.append(prom2abs[f'{port}:{var}'][0])
+
+        comp_path = abs_names[0].rsplit('.', 1)[0]
+        if any(abs_name.rsplit('.', 1)[0] != comp_path for abs_name in abs_names): 
+            raise RuntimeError(f'{self.msginfo}: Can not pack the flow of {port}, its {name.split(":")[0]} '
+                               f'variables come from more than one component.')
+
+        comp = self._get_subsystem(comp_path[len(self.pathname)+1:])
+        if not isinstance(comp, PackedOutputs): 
+            raise RuntimeError(f'{self.msginfo}: Can not pack the flow of {port}, {comp.msginfo} can not give packed outputs.')
+
+        # named like the outputs it packs, so it gets promoted along with them
+        out_names = [abs_name.rsplit('.', 1)[1] for abs_name in abs_names]
+        packed_name = out_names[0].rsplit(':', 1)[0] + ':' + name.split(':')[-1]
+        if packed_name not in comp._var_rel2meta: 
+            comp.add_packed_output(packed_name, out_names, units=[units for _, units in variables])
+
     def copy_flow(self, src_port, output_port): 
         """
         Copy the flow data from `src_from` port to `target_to` port
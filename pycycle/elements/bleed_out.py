@@ -8,7 +8,7 @@ import openmdao.api as om
 from pycycle.thermo.cea import species_data
 from pycycle.thermo.thermo import Thermo
 from pycycle.flow_in import FlowIn
-from pycycle.passthrough import PassThrough
+from pycycle.passthrough import PassThrough, TotalsPassThrough, TOT_VARS
 from pycycle.element_base import Element
 
 class BleedCalcs(om.ExplicitComponent):
@@ -86,6 +86,11 @@ class BleedOut(Element):
                               desc='If True, calculate static properties.')
         self.options.declare('bleed_names', types=(list,tuple), desc='list of names for the bleed ports',
                               default=[])
+        self.options.declare('totals', default='recompute', values=('recompute', 'once', 'forward'),
+                              desc='How the outlet total states are found. "recompute" solves the thermo for each '
+                                   'outlet, "once" solves it for Fl_O and copies it to the bleeds, and "forward" '
+                                   'copies the Fl_I totals to every outlet without any thermo. "forward" needs Fl_I '
+                                   'to be a consistent total state, as it is when it comes from an upstream element.')
         
         self.default_des_od_conns = [
             # (design src, off-design target)
@@ -119,26 +124,39 @@ class BleedOut(Element):
                            promotes_inputs=[('W_in', 'Fl_I:stat:W'), '*:frac_W'],
                            promotes_outputs=['W_out']+bld_port_globs)
 
-        bleed_names = []
-        for BN in bleeds:
+        totals = self.options['totals']
 
-            bleed_names.append(BN+'_flow')
-            bleed_flow = Thermo(mode='total_TP', fl_name=BN+":tot", 
-                                method=thermo_method, 
-                                thermo_kwargs={'composition':composition, 
-                                               'spec':thermo_data})
-            self.add_subsystem(BN+'_flow', bleed_flow,
-                               promotes_inputs=[('composition', 'Fl_I:tot:composition'),('T','Fl_I:tot:T'),('P','Fl_I:tot:P')],
-                               promotes_outputs=['{}:tot:*'.format(BN)])
+        if totals == 'recompute':
+            for BN in bleeds:
+
+                bleed_flow = Thermo(mode='total_TP', fl_name=BN+":tot", 
+                                    method=thermo_method, 
+                                    thermo_kwargs={'composition':composition, 
+                                                   'spec':thermo_data})
+                self.add_subsystem(BN+'_flow', bleed_flow,
+                                   promotes_inputs=[('composition', 'Fl_I:tot:composition'),('T','Fl_I:tot:T'),('P','Fl_I:tot:P')],
+                                   promotes_outputs=['{}:tot:*'.format(BN)])
 
         # Total Calc
-        real_flow = Thermo(mode='total_TP', fl_name="Fl_O:tot", 
-                           method=thermo_method, 
-                           thermo_kwargs={'composition':composition, 
-                                          'spec':thermo_data})
-        prom_in = [('composition', 'Fl_I:tot:composition'),('T','Fl_I:tot:T'),('P','Fl_I:tot:P')]
-        self.add_subsystem('real_flow', real_flow, promotes_inputs=prom_in,
-                           promotes_outputs=['Fl_O:*'])
+        if totals != 'forward':
+            real_flow = Thermo(mode='total_TP', fl_name="Fl_O:tot", 
+                               method=thermo_method, 
+                               thermo_kwargs={'composition':composition, 
+                                              'spec':thermo_data})
+            prom_in = [('composition', 'Fl_I:tot:composition'),('T','Fl_I:tot:T'),('P','Fl_I:tot:P')]
+            self.add_subsystem('real_flow', real_flow, promotes_inputs=prom_in,
+                               promotes_outputs=['Fl_O:*'])
+
+        # Copy the totals that are the same to the other outlets
+        if totals == 'once' and bleeds:
+            self.add_subsystem('tot_passthru', TotalsPassThrough(fl_names=bleeds, composition=composition),
+                               promotes_outputs=[f'{BN}:tot:*' for BN in bleeds])
+            for var, _ in TOT_VARS:
+                self.connect(f'Fl_O:tot:{var}', f'tot_passthru.tot:{var}')
+        elif totals == 'forward':
+            self.add_subsystem('tot_passthru', TotalsPassThrough(fl_names=['Fl_O']+list(bleeds), composition=composition),
+                               promotes_inputs=[(f'tot:{var}', f'Fl_I:tot:{var}') for var, _ in TOT_VARS],
+                               promotes_outputs=[f'{fl_name}:tot:*' for fl_name in ['Fl_O']+list(bleeds)])
 
         if statics:
             if design:
@@ -440,7 +440,7 @@ class Compressor(Element):
 
         # Create inlet flow station
         flow_in = FlowIn(fl_name='Fl_I')
-        self.add_subsystem('flow_in', flow_in, promotes_inputs=['Fl_I:*'])
+        self.add_subsystem('flow_in', flow_in, promotes=['Fl_I:*'])
 
         self.add_subsystem('corrinputs', CorrectedInputsCalc(),
                            promotes_inputs=(
@@ -170,15 +170,8 @@ class CompressorMap(om.Group):
         method = self.options['interp_method']
         extrap = self.options['extrap']
 
-        params = map_data.param_data
-        outputs = map_data.output_data
-
         # Define map which will be used
-        readmap = om.MetaModelStructuredComp(method=method, extrapolate=extrap)
-        for p in params:
-            readmap.add_input(p['name'], val=p['default'], units=p['units'], training_data=p['values'])
-        for o in outputs:
-            readmap.add_output(o['name'], val=o['default'], units=o['units'], training_data=o['values'])
+        readmap = map_data.interp_comp(method, extrap)
 
         # Create instance of map for evaluating actual operating point
         if design:
@@ -224,21 +217,13 @@ class CompressorMap(om.Group):
         self.add_subsystem('stall_R', subsys=RlineStall)
 
         # Evaluate map for the constant speed stall margin (SMN)
-        SMN_map = om.MetaModelStructuredComp(method=method, extrapolate=extrap)
-        for p in params:
-            SMN_map.add_input(p['name'], val=p['default'], units=p['units'], training_data=p['values'])
-        for o in outputs:
-            SMN_map.add_output(o['name'], val=o['default'], units=o['units'], training_data=o['values'])
+        SMN_map = map_data.interp_comp(method, extrap)
 
         self.add_subsystem('SMN_map', SMN_map, promotes_inputs=['NcMap', 'alphaMap'])
         self.connect('stall_R.RlineStall', 'SMN_map.RlineMap')
 
         # Evaluate map for the constant speed stall margin (SMN)
-        SMW_map = om.MetaModelStructuredComp(method=method, extrapolate=extrap)
-        for p in params:
-            SMW_map.add_input(p['name'], val=p['default'], units=p['units'], training_data=p['values'])
-        for o in outputs:
-            SMW_map.add_output(o['name'], val=o['default'], units=o['units'], training_data=o['values'])
+        SMW_map = map_data.interp_comp(method, extrap)
         self.add_subsystem('SMW_map', SMW_map, promotes_inputs=['alphaMap'])
         self.connect('stall_R.RlineStall', 'SMW_map.RlineMap')
 
@@ -276,13 +276,13 @@ class TurbineCooling(Element):
             indeps.add_output('x_factor', val=1.0)
 
         in_flow = FlowIn(fl_name='Fl_turb_I')
-        self.add_subsystem('turb_in_flow', in_flow, promotes_inputs=['Fl_turb_I:tot:*', 'Fl_turb_I:stat:*'])
+        self.add_subsystem('turb_in_flow', in_flow, promotes=['Fl_turb_I:tot:*', 'Fl_turb_I:stat:*'])
 
         in_flow = FlowIn(fl_name='Fl_turb_O')
-        self.add_subsystem('turb_out_flow', in_flow, promotes_inputs=['Fl_turb_O:tot:*', 'Fl_turb_O:stat:*'])
+        self.add_subsystem('turb_out_flow', in_flow, promotes=['Fl_turb_O:tot:*', 'Fl_turb_O:stat:*'])
 
         in_flow = FlowIn(fl_name='Fl_cool')
-        self.add_subsystem('cool_in_flow', in_flow, promotes_inputs=['Fl_cool:tot:*', 'Fl_cool:stat:*'])
+        self.add_subsystem('cool_in_flow', in_flow, promotes=['Fl_cool:tot:*', 'Fl_cool:stat:*'])
 
 
         # these are the inputs to the component
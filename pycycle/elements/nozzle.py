@@ -327,7 +327,7 @@ class Nozzle(Element):
 
         # Create inlet flow station
         in_flow = FlowIn(fl_name="Fl_I")
-        self.add_subsystem('in_flow', in_flow, promotes_inputs=['Fl_I:*'])
+        self.add_subsystem('in_flow', in_flow, promotes=['Fl_I:*'])
 
         # PR_bal = self.add_subsystem('PR_bal', BalanceComp())
         # PR_bal.add_balance('PR', units=None, eq_units='lbf/inch**2', lower=1.001)
@@ -5,7 +5,7 @@ import openmdao.api as om
 from pycycle.flow_in import FlowIn
 from pycycle.thermo.cea import species_data
 from pycycle.thermo.thermo import Thermo
-from pycycle.passthrough import PassThrough
+from pycycle.passthrough import PassThrough, TotalsPassThrough, TOT_VARS
 from pycycle.element_base import Element
 
 
@@ -78,6 +78,11 @@ class Splitter(Element):
     def initialize(self):
         self.options.declare('statics', default=True,
                               desc='If True, calculate static properties.')
+        self.options.declare('totals', default='recompute', values=('recompute', 'once', 'forward'),
+                              desc='How the outlet total states are found. "recompute" solves the thermo for each '
+                                   'outlet, "once" solves it for Fl_O1 and copies it to Fl_O2, and "forward" copies '
+                                   'the Fl_I totals to both outlets without any thermo. "forward" needs Fl_I to be '
+                                   'a consistent total state, as it is when it comes from an upstream element.')
 
         self.default_des_od_conns = [
             ('Fl_O1:stat:area', 'area1'),
@@ -103,31 +108,46 @@ class Splitter(Element):
 
         # Create inlet flowstation
         flow_in = FlowIn(fl_name='Fl_I')
-        self.add_subsystem('flow_in', flow_in, promotes_inputs=('Fl_I:*',))
+        self.add_subsystem('flow_in', flow_in, promotes=('Fl_I:*',))
 
         # Split the flows
         self.add_subsystem('split_calc', BPRcalc(), promotes_inputs=('BPR', ('W_in', 'Fl_I:stat:W')))
 
+        totals = self.options['totals']
+
         # Set Fl_out1 totals based on T, P
-        real_flow1 = Thermo(mode='total_TP', fl_name='Fl_O1:tot', 
-                            method=thermo_method, 
-                            thermo_kwargs={'composition':composition, 
-                                          'spec':thermo_data})
-        self.add_subsystem('real_flow1', real_flow1,
-                           promotes_inputs=(('composition', 'Fl_I:tot:composition'),
-                                            ('P', 'Fl_I:tot:P'),
-                                            ('T', 'Fl_I:tot:T')),
-                           promotes_outputs=('Fl_O1:tot:*', ))
+        if totals != 'forward':
+            real_flow1 = Thermo(mode='total_TP', fl_name='Fl_O1:tot', 
+                                method=thermo_method, 
+                                thermo_kwargs={'composition':composition, 
+                                              'spec':thermo_data})
+            self.add_subsystem('real_flow1', real_flow1,
+                               promotes_inputs=(('composition', 'Fl_I:tot:composition'),
+                                                ('P', 'Fl_I:tot:P'),
+                                                ('T', 'Fl_I:tot:T')),
+                               promotes_outputs=('Fl_O1:tot:*', ))
 
         # Set Fl_out2 totals based on T, P
-        real_flow2 = Thermo(mode='total_TP', fl_name='Fl_O2:tot', 
-                            method=thermo_method, 
-                            thermo_kwargs={'composition':composition, 
-                                          'spec':thermo_data})
-        self.add_subsystem('real_flow2', real_flow2, promotes_inputs=(('composition', 'Fl_I:tot:composition'),
-                                            ('P', 'Fl_I:tot:P'),
-                                            ('T', 'Fl_I:tot:T')),
-                           promotes_outputs=('Fl_O2:tot:*', ))
+        if totals == 'recompute':
+            real_flow2 = Thermo(mode='total_TP', fl_name='Fl_O2:tot', 
+                                method=thermo_method, 
+                                thermo_kwargs={'composition':composition, 
+                                              'spec':thermo_data})
+            self.add_subsystem('real_flow2', real_flow2, promotes_inputs=(('composition', 'Fl_I:tot:composition'),
+                                                ('P', 'Fl_I:tot:P'),
+                                                ('T', 'Fl_I:tot:T')),
+                               promotes_outputs=('Fl_O2:tot:*', ))
+
+        # Copy the totals that are the same to the other outlets
+        elif totals == 'once':
+            self.add_subsystem('tot_passthru', TotalsPassThrough(fl_names=['Fl_O2'], composition=composition),
+                               promotes_outputs=('Fl_O2:tot:*', ))
+            for var, _ in TOT_VARS:
+                self.connect(f'Fl_O1:tot:{var}', f'tot_passthru.tot:{var}')
+        else:
+            self.add_subsystem('tot_passthru', TotalsPassThrough(fl_names=['Fl_O1', 'Fl_O2'], composition=composition),
+                               promotes_inputs=[(f'tot:{var}', f'Fl_I:tot:{var}') for var, _ in TOT_VARS],
+                               promotes_outputs=('Fl_O1:tot:*', 'Fl_O2:tot:*'))
 
         if statics:
             if design:
@@ -17,15 +17,15 @@ from pycycle.thermo.cea import species_data
 
 class BleedOutTestCase(unittest.TestCase):
 
-    def test_case1(self):
+    def _problem(self, totals='recompute'):
 
-        self.prob = Problem()
-        cycle = self.prob.model = Cycle()
+        prob = Problem()
+        cycle = prob.model = Cycle()
         cycle.options['thermo_method'] = 'CEA'
         cycle.options['thermo_data'] = species_data.janaf
 
         cycle.add_subsystem('flow_start', FlowStart(), promotes=['MN', 'P', 'T'])
-        cycle.add_subsystem('bleed', BleedOut(bleed_names=['bld1', 'bld2']), promotes=['MN'])
+        cycle.add_subsystem('bleed', BleedOut(bleed_names=['bld1', 'bld2'], totals=totals), promotes=['MN'])
 
         cycle.pyc_connect_flow('flow_start.Fl_O', 'bleed.Fl_I')
 
@@ -36,9 +36,14 @@ class BleedOutTestCase(unittest.TestCase):
         cycle.set_input_defaults('T', 500., units='degR')
         cycle.set_input_defaults('flow_start.W', 500., units='lbm/s')
 
-        self.prob.setup(check=False, force_alloc_complex=True)
-        self.prob.set_solver_print(level=-1)
+        prob.setup(check=False, force_alloc_complex=True)
+        prob.set_solver_print(level=-1)
+
+        return prob
+
+    def test_case1(self):
 
+        self.prob = self._problem()
         self.prob.run_model()
 
         tol = 2.0e-5
@@ -63,5 +68,35 @@ class BleedOutTestCase(unittest.TestCase):
                                                 includes=['bleed.*'], excludes=['*.base_thermo.*',])
         assert_check_partials(partial_data, atol=1e-8, rtol=1e-8)
 
+    def test_totals(self):
+
+        ref = self._problem()
+        ref.run_model()
+        ports = ('Fl_O:', 'bld1:', 'bld2:')
+        outputs = ref.model.bleed.list_outputs(prom_name=True, out_stream=None)
+        names = {meta['prom_name'] for _, meta in outputs if meta['prom_name'].startswith(ports)}
+
+        # one thermo for the main flow, or none at all, and the same outputs as computing them all
+        for totals, thermos in (('once', ['real_flow']), ('forward', [])):
+            prob = self._problem(totals)
+            prob.run_model()
+
+            subs = prob.model.bleed._subsystems_allprocs
+            self.assertEqual([name for name in subs if name.endswith('_flow')], thermos)
+
+            # sized from the port data, not from the connections
+            for meta in prob.model.bleed.tot_passthru._var_rel2meta.values():
+                self.assertFalse(meta['shape_by_conn'])
+                self.assertIsNone(meta['copy_shape'])
+
+            outputs = prob.model.bleed.list_outputs(prom_name=True, out_stream=None)
+            self.assertEqual({meta['prom_name'] for _, meta in outputs if meta['prom_name'].startswith(ports)}, names)
+            for name in names:
+                assert_near_equal(prob[f'bleed.{name}'], ref[f'bleed.{name}'], 1e-8)
+
+            partial_data = prob.check_partials(out_stream=None, method='cs', 
+                                               includes=['bleed.*'], excludes=['*.base_thermo.*',])
+            assert_check_partials(partial_data, atol=1e-8, rtol=1e-8)
+
 if __name__ == "__main__":
     unittest.main()
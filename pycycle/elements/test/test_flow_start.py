@@ -181,13 +181,13 @@ class FlowStartTestCase(unittest.TestCase):
         tol = 1e-6
         assert_near_equal(prob['fl_start.Fl_O:tot:P'], 5.27, tol)
         assert_near_equal(prob['fl_start.Fl_O:tot:T'], 444.23, tol)
-        assert_near_equal(prob['fl_start.Fl_O:tot:h'], -24.02365656, tol)
-        assert_near_equal(prob['fl_start.Fl_O:tot:S'], 1.66403163, tol)
-        assert_near_equal(prob['fl_start.Fl_O:tot:gamma'], 1.40086187, tol)
+        assert_near_equal(prob['fl_start.Fl_O:tot:h'], -24.0183352, tol)
+        assert_near_equal(prob['fl_start.Fl_O:tot:S'], 1.65822485, tol)
+        assert_near_equal(prob['fl_start.Fl_O:tot:gamma'], 1.40050003, tol)
 
         assert_near_equal(prob['fl_start.Fl_O:stat:W'], 100.0, tol)
         assert_near_equal(prob['fl_start.Fl_O:stat:MN'], 0.8, tol)
-        assert_near_equal(prob['fl_start.Fl_O:stat:area'], 778.26812382, tol)
+        assert_near_equal(prob['fl_start.Fl_O:stat:area'], 755.35390882, tol)
 
    
 class WARTestCase(unittest.TestCase):
@@ -59,14 +59,17 @@ h_map = dict(((v_name, i) for i, v_name in enumerate(header)))
 class splitterTestCase(unittest.TestCase):
 
     def setUp(self):
+        self.prob = self._problem()
 
-        self.prob = Problem()
-        cycle = self.prob.model = Cycle()
+    def _problem(self, totals='recompute'):
+
+        prob = Problem()
+        cycle = prob.model = Cycle()
         cycle.options['thermo_method'] = 'CEA'
         cycle.options['thermo_data'] = janaf
 
         cycle.add_subsystem('flow_start', FlowStart())
-        cycle.add_subsystem('splitter', Splitter())
+        cycle.add_subsystem('splitter', Splitter(totals=totals))
 
         cycle.set_input_defaults('flow_start.P', 17., units='psi')
         cycle.set_input_defaults('flow_start.T', 500., units='degR')
@@ -76,8 +79,9 @@ class splitterTestCase(unittest.TestCase):
 
         cycle.pyc_connect_flow('flow_start.Fl_O', 'splitter.Fl_I')
 
-        self.prob.set_solver_print(level=-1)
-        self.prob.setup(check=False, force_alloc_complex=True)
+        prob.set_solver_print(level=-1)
+        prob.setup(check=False, force_alloc_complex=True)
+        return prob
 
     def test_case1(self):
         # 4 cases to check against
@@ -130,5 +134,43 @@ class splitterTestCase(unittest.TestCase):
                                                     includes=['splitter.*'], excludes=['*.base_thermo.*',])
             assert_check_partials(partial_data, atol=1e-8, rtol=1e-8)
 
+    def test_totals(self):
+        data = ref_data[0]
+        probs = {totals: self._problem(totals) for totals in ('recompute', 'once', 'forward')}
+        for prob in probs.values():
+            prob['splitter.BPR'] = data[h_map['BPR']]
+            prob['flow_start.P'] = data[h_map['Fl_I.Pt']]
+            prob['flow_start.T'] = data[h_map['Fl_I.Tt']]
+            prob['flow_start.W'] = data[h_map['Fl_I.W']]
+            prob['splitter.MN1'] = data[h_map['Fl_O1.MN']]
+            prob['splitter.MN2'] = data[h_map['Fl_O2.MN']]
+            prob.run_model()
+
+        self.assertEqual(sorted(probs['once'].model.splitter._subsystems_allprocs), 
+                         ['flow_in', 'out1_stat', 'out2_stat', 'real_flow1', 'split_calc', 'tot_passthru'])
+        self.assertNotIn('real_flow1', probs['forward'].model.splitter._subsystems_allprocs)
+
+        # the passed through totals are sized from the port data, not from the connections
+        for totals in ('once', 'forward'):
+            for meta in probs[totals].model.splitter.tot_passthru._var_rel2meta.values():
+                self.assertFalse(meta['shape_by_conn'])
+                self.assertIsNone(meta['copy_shape'])
+
+        # the outlets have the same variables, with the same values, however the totals are found
+        ref = probs['recompute']
+        outputs = ref.model.splitter.list_outputs(prom_name=True, out_stream=None)
+        names = {meta['prom_name'] for _, meta in outputs if meta['prom_name'].startswith(('Fl_O1:', 'Fl_O2:'))}
+        for totals in ('once', 'forward'):
+            prob = probs[totals]
+            outputs = prob.model.splitter.list_outputs(prom_name=True, out_stream=None)
+            self.assertEqual({meta['prom_name'] for _, meta in outputs 
+                              if meta['prom_name'].startswith(('Fl_O1:', 'Fl_O2:'))}, names)
+            for name in names:
+                assert_near_equal(prob[f'splitter.{name}'], ref[f'splitter.{name}'], 1e-8)
+
+            partial_data = prob.check_partials(out_stream=None, method='cs', 
+                                               includes=['splitter.*'], excludes=['*.base_thermo.*',])
+            assert_check_partials(partial_data, atol=1e-8, rtol=1e-8)
+
 if __name__ == "__main__":
     unittest.main()
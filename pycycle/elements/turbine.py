@@ -471,7 +471,7 @@ class Turbine(Element):
 
         # Create inlet flow station
         in_flow = FlowIn(fl_name='Fl_I')
-        self.add_subsystem('in_flow', in_flow, promotes_inputs=['Fl_I:*'])
+        self.add_subsystem('in_flow', in_flow, promotes=['Fl_I:*'])
 
         self.add_subsystem('corrinputs', CorrectedInputsCalc(),
                            promotes_inputs=[
@@ -509,7 +509,7 @@ class Turbine(Element):
 
         for BN in bleeds:
             bld_flow = FlowIn(fl_name=BN)
-            self.add_subsystem(BN, bld_flow, promotes_inputs=[
+            self.add_subsystem(BN, bld_flow, promotes=[
                                f'{BN}:*'])
 
         # # Calculate bleed parameters
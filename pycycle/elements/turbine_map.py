@@ -113,17 +113,8 @@ class TurbineMap(om.Group):
         method = self.options['interp_method']
         extrap = self.options['extrap']
 
-        params = map_data.param_data
-        outputs = map_data.output_data
-
         # Define map which will be used
-        readmap = om.MetaModelStructuredComp(method=method, extrapolate=extrap)
-        for p in params:
-            readmap.add_input(p['name'], val=p['default'], units=p['units'],
-                        training_data=p['values'])
-        for o in outputs:
-            readmap.add_output(o['name'], val=o['default'], units=o['units'],
-                        training_data=o['values'])
+        readmap = map_data.interp_comp(method, extrap)
 
         if design:
             # In design mode, operating point specified by default values for RlineMap, NcMap and alphaMap
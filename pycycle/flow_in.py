@@ -2,57 +2,212 @@
 """
 import numpy as np
 
-import openmdao.api as om 
+import openmdao.api as om
+from openmdao.utils.units import unit_conversion
+
+
+# (name, default, units, desc) of the flow station variables
+TOT_PROPS = (
+    ('h', 1.0, 'Btu/lbm', 'total enthalpy'),
+    ('T', 518., 'degR', 'total temperature'),
+    ('P', 1., 'lbf/inch**2', 'total pressure'),
+    ('rho', 1.0, 'lbm/ft**3', 'total density'),
+    ('gamma', 1.4, None, 'total gamma'),
+    ('Cp', 1.0, 'Btu/(lbm*degR)', 'total Specific heat at constant pressure'),
+    ('Cv', 1.0, 'Btu/(lbm*degR)', 'total Specific heat at constant volume'),
+    ('S', 1.0, 'Btu/(lbm*degR)', 'total entropy'),
+    ('R', 1.0, 'Btu/(lbm*degR)', 'total gas constant'),
+)
+
+STAT_PROPS = (
+    ('h', 1.0, 'Btu/lbm', 'static enthalpy'),
+    ('T', 518., 'degR', 'static temperature'),
+    ('P', 1.0, 'lbf/inch**2', 'static pressure'),
+    ('rho', 1.0, 'lbm/ft**3', 'static density'),
+    ('gamma', 1.4, None, 'static gamma'),
+    ('Cp', 1.0, 'Btu/(lbm*degR)', 'static Specific heat at constant pressure'),
+    ('Cv', 1.0, 'Btu/(lbm*degR)', 'static Specific heat at constant volume'),
+    ('S', 0.0, 'Btu/(lbm*degR)', 'static entropy'),
+    ('R', 1.0, 'Btu/(lbm*degR)', 'static gas constant'),
+)
+
+# TODO takes these out of static (keep them top level)
+STAT_FLOW_PROPS = (
+    ('V', 1.0, 'ft/s', 'Velocity'),
+    ('Vsonic', 1.0, 'ft/s', 'Speed of sound'),
+    ('MN', 1.0, None, 'Mach number'),
+    ('area', 1.0, 'inch**2', 'flow area'),
+)
+
+# Packed flow stations hold these variables end to end, in these units.
+# The total vector is followed by the composition.
+PACKED_VARS = {
+    'tot:packed': tuple((f'tot:{name}', units) for name, _, units, _ in TOT_PROPS),
+    'stat:packed': tuple((f'stat:{name}', units) for name, _, units, _ in STAT_PROPS),
+    'stat:packed_flow': tuple((f'stat:{name}', units) for name, _, units, _ in STAT_FLOW_PROPS),
+}
+PACKED_PARTS = {'tot': ('tot:packed',), 'stat': ('stat:packed', 'stat:packed_flow')}
+
+
+def _same_units(units1, units2):
+    if units1 is None or units2 is None:
+        return units1 == units2
+    factor, offset = unit_conversion(units1, units2)
+    return abs(factor - 1.) < 1e-12 and offset == 0.
+
+
+class PackedOutputs(object):
+    """
+    Mixin for components that only copy their inputs to their outputs, that lets them
+    also give several of those outputs end to end as one vector. That way a whole flow
+    station can be connected at once.
+
+    Subclasses say which input each output is copied from in `_copied_from`.
+    """
+
+    def _copied_from(self, out_name):
+        raise NotImplementedError()
+
+    def add_packed_output(self, name, out_names, units=None):
+        """
+        Add output `name` with the outputs in `out_names` end to end. If given, `units`
+        are the units each of them has to be in.
+        """
+        meta = self._var_rel2meta
+        if units is not None:
+            for out_name, unit in zip(out_names, units):
+                if not _same_units(meta[out_name]['units'], unit):
+                    raise ValueError(f"{self.msginfo}: Can't pack '{out_name}', its units are "
+                                     f"'{meta[out_name]['units']}' instead of '{unit}'.")
+
+        vals = [np.atleast_1d(meta[out_name]['val']).ravel() for out_name in out_names]
+        self.add_output(name, val=np.concatenate(vals))
+
+        packed = []
+        offset = 0
+        for out_name, val in zip(out_names, vals):
+            in_name = self._copied_from(out_name)
+            rows = np.arange(offset, offset + val.size)
+            self.declare_partials(of=name, wrt=in_name, val=np.ones(val.size),
+                                  rows=rows, cols=np.arange(val.size))
+            packed.append((in_name, slice(offset, offset + val.size)))
+            offset += val.size
+
+        if not hasattr(self, '_packed_outputs'):
+            self._packed_outputs = {}
+        self._packed_outputs[name] = packed
+
+    def compute_packed(self, inputs, outputs):
+        for name, packed in getattr(self, '_packed_outputs', {}).items():
+            out = outputs[name]
+            for in_name, slc in packed:
+                out[slc] = inputs[in_name].ravel()
 
 
 class FlowIn(om.ExplicitComponent):
     """
     Provides a central place to connect flow information to in a component
     but doesn't actually do anything on its own
+
+    When the flow is packed, the parts of the flow station in `packed` come in as
+    vectors. Only the variables the element uses are unpacked, into outputs with the
+    usual names, by `unpack` once the element knows what its subsystems need.
+
+    When the flow is lean, the parts that aren't packed have no inputs here, other than
+    the total composition, and the Cycle connects straight to the inputs of the element
+    that use them.
     """
 
     def initialize(self):
         self.options.declare('fl_name', default='flow',
                               desc='thermodynamic data set')
+        self.options.declare('packed', default=(), types=(tuple, list),
+                              desc="parts of the flow station, 'tot' and/or 'stat', that are connected packed")
+        self.options.declare('composition', default=None, allow_none=True, recordable=False,
+                              desc='composition of the flow, that sizes the composition inputs. The Cycle gives '
+                                   'it from the flow graph. If None, they are sized by their connections')
+        self.options.declare('lean', default=False, types=bool,
+                              desc='if True, only the flow station variables the element uses are connected, '
+                                   'so there are no inputs for the parts that are not packed')
 
     def setup(self):
         fl_name = self.options['fl_name']
+        packed = self.options['packed']
+        lean = self.options['lean']
 
         self.add_output('foo', val=1.,
             desc="dummy output that is NOT used for anything other than to keep the framework happy. ")
 
-        self.add_input('%s:tot:h'%fl_name, val=1.0, desc='total enthalpy', units='Btu/lbm')
-        self.add_input('%s:tot:T'%fl_name, val=518., desc='total temperature', units='degR')
-        self.add_input('%s:tot:P'%fl_name, val=1., desc='total pressure', units='lbf/inch**2')
-        self.add_input('%s:tot:rho'%fl_name, val=1.0, desc='total density', units='lbm/ft**3')
-        self.add_input('%s:tot:gamma'%fl_name, val=1.4, desc='total gamma')
-        self.add_input('%s:tot:Cp'%fl_name, val=1.0, desc='total Specific heat at constant pressure', units='Btu/(lbm*degR)')
-        self.add_input('%s:tot:Cv'%fl_name, val=1.0, desc='total Specific heat at constant volume', units='Btu/(lbm*degR)')
-        self.add_input('%s:tot:S'%fl_name, val=1.0, desc='total entropy', units='Btu/(lbm*degR)')
-        self.add_input('%s:tot:R'%fl_name, val=1.0, desc='total gas constant', units='Btu/(lbm*degR)')
-        self.add_input('%s:tot:composition'%fl_name, shape_by_conn=True, desc='flow composition vector')
-
-        self.add_input('%s:stat:h'%fl_name, val=1.0, desc='static enthalpy', units='Btu/lbm')
-        self.add_input('%s:stat:T'%fl_name, val=518., desc='static temperature', units='degR')
-        self.add_input('%s:stat:P'%fl_name, val=1.0, desc='static pressure', units='lbf/inch**2')
-        self.add_input('%s:stat:rho'%fl_name, val=1.0, desc='static density', units='lbm/ft**3')
-        self.add_input('%s:stat:gamma'%fl_name, val=1.4, desc='static gamma')
-        self.add_input('%s:stat:Cp'%fl_name, val=1.0, desc='static Specific heat at constant pressure', units='Btu/(lbm*degR)')
-        self.add_input('%s:stat:Cv'%fl_name, val=1.0, desc='static Specific heat at constant volume', units='Btu/(lbm*degR)')
-        self.add_input('%s:stat:S'%fl_name, val= 0.0, desc='static entropy', units='Btu/(lbm*degR)')
-        self.add_input('%s:stat:R'%fl_name, val=1.0, desc='static gas constant', units='Btu/(lbm*degR)')
-        self.add_input('%s:stat:composition'%fl_name, shape_by_conn=True, desc='flow composition vector')
-
-        # TODO takes these out of static (keep them top level)
-        self.add_input('%s:stat:V'%fl_name, val=1.0, desc='Velocity', units='ft/s')
-        self.add_input('%s:stat:Vsonic'%fl_name, val=1.0, desc='Speed of sound', units='ft/s')
-        self.add_input('%s:stat:MN'%fl_name, val=1.0, desc='Mach number')
-        self.add_input('%s:stat:area'%fl_name, val=1.0, desc='flow area', units='inch**2')
+        # the composition is sized from the port data when there is some, so it doesn't need dynamic shaping
+        if self.options['composition'] is None:
+            compo_kwargs = {'shape_by_conn': True}
+        else:
+            compo_kwargs = {'val': np.zeros(len(self.options['composition']))}
+
+        # output name: (packed input, index or slice into it, default, units, desc)
+        self._packed_vars = {}
+        self._unpack = []
+
+        if 'tot' in packed:
+            n_compo = len(self.options['composition'])
+            self._add_packed(f'{fl_name}:tot:packed', TOT_PROPS, 'tot', n_compo)
+            # the composition comes at the end, and is the same for the statics
+            compo = slice(len(TOT_PROPS), len(TOT_PROPS) + n_compo)
+            for name in (f'{fl_name}:tot:composition', f'{fl_name}:stat:composition'):
+                self._packed_vars[name] = (f'{fl_name}:tot:packed', compo, np.zeros(n_compo), None,
+                                           'flow composition vector')
+        else:
+            if not lean:
+                for name, default, units, desc in TOT_PROPS:
+                    self.add_input(f'{fl_name}:tot:{name}', val=default, desc=desc, units=units)
+            # always there, since the composition is always connected
+            self.add_input('%s:tot:composition'%fl_name, desc='flow composition vector', **compo_kwargs)
+
+        if 'stat' in packed:
+            self._add_packed(f'{fl_name}:stat:packed', STAT_PROPS, 'stat')
+            self._add_packed(f'{fl_name}:stat:packed_flow', STAT_FLOW_PROPS, 'stat')
+            if 'tot' not in packed and not lean:
+                self.add_input('%s:stat:composition'%fl_name, desc='flow composition vector', **compo_kwargs)
+        elif not lean:
+            for name, default, units, desc in STAT_PROPS:
+                self.add_input(f'{fl_name}:stat:{name}', val=default, desc=desc, units=units)
+            if 'tot' not in packed:
+                self.add_input('%s:stat:composition'%fl_name, desc='flow composition vector', **compo_kwargs)
+            for name, default, units, desc in STAT_FLOW_PROPS:
+                self.add_input(f'{fl_name}:stat:{name}', val=default, desc=desc, units=units)
+
         self.add_input('%s:stat:Wc'%fl_name, val=1.0, desc='corrected weight flow', units='lbm/s')
         self.add_input('%s:stat:W'%fl_name, val= 0.0, desc='weight flow', units='lbm/s')
         self.add_input('%s:FAR'%fl_name, val=0.0, desc='fuel to air ratio')
         # self.add_input('%s:WAR'%fl_name, val  = 0.0, desc='water to air ratio')
         # self.add_input('%s:nu', %nameval=1.0, desc='dynamic viscosity', units='lbm/(s*ft)')
 
+    def _add_packed(self, packed_name, variables, part, n_compo=0):
+        """
+        Add a packed input holding `variables`, followed by `n_compo` composition entries.
+        """
+        fl_name = self.options['fl_name']
+        val = np.concatenate([[default for _, default, _, _ in variables], np.zeros(n_compo)])
+        self.add_input(packed_name, val=val, desc='packed flow station, see flow_in.PACKED_VARS')
+        for i, (name, default, units, desc) in enumerate(variables):
+            self._packed_vars[f'{fl_name}:{part}:{name}'] = (packed_name, i, default, units, desc)
+
+    def unpack(self, names):
+        """
+        Add outputs for the packed variables in `names`. Any other names are skipped.
+        """
+        for name in names:
+            if name not in self._packed_vars or name in self._var_rel2meta:
+                continue
+            packed_name, idx, default, units, desc = self._packed_vars[name]
+            self.add_output(name, val=default, desc=desc, units=units)
+            if isinstance(idx, slice):
+                self.declare_partials(name, packed_name, val=np.ones(idx.stop - idx.start),
+                                      rows=np.arange(idx.stop - idx.start), cols=np.arange(idx.start, idx.stop))
+            else:
+                self.declare_partials(name, packed_name, val=1., rows=[0], cols=[idx])
+            self._unpack.append((packed_name, name, idx))
+
     def compute(self, inputs, outputs):
-        pass
+        for packed_name, name, idx in self._unpack:
+            outputs[name] = inputs[packed_name][idx]
@@ -1,4 +1,34 @@
+import openmdao.api as om
+
+from pycycle.spline_interp import SPLINE_METHODS, SplineMetaModel, spline_coeffs
+
 # stupid hack so I can create data containers in python
 
 class MapData(object):
-    pass
\ No newline at end of file
+
+    def spline_coeffs(self, method='cubic'):
+        """
+        Spline coefficients of each output of the map, computed the first time they're asked for
+        and kept with the map data, so every element using this map shares them.
+        """
+        cache = self.__dict__.setdefault('_spline_coeffs', {})
+        if method not in cache:
+            grid = [p['values'] for p in self.param_data]
+            cache[method] = {o['name']: spline_coeffs(grid, o['values'], method) for o in self.output_data}
+        return cache[method]
+
+    def interp_comp(self, method='slinear', extrap=False):
+        """
+        Component interpolating the map outputs from its parameters. Spline methods reuse the
+        coefficients in spline_coeffs instead of solving for them on every evaluation.
+        """
+        if method in SPLINE_METHODS:
+            comp = SplineMetaModel(method=method, extrapolate=extrap, coeffs=self.spline_coeffs(method))
+        else:
+            comp = om.MetaModelStructuredComp(method=method, extrapolate=extrap)
+
+        for p in self.param_data:
+            comp.add_input(p['name'], val=p['default'], units=p['units'], training_data=p['values'])
+        for o in self.output_data:
+            comp.add_output(o['name'], val=o['default'], units=o['units'], training_data=o['values'])
+        return comp
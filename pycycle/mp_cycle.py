@@ -6,10 +6,18 @@ import openmdao.api as om
 import networkx as nx
 
 from pycycle.element_base import Element
+from pycycle.flow_in import PACKED_PARTS
 from pycycle.thermo.cea import species_data
+from pycycle.thermo.cea.frozen import FrozenProps
+from pycycle.thermo.cea.chem_eq import ChemEq
 from pycycle.constants import ALLOWED_THERMOS
 
 
+# flow station variables that pyc_connect_flow connects, besides the composition and W
+TOT_CONNECT_VARS = ('h', 'T', 'P', 'S', 'rho', 'gamma', 'Cp', 'Cv', 'R')
+STAT_CONNECT_VARS = ('V', 'Vsonic', 'Cp', 'Cv', 'MN', 'P', 'S', 'T', 'area', 'gamma', 'h', 'rho')
+
+
 class Cycle(om.Group): 
 
 
@@ -22,6 +30,23 @@ class Cycle(om.Group):
         self.options.declare('thermo_data', default=species_data.janaf,
                               desc='thermodynamic data set.', 
                               recordable=False)
+        self.options.declare('frozen_elements', default=(), types=(list, tuple, set),
+                              desc='names of elements that use the FROZEN thermo method instead of the cycle '
+                                   'level `thermo_method`. Only valid with CEA thermo, since they share the same compositions')
+        self.options.declare('frozen_T_threshold', default=None, allow_none=True,
+                              desc='temperature (degK) above which the FROZEN thermo stations will warn that the '
+                                   'frozen composition is no longer a good approximation')
+        self.options.declare('eq_cache_size', default=0, types=int,
+                              desc='size of the warm start cache shared by the CEA equilibrium solves. '
+                                   'See the `warm_start_cache` option of `ChemEq`. 0 turns the cache off')
+        self.options.declare('packed_flows', default=False, types=bool,
+                              desc='If True, `pyc_connect_flow` connects the total and static flow stations as '
+                                   'packed vectors, instead of variable by variable. Input ports unpack the variables '
+                                   'their element uses. See `flow_in.PACKED_VARS` for the layout')
+        self.options.declare('lean_flows', default=False, types=bool,
+                              desc='If True, `pyc_connect_flow` only connects the flow station variables that the '
+                                   'target element uses, and input ports have no inputs for the rest. '
+                                   'The full flow station is still available at the output ports')
 
         self._elements = set()
 
@@ -71,10 +96,26 @@ class Cycle(om.Group):
         return super().add_subsystem(name, subsys, **kwargs)
 
 
+    def _element_thermo_method(self, name): 
+        """
+        thermo method for the given child, accounting for any stations that have been frozen
+        """
+        thermo_method = self.options['thermo_method']
+        if name in self.options['frozen_elements']: 
+            if thermo_method not in ('CEA', 'FROZEN'): 
+                raise ValueError(f'{self.msginfo}: `frozen_elements` requires the CEA thermo_method, '
+                                 f'but {thermo_method} was given')
+            return 'FROZEN'
+        return thermo_method
+
     def setup(self): 
 
         self._base_class_super_called = True
 
+        missing = set(self.options['frozen_elements']) - set(self._children)
+        if missing: 
+            raise ValueError(f'{self.msginfo}: `frozen_elements` {sorted(missing)} are not subsystems of this cycle')
+
 
         # Code that follows the flow-graph and propagates thermo setup data down the chain
         node_types = nx.get_node_attributes(self._flow_graph, 'type')
@@ -83,89 +124,135 @@ class Cycle(om.Group):
 
         G = self._flow_graph
 
-        # put all starting nodes into a FIFO queue
-        queue = [node for node in self._flow_graph if G.in_degree(node) == 0]
-        visited = set() # use a set, because checking "in" on a queue is slow
-
-
         # loop over all child subsystems and push down cycle level options 
         cycle_level_options = ['thermo_method', 'thermo_data', 'design']
         for child_name, child in self._children.items():
             for opt in cycle_level_options: 
                 if opt in child.options: 
                     child.options[opt] = self.options[opt]
+            if 'thermo_method' in child.options: 
+                child.options['thermo_method'] = self._element_thermo_method(child_name)
 
 
         # note: three kinds of nodes in graph, elements, in_ports, out_ports. 
-        #       The graph is a tree with (potentially) multiple separate root nodes. 
-        #       We will do a breadth first search, starting from all starting nodes at the same time. 
+        #       The graph has to be acyclic, and is visited in topological order. 
         #       This makes sure that Elements with multiple inputs will have all
         #       predecessors set up before we get to them. 
-        while queue:
-            node = queue.pop(0) 
+        for node in self._flow_order():
             node_type = node_types[node]
 
-            # make sure we've already processed all predecessor nodes
-            # if not skip this one, we'll hit it again later
-            ready_for_node = True
-
-            for p in G.predecessors(node): 
-                if p not in visited: 
-                    ready_for_node = False
-                    break
-            if not ready_for_node:
-                continue
-
-            queue.extend(G.successors(node))
-
-            if node not in visited: 
-
-                if node_type == 'element': 
-                    node_element = self._get_subsystem(node)
-                    node_element.pyc_setup_output_ports()
-
-                # connection will be out_port -> in_port
-                elif node_type == 'out_port': 
-                    src_element = self._get_subsystem(node_parents[node])
-                    links = G.out_edges(node)
-                    for link in links: 
-                        # in almost every case there should only be one link, because otherwise you are creating extra mass flow 
-                        # the one exception is for the cooling calcs, which get some "weak" connections from turbine and bleed srcs
-                        
-                        target_element = self._get_subsystem(node_parents[link[1]])
-
-                        out_port = node_port_names[node]
-                        in_port = node_port_names[link[1]]
-                        # this passes whatever configuration data there was from the src element to the target keyed by port names
+            if node_type == 'element': 
+                node_element = self._get_subsystem(node)
+                node_element.pyc_setup_output_ports()
+
+            # connection will be out_port -> in_port
+            elif node_type == 'out_port': 
+                src_element = self._get_subsystem(node_parents[node])
+                links = G.out_edges(node)
+                for link in links: 
+                    # in almost every case there should only be one link, because otherwise you are creating extra mass flow 
+                    # the one exception is for the cooling calcs, which get some "weak" connections from turbine and bleed srcs
+                    
+                    target_element = self._get_subsystem(node_parents[link[1]])
+
+                    out_port = node_port_names[node]
+                    in_port = node_port_names[link[1]]
+                    # this passes whatever configuration data there was from the src element to the target keyed by port names
+
+                    if out_port not in src_element.Fl_O_data: 
+                        raise RuntimeError(f'in {self.pathname},{src_element.pathname}.{out_port} has not been properly setup.'
+                                           f'something is wrong with one of your `pyc_setup_output_ports` method in {src_element.pathname}')
+
+                    target_element.Fl_I_data[in_port] = src_element.Fl_O_data[out_port]
+
+                    packed = G.edges[link].get('packed', ())
+                    if packed: 
+                        target_element.Fl_I_packed[in_port] = packed
+                        src_packed = src_element.Fl_O_packed.get(out_port, ())
+                        src_element.Fl_O_packed[out_port] = src_packed + tuple(p for p in packed if p not in src_packed)
+                    else: 
+                        target_element.Fl_I_packed.pop(in_port, None)
+
+                    if G.edges[link].get('lean'): 
+                        target_element.Fl_I_lean.add(in_port)
+                    else: 
+                        target_element.Fl_I_lean.discard(in_port)
+
+    def _flow_order(self): 
+        """
+        The nodes of the flow graph in topological order.
+        """
+        G = self._flow_graph
+        try: 
+            return tuple(nx.topological_sort(G))
+        except nx.NetworkXUnfeasible: 
+            loop = [u for u, v in nx.find_cycle(G)]
+            raise RuntimeError(f"{self.msginfo}: The flow connections form a loop, "
+                               f"{' -> '.join(loop + loop[:1])}. Flow can't be propagated through it.")
 
-                        if out_port not in src_element.Fl_O_data: 
-                            raise RuntimeError(f'in {self.pathname},{src_element.pathname}.{out_port} has not been properly setup.'
-                                               f'something is wrong with one of your `pyc_setup_output_ports` method in {src_element.pathname}')
+    def configure(self): 
 
-                        target_element.Fl_I_data[in_port] = src_element.Fl_O_data[out_port]
+        # the frozen thermo components only exist once the elements are setup, 
+        # so the temperature threshold gets pushed down here
+        T_threshold = self.options['frozen_T_threshold']
+        if T_threshold is not None: 
+            for comp in self.system_iter(recurse=True, typ=FrozenProps): 
+                comp.options['T_max'] = T_threshold
 
-                visited.add(node)
+        cache_size = self.options['eq_cache_size']
+        if cache_size > 0: 
+            for comp in self.system_iter(recurse=True, typ=ChemEq): 
+                comp.options['warm_start_cache'] = cache_size
 
+        # the elements add the packed outputs in their own configure
+        G = self._flow_graph
+        node_parents = nx.get_node_attributes(G, 'parent')
+        node_port_names = nx.get_node_attributes(G, 'port_name')
+        for fl_src, fl_target in G.edges: 
+            for part in G.edges[fl_src, fl_target].get('packed', ()): 
+                for name in PACKED_PARTS[part]: 
+                    self.connect(f'{fl_src}:{name}', f'{fl_target}:{name}')
+
+            # lean flows only connect what the target element promotes from its port
+            lean = G.edges[fl_src, fl_target].get('lean', ())
+            if lean: 
+                target_element = self._get_subsystem(node_parents[fl_target])
+                prom_inputs = target_element._var_allprocs_prom2abs_list['input']
+                port = node_port_names[fl_target]
+                for src_name, target_name in lean: 
+                    if f'{port}:{target_name}' in prom_inputs: 
+                        self.connect(f'{fl_src}:{src_name}', f'{fl_target}:{target_name}')
 
     def pyc_connect_flow(self, fl_src, fl_target, connect_stat=True, connect_tot=True, connect_w=True):
         """ 
         helper function to connect all of the flow variables between two ports 
         """
 
-        # always connect compositions, because these are shape_by_conn=True
-        self.connect(f'{fl_src}:tot:composition', [f'{fl_target}:tot:composition', f'{fl_target}:stat:composition'])
+        # packed flows are connected in configure, once the packed outputs exist
+        packed = ()
+        if self.options['packed_flows']: 
+            packed = (('tot',) if connect_tot else ()) + (('stat',) if connect_stat else ())
+
+        # (source, target) flow station variables that aren't packed
+        conns = []
+        # always connect compositions, every element needs them
+        if 'tot' not in packed: 
+            conns += [('tot:composition', 'tot:composition'), ('tot:composition', 'stat:composition')]
         # total
-        if connect_tot:
-            for v_name in ('h','T','P','S','rho','gamma','Cp','Cv', 'R'):
-                self.connect('%s:tot:%s'%(fl_src, v_name), '%s:tot:%s'%(fl_target, v_name))
+        if connect_tot and 'tot' not in packed:
+            conns += [(f'tot:{v_name}', f'tot:{v_name}') for v_name in TOT_CONNECT_VARS]
 
         # static
-        if connect_stat:
-            for v_name in ('V', 'Vsonic'):  # ('Wc', 'W', 'FAR'):
-                self.connect('%s:stat:%s'%(fl_src, v_name), '%s:stat:%s'%(fl_target, v_name))
+        if connect_stat and 'stat' not in packed:
+            conns += [(f'stat:{v_name}', f'stat:{v_name}') for v_name in STAT_CONNECT_VARS]
 
-            for v_name in ('Cp', 'Cv', 'MN', 'P', 'S', 'T', 'area', 'gamma', 'h', 'rho'):
-                self.connect('%s:stat:%s'%(fl_src, v_name), '%s:stat:%s'%(fl_target, v_name))
+        # lean flows are connected in configure, once the target element knows which variables it uses
+        lean = ()
+        if self.options['lean_flows']: 
+            lean = tuple(conns)
+        else: 
+            for src_name, target_name in conns: 
+                self.connect(f'{fl_src}:{src_name}', f'{fl_target}:{target_name}')
 
         if connect_w:
            self.connect('%s:stat:W'%(fl_src,), '%s:stat:W'%(fl_target,))
@@ -185,7 +272,7 @@ class Cycle(om.Group):
         self._flow_graph.add_node(fl_target, type='in_port', parent=target_elment_name, port_name=target_port_name)
 
         self._flow_graph.add_edge(src_element_name, fl_src)
-        self._flow_graph.add_edge(fl_src, fl_target)
+        self._flow_graph.add_edge(fl_src, fl_target, packed=packed, lean=lean)
         self._flow_graph.add_edge(fl_target, target_elment_name)
 
 class MPCycle(om.Group): 
@@ -235,6 +322,10 @@ class MPCycle(om.Group):
             self.add_subsystem(name, pnt, **kwargs)
             self._des_pnt = pnt
         elif pnt.options['design'] is False:
+            # NOTE: each point is a full Cycle, with its own systems, vectors and solvers, so setup grows 
+            #       linearly with the number of points. OpenMDAO can't stamp copies of a set up point, but 
+            #       the species tables and map spline coefficients they're built from are only computed once 
+            #       and shared between them
             self.add_subsystem(name, pnt, **kwargs)
             self._od_pnts.append(pnt)
             
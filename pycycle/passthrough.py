@@ -2,6 +2,8 @@ import numpy as np
 
 from openmdao.api import ExplicitComponent
 
+from pycycle.flow_in import TOT_PROPS, PackedOutputs
+
 
 class PassThrough(ExplicitComponent):
     """
@@ -44,6 +46,51 @@ class PassThrough(ExplicitComponent):
         pass
 
 
+# total flow station variables and their units, as they're promoted out of Thermo
+TOT_VARS = tuple((name, units) for name, _, units, _ in TOT_PROPS) + (('composition', None),)
+
+
+class TotalsPassThrough(PackedOutputs, ExplicitComponent):
+    """
+    Copies one set of total flow properties, given as tot:h, tot:T, ..., to the total
+    flow stations of every name in `fl_names`, for elements whose outlets all have the
+    same total state
+    """
+
+    def initialize(self):
+        self.options.declare('fl_names', types=(list, tuple), desc='names of the flow stations to copy to')
+        self.options.declare('composition', recordable=False, desc='composition of the flow')
+
+    def setup(self):
+        n_compo = len(self.options['composition'])
+
+        for var, units in TOT_VARS:
+            if var == 'composition':
+                val = np.zeros(n_compo)
+            else:
+                val = 1.0
+            self.add_input(f'tot:{var}', val=val, units=units)
+
+            size = np.size(val)
+            row_col = np.arange(size)
+            for fl_name in self.options['fl_names']:
+                self.add_output(f'{fl_name}:tot:{var}', val=val, units=units)
+                self.declare_partials(of=f'{fl_name}:tot:{var}', wrt=f'tot:{var}',
+                                      val=np.ones(size), rows=row_col, cols=row_col)
+
+    def _copied_from(self, out_name):
+        return 'tot:' + out_name.split(':')[-1]
+
+    def compute(self, inputs, outputs):
+        for var, _ in TOT_VARS:
+            for fl_name in self.options['fl_names']:
+                outputs[f'{fl_name}:tot:{var}'] = inputs[f'tot:{var}']
+        self.compute_packed(inputs, outputs)
+
+    def compute_partials(self, inputs, J):
+        pass
+
+
 if __name__ == "__main__":
 
     from openmdao.api import Problem, IndepVarComp
@@ -0,0 +1,236 @@
+"""
+Tensor product cubic splines with precomputed coefficients.
+
+OpenMDAO's 'cubic' interpolation solves for the spline second derivatives of every sub-table it
+passes through, on every evaluation. The natural spline is linear in the table values, so those
+second derivatives can instead be found once, along every combination of axes, and kept with the
+table. An evaluation then only gathers the 4**ndim coefficients around the point, much like
+multilinear interpolation gathers the 2**ndim corners of its cell, and gives the same values and
+derivatives as MetaModelStructuredComp(method='cubic'), including the extrapolation.
+
+Akima splines can't be precomputed this way, since their slopes depend nonlinearly on the values.
+"""
+import numpy as np
+
+import openmdao.api as om
+
+
+SPLINE_METHODS = ('cubic',)
+
+
+def _second_deriv_matrix(grid):
+    """
+    Matrix giving the natural cubic spline second derivatives at the grid points from the values.
+    """
+    n = len(grid)
+    S = np.zeros((n, n))
+    if n < 3:
+        # a natural spline through two points is a line
+        return S
+
+    # tridiagonal system for the interior second derivatives, with a right hand side per value,
+    # solved with a forward and a reverse pass like OpenMDAO's InterpCubic
+    h = np.diff(grid)
+    rhs = np.zeros((n, n))
+    for i in range(1, n - 1):
+        rhs[i, i-1] = 6. / h[i-1]
+        rhs[i, i] = -6. / h[i-1] - 6. / h[i]
+        rhs[i, i+1] = 6. / h[i]
+
+    upper = np.zeros(n)
+    for i in range(1, n - 1):
+        pivot = 2. * (h[i-1] + h[i]) - h[i-1] * upper[i-1]
+        upper[i] = h[i] / pivot
+        rhs[i] = (rhs[i] - h[i-1] * rhs[i-1]) / pivot
+
+    for i in range(n - 2, 0, -1):
+        S[i] = rhs[i] - upper[i] * S[i+1]
+    return S
+
+
+def spline_coeffs(grid, values, method='cubic'):
+    """
+    Spline coefficients of `values` tabulated on the axes in `grid`.
+
+    Returns an array shaped (2**ndim,) + values.shape. Entry k holds the mixed second derivatives
+    of the spline along the axes whose bit is set in k (the first axis being the highest bit), so
+    entry 0 is the values themselves.
+    """
+    if method not in SPLINE_METHODS:
+        raise ValueError(f"method must be one of {SPLINE_METHODS}, but '{method}' was given")
+
+    values = np.asarray(values, dtype=float)
+    ndim = len(grid)
+    mats = [_second_deriv_matrix(np.asarray(g, dtype=float)) for g in grid]
+
+    coeffs = np.empty((2**ndim,) + values.shape)
+    for k in range(2**ndim):
+        c = values
+        for d in range(ndim):
+            if (k >> (ndim - 1 - d)) & 1:
+                c = _along_axis(mats[d], c, d)
+        coeffs[k] = c
+    return coeffs
+
+
+def _along_axis(mat, values, axis):
+    """
+    Apply mat to every 1D slice of values along axis.
+    """
+    moved = np.moveaxis(values, axis, 0)
+    flat = np.ascontiguousarray(moved).reshape((moved.shape[0], -1))
+    return np.moveaxis(mat.dot(flat).reshape(moved.shape), 0, axis)
+
+
+class SplineTable(object):
+    """
+    Tensor product cubic spline interpolation of a set of tables on the same grid.
+
+    `coeffs` has the spline coefficients of each table from `spline_coeffs`, where they were saved
+    with the data. Tables with None are computed here. Has the same values/derivs interface as the
+    tabular thermo PropertyTable, caching the terms of the last point.
+    """
+
+    def __init__(self, grid, tables, coeffs=None, method='cubic'):
+        self.grid = [np.asarray(g, dtype=float) for g in grid]
+        ndim = len(self.grid)
+        shape = tuple(len(g) for g in self.grid)
+        npts = int(np.prod(shape))
+
+        if coeffs is None:
+            coeffs = [None] * len(tables)
+        coeffs = [spline_coeffs(self.grid, t, method) if c is None else np.asarray(c)
+                  for t, c in zip(tables, coeffs)]
+
+        # (coefficient kind and grid point, tables), contiguous so each term is a single row
+        self.table = np.stack([c.reshape(-1) for c in coeffs], axis=-1)
+
+        # every term as the corner of the cell and the kind of coefficient (value or second
+        # derivative) along each axis, and as an offset into the flat table
+        strides = np.cumprod((shape[1:] + (1,))[::-1])[::-1]
+        terms = np.arange(4**ndim)
+        axis_bits = np.arange(ndim)[::-1]
+        self._corner_bits = ((terms[:, np.newaxis] >> ndim) >> axis_bits) & 1
+        self._kind_bits = (terms[:, np.newaxis] >> axis_bits) & 1
+        self._offsets = (terms & (2**ndim - 1)) * npts + self._corner_bits.dot(strides)
+        self._strides = strides
+
+        self._x = None
+
+    def out_of_bounds(self, x):
+        """
+        Index of the first coordinate of x outside of the grid, or None.
+        """
+        for d, g in enumerate(self.grid):
+            if not g[0] <= x[d].real <= g[-1]:
+                return d
+        return None
+
+    def _interpolate(self, x):
+        """
+        Find the cell and the weight of each term for the point x, and cache them.
+        """
+        if self._x is not None and x.dtype == self._x.dtype and np.array_equal(x, self._x):
+            return
+
+        ndim = len(x)
+        base = 0
+        # weights along each axis as [corner][kind], and their derivatives
+        W = np.empty((ndim, 2, 2), dtype=x.dtype)
+        dW = np.empty((ndim, 2, 2), dtype=x.dtype)
+        for d, g in enumerate(self.grid):
+            i = min(max(np.searchsorted(g, x[d].real, side='right') - 1, 0), len(g) - 2)
+            h = g[i+1] - g[i]
+            b = (x[d] - g[i]) / h
+            a = 1. - b
+            W[d] = ((a, (a**3 - a) * h**2 / 6.), (b, (b**3 - b) * h**2 / 6.))
+            dW[d] = ((-1. / h, -(3. * a**2 - 1.) * h / 6.), (1. / h, (3. * b**2 - 1.) * h / 6.))
+            base += i * self._strides[d]
+
+        axes = np.arange(ndim)
+        self._w_axis = W[axes, self._corner_bits, self._kind_bits]
+        self._dw_axis = dW[axes, self._corner_bits, self._kind_bits]
+        self._values = self.table[base + self._offsets]
+        self._x = x.copy()
+
+    def values(self, x):
+        """
+        Values of every table at the point x.
+        """
+        self._interpolate(x)
+        return np.prod(self._w_axis, axis=1).dot(self._values)
+
+    def derivs(self, x):
+        """
+        Derivatives of every table with respect to each coordinate of x, shaped (len(x), tables).
+        """
+        self._interpolate(x)
+
+        w_axis = self._w_axis
+        ndim = w_axis.shape[1]
+        dw = np.empty((ndim, len(w_axis)), dtype=w_axis.dtype)
+        for d in range(ndim):
+            dw[d] = np.prod(np.delete(w_axis, d, axis=1), axis=1) * self._dw_axis[:, d]
+        return dw.dot(self._values)
+
+
+class SplineMetaModel(om.ExplicitComponent):
+    """
+    Stand in for MetaModelStructuredComp with method='cubic' and scalar inputs, that takes the
+    spline coefficients of its outputs precomputed.
+
+    Inputs and outputs are added the same way, with add_input and add_output before setup.
+    """
+
+    def initialize(self):
+        self.options.declare('method', default='cubic', values=SPLINE_METHODS)
+        self.options.declare('extrapolate', types=bool, default=False,
+                             desc='extrapolate past the ends of the grid instead of raising an AnalysisError')
+        self.options.declare('coeffs', default=None, types=dict, allow_none=True, recordable=False,
+                             desc='spline coefficients of each output from spline_coeffs. '
+                                  'Any that are missing are computed at setup')
+
+        self.pnames = []
+        self._grid = []
+        self._training = {}
+
+    def add_input(self, name, val=1.0, training_data=None, **kwargs):
+        super().add_input(name, val, **kwargs)
+        self.pnames.append(name)
+        self._grid.append(np.asarray(training_data, dtype=float))
+
+    def add_output(self, name, val=1.0, training_data=None, **kwargs):
+        super().add_output(name, val, **kwargs)
+        self._training[name] = training_data
+
+    def setup(self):
+        coeffs = self.options['coeffs'] or {}
+        self._onames = list(self._training)
+        self._table = SplineTable(self._grid, [self._training[name] for name in self._onames],
+                                  [coeffs.get(name) for name in self._onames], self.options['method'])
+
+        for name in self._onames:
+            self.declare_partials(name, self.pnames)
+
+    def _point(self, inputs):
+        x = np.concatenate([inputs[name] for name in self.pnames])
+
+        if not self.options['extrapolate']:
+            d = self._table.out_of_bounds(x)
+            if d is not None:
+                g = self._grid[d]
+                raise om.AnalysisError(f"{self.msginfo}: Error interpolating outputs because input "
+                                       f"'{self.pathname}.{self.pnames[d]}' was out of bounds "
+                                       f"('{g[0]}', '{g[-1]}') with value '{x[d].real}'")
+        return x
+
+    def compute(self, inputs, outputs):
+        result = self._table.values(self._point(inputs))
+        for i, name in enumerate(self._onames):
+            outputs[name] = result[i]
+
+    def compute_partials(self, inputs, J):
+        dresult = self._table.derivs(self._point(inputs))
+        for i, name in enumerate(self._onames):
+            for d, pname in enumerate(self.pnames):
+                J[name, pname] = dresult[d, i]
@@ -0,0 +1,109 @@
+import time
+import unittest
+
+import openmdao.api as om
+
+from pycycle.constants import CEA_AIR_COMPOSITION
+from pycycle.element_base import Element
+from pycycle.flow_in import FlowIn
+from pycycle.mp_cycle import Cycle, MPCycle
+from pycycle.passthrough import TotalsPassThrough, TOT_VARS
+
+
+class _Station(Element):
+    """ light stand in for an element, that copies the totals of its first input to all of its outputs """
+
+    def initialize(self):
+        self.options.declare('n_in', default=1, types=int)
+        self.options.declare('n_out', default=1, types=int)
+        super().initialize()
+
+    def pyc_setup_output_ports(self):
+        for i in range(1, self.options['n_out'] + 1):
+            if self.options['n_in']:
+                self.copy_flow('Fl_I1', f'Fl_O{i}')
+            else:
+                self.init_output_flow(f'Fl_O{i}', CEA_AIR_COMPOSITION)
+
+    def setup(self):
+        n_in = self.options['n_in']
+        fl_names = [f'Fl_O{i}' for i in range(1, self.options['n_out'] + 1)]
+
+        for i in range(1, n_in + 1):
+            self.add_subsystem(f'flow_in{i}', FlowIn(fl_name=f'Fl_I{i}'), promotes=[f'Fl_I{i}:*'])
+
+        prom_in = [(f'tot:{var}', f'Fl_I1:tot:{var}') for var, _ in TOT_VARS] if n_in else []
+        self.add_subsystem('totals', TotalsPassThrough(fl_names=fl_names, composition=self.Fl_O_data['Fl_O1']),
+                           promotes_inputs=prom_in, promotes_outputs=['*'])
+
+
+class _Ladder(Cycle):
+    """ chain of stations where each one takes the flows of the two before it """
+
+    def initialize(self):
+        self.options.declare('n_elements', types=int)
+        super().initialize()
+
+    def setup(self):
+        n = self.options['n_elements']
+        for i in range(n):
+            self.add_subsystem(f'e{i}', _Station(n_in=min(i, 2), n_out=2))
+
+        for i in range(1, n):
+            self.pyc_connect_flow(f'e{i-1}.Fl_O1', f'e{i}.Fl_I1', connect_stat=False, connect_w=False)
+            if i > 1:
+                self.pyc_connect_flow(f'e{i-2}.Fl_O2', f'e{i}.Fl_I2', connect_stat=False, connect_w=False)
+
+        super().setup()
+
+
+class _MPLadder(MPCycle):
+
+    def initialize(self):
+        self.options.declare('n_elements', types=int)
+        self.options.declare('n_points', types=int)
+        super().initialize()
+
+    def setup(self):
+        for i in range(self.options['n_points']):
+            self.pyc_add_pnt(f'pt{i}', _Ladder(n_elements=self.options['n_elements'], design=(i == 0)))
+
+        super().setup()
+
+
+class FlowGraphBenchmark(unittest.TestCase):
+    """ setup scaling of cycles with hundreds of elements """
+
+    def _time_setup(self, model):
+        prob = om.Problem(model)
+        st = time.time()
+        prob.setup(check=False)
+        return prob, time.time() - st
+
+    def benchmark_ladder_scaling(self):
+
+        print()
+        for n in (100, 200, 400):
+            prob, t_setup = self._time_setup(_Ladder(n_elements=n))
+
+            G = prob.model._flow_graph
+            st = time.time()
+            order = prob.model._flow_order()
+            t_order = time.time() - st
+
+            self.assertEqual(len(order), G.number_of_nodes())
+            print(f'{n} elements, {G.number_of_nodes()} flow graph nodes: setup {t_setup:.2f}s '
+                  f'({1e3*t_setup/n:.2f}ms per element), flow order {1e3*t_order:.3f}ms')
+
+    def benchmark_ladder_points(self):
+
+        prob, t_setup = self._time_setup(_MPLadder(n_elements=200, n_points=4))
+
+        orders = [prob.model._get_subsystem(f'pt{i}')._flow_order() for i in range(4)]
+        for order in orders[1:]:
+            self.assertEqual(order, orders[0])
+        print(f'\n4 points of 200 elements: setup {t_setup:.2f}s')
+
+
+if __name__ == "__main__":
+    unittest.main()
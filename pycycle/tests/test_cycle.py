@@ -0,0 +1,225 @@
+import unittest
+import warnings
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
+
+from pycycle.mp_cycle import Cycle
+from pycycle.elements.duct import Duct
+from pycycle.elements.flow_start import FlowStart
+from pycycle.thermo.cea import species_data
+from pycycle.thermo.cea.chem_eq import ChemEq
+
+
+def _duct_cycle(frozen_elements=(), frozen_T_threshold=None, thermo_method='CEA', packed_flows=False,
+                lean_flows=False):
+
+    prob = om.Problem()
+    cycle = prob.model = Cycle(packed_flows=packed_flows, lean_flows=lean_flows)
+    cycle.options['thermo_method'] = thermo_method
+    cycle.options['thermo_data'] = species_data.janaf
+    cycle.options['frozen_elements'] = frozen_elements
+    cycle.options['frozen_T_threshold'] = frozen_T_threshold
+
+    cycle.add_subsystem('flow_start', FlowStart(), promotes=['MN', 'P', 'T'])
+    cycle.add_subsystem('duct', Duct(), promotes=['MN'])
+
+    cycle.pyc_connect_flow('flow_start.Fl_O', 'duct.Fl_I')
+
+    cycle.set_input_defaults('MN', 0.5)
+    cycle.set_input_defaults('duct.dPqP', 0.02)
+    cycle.set_input_defaults('P', 17., units='psi')
+    cycle.set_input_defaults('T', 900., units='degR')
+    cycle.set_input_defaults('flow_start.W', 500., units='lbm/s')
+
+    return prob
+
+
+class CycleFrozenThermoTestCase(unittest.TestCase):
+
+    def test_frozen_elements(self):
+
+        prob = _duct_cycle(frozen_elements=['duct'])
+        prob.setup(check=False)
+        prob.set_solver_print(level=-1)
+
+        self.assertEqual(prob.model.duct.options['thermo_method'], 'FROZEN')
+        self.assertEqual(prob.model.flow_start.options['thermo_method'], 'CEA')
+
+        prob.run_model()
+
+        ref = _duct_cycle()
+        ref.setup(check=False)
+        ref.set_solver_print(level=-1)
+        ref.run_model()
+
+        for name in ('tot:h', 'tot:S', 'tot:T', 'tot:gamma', 'stat:T', 'stat:P', 'stat:area'):
+            assert_near_equal(prob[f'duct.Fl_O:{name}'], ref[f'duct.Fl_O:{name}'], 1e-4)
+
+    def test_frozen_T_threshold(self):
+
+        prob = _duct_cycle(frozen_elements=['duct'], frozen_T_threshold=400.)
+        prob.setup(check=False)
+        prob.set_solver_print(level=-1)
+
+        with warnings.catch_warnings(record=True) as w:
+            warnings.simplefilter('always')
+            prob.run_model()
+
+        self.assertTrue(any('frozen composition' in str(msg.message) for msg in w))
+
+    def test_frozen_bad_thermo_method(self):
+
+        prob = _duct_cycle(frozen_elements=['duct'], thermo_method='TABULAR')
+
+        with self.assertRaises(ValueError) as cm:
+            prob.setup(check=False)
+
+        self.assertIn('`frozen_elements` requires the CEA thermo_method', str(cm.exception))
+
+    def test_frozen_missing_element(self):
+
+        prob = _duct_cycle(frozen_elements=['fan'])
+
+        with self.assertRaises(ValueError) as cm:
+            prob.setup(check=False)
+
+        self.assertIn("`frozen_elements` ['fan'] are not subsystems of this cycle", str(cm.exception))
+
+
+class CycleEqCacheTestCase(unittest.TestCase):
+
+    def test_eq_cache_size(self):
+
+        prob = _duct_cycle()
+        prob.model.options['eq_cache_size'] = 32
+        prob.setup(check=False)
+        prob.set_solver_print(level=-1)
+        prob.run_model()
+
+        chem_eqs = list(prob.model.system_iter(recurse=True, typ=ChemEq))
+        self.assertTrue(len(chem_eqs) > 0)
+        for comp in chem_eqs:
+            self.assertEqual(comp.options['warm_start_cache'], 32)
+
+        ref = _duct_cycle()
+        ref.setup(check=False)
+        ref.set_solver_print(level=-1)
+        ref.run_model()
+
+        for name in ('tot:h', 'tot:S', 'stat:T', 'stat:P', 'stat:area'):
+            assert_near_equal(prob[f'duct.Fl_O:{name}'], ref[f'duct.Fl_O:{name}'], 1e-5)
+
+
+class CycleFlowGraphTestCase(unittest.TestCase):
+
+    def test_flow_order(self):
+
+        prob = _duct_cycle()
+        prob.setup(check=False)
+
+        order = prob.model._flow_order()
+        self.assertEqual(order, ('flow_start', 'flow_start.Fl_O', 'duct.Fl_I', 'duct'))
+
+    def test_flow_loop(self):
+
+        prob = om.Problem()
+        cycle = prob.model = Cycle()
+        cycle.add_subsystem('flow_start', FlowStart())
+        cycle.add_subsystem('duct1', Duct())
+        cycle.add_subsystem('duct2', Duct())
+
+        cycle.pyc_connect_flow('duct1.Fl_O', 'duct2.Fl_I')
+        cycle.pyc_connect_flow('duct2.Fl_O', 'duct1.Fl_I')
+
+        with self.assertRaises(RuntimeError) as cm:
+            prob.setup(check=False)
+
+        self.assertEqual(str(cm.exception),
+                         "<model> <class Cycle>: The flow connections form a loop, duct1 -> duct1.Fl_O -> "
+                         "duct2.Fl_I -> duct2 -> duct2.Fl_O -> duct1.Fl_I -> duct1. Flow can't be propagated through it.")
+
+
+class CycleCompositionTestCase(unittest.TestCase):
+
+    def test_composition_sizes(self):
+
+        prob = _duct_cycle()
+        prob.setup(check=False)
+        prob.final_setup()
+
+        # the flow graph sizes every composition, so nothing is left to dynamic shaping
+        abs2meta = prob.model._var_allprocs_abs2meta['input']
+        self.assertFalse([name for name, meta in abs2meta.items() if meta['shape_by_conn'] or meta['copy_shape']])
+
+        n_compo = len(prob.model.flow_start.Fl_O_data['Fl_O'])
+        for name in ('tot:composition', 'stat:composition'):
+            self.assertEqual(abs2meta[f'duct.flow_in.Fl_I:{name}']['size'], n_compo)
+
+
+class CyclePackedFlowsTestCase(unittest.TestCase):
+
+    def test_packed_flows(self):
+
+        prob = _duct_cycle(packed_flows=True)
+        prob.setup(check=False, force_alloc_complex=True)
+        prob.set_solver_print(level=-1)
+        prob.run_model()
+
+        conns = prob.model._conn_global_abs_in2out
+        for name in ('tot:packed', 'stat:packed', 'stat:packed_flow'):
+            self.assertIn(f'flow_start.Fl_O:{name}', prob.model._var_allprocs_prom2abs_list['output'])
+            self.assertEqual(prob.model._var_abs2prom['output'][conns[f'duct.flow_in.Fl_I:{name}']],
+                             f'flow_start.Fl_O:{name}')
+        self.assertNotIn('duct.flow_in.Fl_I:tot:T', conns)
+
+        # the duct only gets the variables it uses unpacked
+        flow_in_outputs = prob.model.duct.flow_in._var_rel2meta
+        self.assertIn('Fl_I:tot:P', flow_in_outputs)
+        self.assertNotIn('Fl_I:tot:rho', flow_in_outputs)
+
+        ref = _duct_cycle()
+        ref.setup(check=False)
+        ref.set_solver_print(level=-1)
+        ref.run_model()
+
+        for name in ('tot:h', 'tot:S', 'tot:T', 'tot:P', 'stat:T', 'stat:P', 'stat:area', 'stat:W'):
+            assert_near_equal(prob[f'duct.Fl_O:{name}'], ref[f'duct.Fl_O:{name}'], 1e-10)
+        assert_near_equal(prob['duct.Fl_O:tot:composition'], ref['duct.Fl_O:tot:composition'], 1e-10)
+
+        data = prob.check_partials(out_stream=None, method='cs',
+                                   includes=['duct.flow_in', 'flow_start.out_stat.flow', 'flow_start.fs.flow'])
+        self.assertTrue(len(data) > 0)
+        assert_check_partials(data, atol=1e-10, rtol=1e-10)
+
+    def test_lean_flows(self):
+
+        prob = _duct_cycle(lean_flows=True)
+        prob.setup(check=False)
+        prob.set_solver_print(level=-1)
+        prob.run_model()
+
+        # only what the duct uses is connected, and there are no inputs for the rest
+        conns = prob.model._conn_global_abs_in2out
+        abs2prom = prob.model._var_abs2prom['input']
+        connected = {abs2prom[abs_in] for abs_in in conns}
+        self.assertIn('duct.Fl_I:tot:P', connected)
+        self.assertIn('duct.Fl_I:tot:composition', connected)
+        self.assertIn('duct.Fl_I:stat:W', connected)
+        self.assertNotIn('duct.Fl_I:tot:rho', prob.model._var_allprocs_prom2abs_list['input'])
+        self.assertNotIn('duct.Fl_I:stat:Vsonic', prob.model._var_allprocs_prom2abs_list['input'])
+
+        ref = _duct_cycle()
+        ref.setup(check=False)
+        ref.set_solver_print(level=-1)
+        ref.run_model()
+
+        self.assertLess(len(conns), len(ref.model._conn_global_abs_in2out))
+        for name in ('tot:h', 'tot:S', 'tot:T', 'tot:P', 'tot:rho', 'stat:T', 'stat:P', 'stat:area', 'stat:Vsonic'):
+            assert_near_equal(prob[f'duct.Fl_O:{name}'], ref[f'duct.Fl_O:{name}'], 1e-10)
+
+
+if __name__ == "__main__":
+    unittest.main()
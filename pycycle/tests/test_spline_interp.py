@@ -0,0 +1,91 @@
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
+
+from pycycle.spline_interp import SplineMetaModel, spline_coeffs
+from pycycle.maps.ncp01 import NCP01
+
+
+GRID = [np.array([0., 0.3, 0.4, 0.7, 0.9, 1.]),
+        np.array([1., 2., 4., 8., 16., 32., 64.]),
+        np.array([-1., 0., 0.5, 1., 3.])]
+
+
+def _tables():
+    rng = np.random.default_rng(11)
+    shape = tuple(len(g) for g in GRID)
+    return rng.normal(size=shape), np.sin(np.arange(np.prod(shape))).reshape(shape)
+
+
+def _problem(method, extrapolate, coeffs=None):
+    f, g = _tables()
+
+    p = om.Problem()
+    if method == 'spline':
+        comp = SplineMetaModel(extrapolate=extrapolate, coeffs=coeffs)
+    else:
+        comp = om.MetaModelStructuredComp(method='cubic', extrapolate=extrapolate)
+    for name, grid in zip(('x', 'y', 'z'), GRID):
+        comp.add_input(name, 0.5, training_data=grid)
+    comp.add_output('f', 0., training_data=f)
+    comp.add_output('g', 0., training_data=g)
+    p.model.add_subsystem('comp', comp, promotes=['*'])
+    p.setup(force_alloc_complex=True)
+    return p
+
+
+class SplineInterpTestCase(unittest.TestCase):
+
+    def test_metamodel_match(self):
+        # f's coefficients given, g's computed at setup
+        p = _problem('spline', True, coeffs={'f': spline_coeffs(GRID, _tables()[0])})
+        p_mm = _problem('om', True)
+
+        # inside the grid, on grid points and extrapolated beyond every edge
+        for x, y, z in ((0.5, 3., 0.2), (0.95, 50., 2.), (0.4, 8., 0.5), (-0.2, 0.5, -2.), (1.3, 90., 4.)):
+            for prob in (p, p_mm):
+                prob['x'] = x
+                prob['y'] = y
+                prob['z'] = z
+                prob.run_model()
+            assert_near_equal(p['f'], p_mm['f'], 1e-12)
+            assert_near_equal(p['g'], p_mm['g'], 1e-12)
+
+            data = p.check_partials(out_stream=None, method='cs')
+            assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+    def test_out_of_bounds(self):
+        p = _problem('spline', False)
+        p['x'] = 1.5
+        with self.assertRaises(om.AnalysisError):
+            p.run_model()
+
+    def test_map_coeffs(self):
+        # computed once and shared by every component using the map
+        coeffs = NCP01.spline_coeffs()
+        self.assertIs(NCP01.spline_coeffs(), coeffs)
+
+        p = om.Problem()
+        p.model.add_subsystem('map', NCP01.interp_comp('cubic'), promotes=['*'])
+        p.setup()
+        self.assertIs(p.model.map.options['coeffs'], coeffs)
+
+        # cubic splines go through the map points, and are linear along axes with only two
+        for i, j, k in ((0, 2, 3), (1, 5, 7)):
+            for param, idx in zip(NCP01.param_data, (i, j, k)):
+                p[param['name']] = param['values'][idx]
+            p.run_model()
+            for out in NCP01.output_data:
+                assert_near_equal(p[out['name']], out['values'][i, j, k], 1e-12)
+
+        p['alphaMap'] = 0.25 * NCP01.alphaMap[1]
+        p.run_model()
+        for out in NCP01.output_data:
+            assert_near_equal(p[out['name']], 0.75 * out['values'][0, 5, 7] + 0.25 * out['values'][1, 5, 7], 1e-12)
+
+
+if __name__ == "__main__":
+    unittest.main()
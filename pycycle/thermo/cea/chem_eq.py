@@ -1,3 +1,5 @@
+import weakref
+
 import numpy as np
 
 import openmdao.api as om
@@ -5,7 +7,8 @@ import openmdao.api as om
 from pycycle.constants import P_REF, R_UNIVERSAL_ENG, MIN_VALID_CONCENTRATION, CEA_AIR_COMPOSITION
 
 from pycycle.thermo.cea import species_data
-from pycycle.thermo.cea.props_rhs import PropsRHS
+from pycycle.thermo.cea.species_data import block_diag_pattern
+from pycycle.thermo.cea.props_rhs import PropsRHSSolve
 from pycycle.thermo.cea.props_calcs import PropsCalcs
 
 
@@ -14,27 +17,23 @@ class ThermoCalcs(om.Group):
 
     def initialize(self):
         self.options.declare('thermo', desc='thermodynamic data object', recordable=False)
+        self.options.declare('vec_size', default=1, types=int,
+                             desc='number of independent points to compute at once')
 
     def setup(self):
         thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
 
-        num_element = thermo.num_element
-
-        self.add_subsystem('TP2ls', PropsRHS(thermo), promotes_inputs=('T', 'n', 'n_moles', 'composition'))
+        # builds the T and P linear systems and solves them with one shared factorization
+        self.add_subsystem('TP2ls', PropsRHSSolve(thermo=thermo, vec_size=vec_size),
+                           promotes_inputs=('T', 'n', 'n_moles', 'composition'))
 
-        ne1 = num_element+1
-        self.add_subsystem('ls2t', om.LinearSystemComp(size=ne1))
-        self.add_subsystem('ls2p', om.LinearSystemComp(size=ne1))
-
-        self.add_subsystem('tp2props', PropsCalcs(thermo=thermo),
+        self.add_subsystem('tp2props', PropsCalcs(thermo=thermo, vec_size=vec_size),
                            promotes_inputs=['n', 'n_moles', 'T', 'P'],
                            promotes_outputs=['h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R']
                            )
-        self.connect('TP2ls.lhs_TP', ['ls2t.A', 'ls2p.A'])
-        self.connect('TP2ls.rhs_T', 'ls2t.b')
-        self.connect('TP2ls.rhs_P', 'ls2p.b')
-        self.connect('ls2t.x', 'tp2props.result_T')
-        self.connect('ls2p.x', 'tp2props.result_P')
+        self.connect('TP2ls.result_T', 'tp2props.result_T')
+        self.connect('TP2ls.result_P', 'tp2props.result_P')
 
 
 def _resid_weighting(n):
@@ -42,117 +41,351 @@ def _resid_weighting(n):
     return (1 / (1 + np.exp(-1e5 * n)) - .5) * 2
 
 
+# constants from the CEA control factor logic (NASA RP-1311, section 3.3)
+LN_SIZE = 18.420681 # -ln(1e-8): species below this mole fraction are treated as trace
+LN_TRACE_TARGET = 9.2103404 # -ln(1e-4)
+
+
+class EquilibriumCache(object):
+    """
+    Converged equilibrium solutions keyed on (T, P, composition), used to seed new operating points
+    from their nearest neighbour. Once the cache is full, the least recently used entry gets replaced.
+    """
+
+    def __init__(self, size, num_prod, num_element):
+        self.size = size
+
+        self._x = np.zeros((size, num_element+2))
+        self._n = np.zeros((size, num_prod))
+        self._pi = np.zeros((size, num_element))
+        self._last_used = np.zeros(size, dtype=int)
+        self._clock = 0
+        self.num_entries = 0
+
+        # solutions that haven't been put in the cache yet, and where each owner's points went last time,
+        # by id of the owner. Both are released when the owner is garbage collected
+        self._pending = {}
+        self._owner_slots = {}
+
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(T, P, composition):
+        # temperature and pressure act multiplicatively on the equilibrium constants, so compare
+        # their logs. The composition is compared as element fractions.
+        # Pressure matters a lot less than temperature, so it gets a smaller weight
+        x = np.empty((len(T), composition.shape[1]+2))
+        x[:, 0] = np.log(T)
+        x[:, 1] = 0.1*np.log(P)
+        x[:, 2:] = composition / np.sum(composition, axis=1)[:, np.newaxis]
+        return x
+
+    def _nearest(self, x):
+        d = np.sum(np.abs(x[:, np.newaxis, :] - self._x[np.newaxis, :self.num_entries, :]), axis=2)
+        idx = np.argmin(d, axis=1)
+        return idx, d[np.arange(len(x)), idx]
+
+    def lookup(self, T, P, composition):
+        """
+        Return the cached n and pi closest to each of the given points, and a mask of the points that were found.
+        """
+        self.flush()
+
+        npts = len(T)
+        if self.num_entries == 0:
+            self.misses += npts
+            return (np.zeros((npts, self._n.shape[1])), np.zeros((npts, self._pi.shape[1])),
+                    np.zeros(npts, dtype=bool))
+
+        idx, _ = self._nearest(self._key(T, P, composition))
+        self._clock += 1
+        self._last_used[idx] = self._clock
+        self.hits += npts
+
+        return self._n[idx], self._pi[idx], np.ones(npts, dtype=bool)
+
+    def store(self, T, P, composition, n, pi, slots=None):
+        """
+        Add converged solutions. A point that matches an existing entry overwrites it.
+
+        `slots` are the entries returned by a previous call for the same points. They are checked
+        first, which skips the search when the same point is stored repeatedly (e.g. every
+        iteration once a solver is close to converged). Returns the entry used for each point.
+        """
+        x = self._key(T, P, composition)
+        if slots is None:
+            slots = -np.ones(len(x), dtype=int)
+        else:
+            slots = slots.copy()
+
+        for k in range(len(x)):
+            self._clock += 1
+            i = slots[k]
+            if i >= 0 and np.array_equal(self._x[i], x[k]):
+                pass
+            elif self.num_entries:
+                idx, dist = self._nearest(x[k:k+1])
+                if dist[0] < 1e-10:
+                    i = idx[0]
+                elif self.num_entries < self.size:
+                    i = self.num_entries
+                    self.num_entries += 1
+                else:
+                    i = np.argmin(self._last_used)
+            else:
+                i = self.num_entries
+                self.num_entries += 1
+
+            self._x[i] = x[k]
+            self._n[i] = n[k]
+            self._pi[i] = pi[k]
+            self._last_used[i] = self._clock
+            slots[k] = i
+
+        return slots
+
+    def defer(self, owner, idx, T, P, composition, n, pi):
+        """
+        Queue solutions to be stored before the next lookup. A solver that is close to converged
+        calls this every iteration, so only the last solution at the same points is kept.
+
+        `owner` is the caller and `idx` are the indices of its points being stored.
+        """
+        key = id(owner)
+        if key not in self._owner_slots:
+            self._owner_slots[key] = {}
+            weakref.finalize(owner, self._release, key)
+
+        pending = self._pending.get(key)
+        if pending is not None and not (np.array_equal(pending[0], idx) and np.array_equal(pending[1], T) and
+                                        np.array_equal(pending[2], P) and np.array_equal(pending[3], composition)):
+            # the owner moved on to new points, so keep the old ones
+            self._store_pending(key, pending)
+        self._pending[key] = (idx, T, P, composition, n, pi)
+
+    def _release(self, key):
+        # the owner is gone, so store its last solutions and forget where its points went
+        pending = self._pending.pop(key, None)
+        if pending is not None:
+            self._store_pending(key, pending)
+        del self._owner_slots[key]
+
+    def _store_pending(self, key, pending):
+        idx, T, P, composition, n, pi = pending
+        # the owner may have been released already, then there are no slots left to remember
+        slots = self._owner_slots.get(key, {})
+        hint = np.array([slots.get(i, -1) for i in idx], dtype=int)
+        for i, slot in zip(idx, self.store(T, P, composition, n, pi, hint)):
+            slots[i] = slot
+
+    def flush(self):
+        """ Store all the queued solutions """
+        # an owner can be collected (and released) while storing, so go over a snapshot of the keys
+        # and skip the ones that were released in the meantime
+        for key in list(self._pending):
+            pending = self._pending.pop(key, None)
+            if pending is not None:
+                self._store_pending(key, pending)
+
+
+# process wide registry of EquilibriumCache, so every ChemEq on the same thermo data set shares one
+_equilibrium_cache_registry = {}
+
+
+def get_equilibrium_cache(thermo, size):
+    """Return the shared EquilibriumCache for the given thermo data object and cache size"""
+
+    key = (thermo.tables, size)
+    try:
+        return _equilibrium_cache_registry[key]
+    except KeyError:
+        cache = _equilibrium_cache_registry[key] = EquilibriumCache(size, thermo.num_prod, thermo.num_element)
+        return cache
+
+
 class ChemEq(om.ImplicitComponent):
     """ Find the equilibirum composition for a given gaseous mixture """
 
     def guess_nonlinear(self, inputs, outputs, resids):
         norm = resids.get_norm()
         if norm > 1e-2 or norm==0.0 or np.any(outputs['n'] < 0):
-            outputs['n'] = self.n_init
+            cache = self._get_cache()
+            if cache is None:
+                outputs['n'] = self.n_init
+                return
+
+            # seed from the nearest converged point anyone has seen, if there is one
+            vec_size = self.options['vec_size']
+            num_prod = self.options['thermo'].num_prod
+            n_guess, pi_guess, found = cache.lookup(inputs['T'].real, inputs['P'].real,
+                                                    inputs['composition'].real.reshape((vec_size, -1)))
+            n = self.n_init.reshape((vec_size, num_prod)).copy()
+            if np.any(found):
+                n[found] = n_guess[found]
+                pi = outputs['pi'].reshape((vec_size, -1)).copy()
+                pi[found] = pi_guess[found]
+                outputs['pi'] = pi.reshape(outputs['pi'].shape)
+            outputs['n'] = n.reshape(outputs['n'].shape)
+            outputs['n_moles'] = np.sum(n, axis=1)
 
     def initialize(self):
         self.options.declare('thermo', desc='thermodynamic data object', recordable=False)
+        self.options.declare('eq_solver', default='newton', values=('newton', 'reduced'),
+                              desc='Method used to converge the equilibrium. "newton" uses an OpenMDAO '
+                                   'NewtonSolver on the full set of species. "reduced" uses the classic CEA '
+                                   'iteration on the (num_element+1) sized reduced system inside `solve_nonlinear`')
+        self.options.declare('reduced_maxiter', default=100, types=int,
+                              desc='maximum number of iterations for the reduced equilibrium solver')
+        self.options.declare('reduced_tol', default=1e-10,
+                              desc='convergence tolerance on the mole corrections for the reduced equilibrium solver')
+        self.options.declare('vec_size', default=1, types=int,
+                              desc='number of independent points to solve at once. With vec_size > 1 every '
+                                   'variable gets a leading dimension of vec_size')
+        self.options.declare('active_set', default=True, types=bool,
+                              desc='If True, trace species are condensed out of the newton linear system so it only '
+                                   'covers the active species. Trace species come back into the active set '
+                                   'when their chemical potential says they should grow')
+        self.options.declare('warm_start_cache', default=0, types=int,
+                              desc='Number of converged solutions to keep in a cache shared by all ChemEq using the same '
+                                   'thermo data. New points are seeded from the nearest cached solution instead of the '
+                                   'flat initial guess. 0 turns the cache off')
 
     def setup(self):
 
-        newton = self.nonlinear_solver = om.NewtonSolver()
-        newton.options['maxiter'] = 100
-        newton.options['iprint'] = 2
-        newton.options['atol'] = 1e-7
-        newton.options['rtol'] = 1e-7
-        newton.options['stall_limit'] = 4
-        newton.options['stall_tol'] = 1e-10
-        newton.options['solve_subsystems'] = True
-        newton.options['reraise_child_analysiserror'] = False
-
-        self.options['assembled_jac_type'] = 'dense'
-        self.linear_solver = om.DirectSolver(assemble_jac=True)
-
-        ln_bt = newton.linesearch = om.BoundsEnforceLS()
-        # ln_bt = newton.linesearch = om.ArmijoGoldsteinLS()
-        # ln_bt.options['maxiter'] = 2
-        ln_bt.options['iprint'] = -1
-        # ln_bt.options['print_bound_enforce'] = True
-
-        # Once the concentration of a species reaches its minimum, we
-        # can essentially remove it from the problem. This switch controls
-        # whether to do this.
-        self.remove_trace_species = False
+        vec_size = self.options['vec_size']
+
+        if self.options['eq_solver'] == 'newton':
+            newton = self.nonlinear_solver = om.NewtonSolver()
+            newton.options['maxiter'] = 100
+            newton.options['iprint'] = 2
+            newton.options['atol'] = 1e-7
+            newton.options['rtol'] = 1e-7
+            newton.options['stall_limit'] = 4
+            newton.options['stall_tol'] = 1e-10
+            newton.options['solve_subsystems'] = True
+            newton.options['reraise_child_analysiserror'] = False
+
+            ln_bt = newton.linesearch = om.BoundsEnforceLS()
+            # ln_bt = newton.linesearch = om.ArmijoGoldsteinLS()
+            # ln_bt.options['maxiter'] = 2
+            ln_bt.options['iprint'] = -1
+            # ln_bt.options['print_bound_enforce'] = True
+        # NOTE: the 'reduced' solver is implemented in solve_nonlinear,
+        #       which only gets called if there is no nonlinear solver on this component
+
+        # the points are independent, so the jacobian is block diagonal
+        if vec_size > 1:
+            self.options['assembled_jac_type'] = 'csc'
+        else:
+            self.options['assembled_jac_type'] = 'dense'
+        if self.options['active_set']:
+            # the condensed systems are built in linearize and used by solve_linear
+            self.linear_solver = om.LinearUserDefined()
+        else:
+            self.linear_solver = om.DirectSolver(assemble_jac=True)
 
         # multiply a damping function that scales down the residual for trace species
         self.use_trace_damping = True
 
         thermo = self.options['thermo']
+        if vec_size > 1:
+            self._eval_all = thermo.eval_all_vec
+        else:
+            self._eval_all = thermo.eval_all
 
         num_prod = thermo.num_prod
         num_element = thermo.num_element
 
+        # Once the concentration of a species reaches its minimum, we
+        # can essentially remove it from the problem. This switch controls
+        # whether to do this (separately for each point).
+        self.remove_trace_species = np.zeros(vec_size, dtype=bool)
+        self._trace = np.zeros((vec_size, num_prod), dtype=bool)
+
+        if vec_size > 1:
+            shape = vec_size
+            n_shape = (vec_size, num_prod)
+            pi_shape = (vec_size, num_element)
+        else:
+            shape = 1
+            n_shape = num_prod
+            pi_shape = num_element
+
         # Input vars
-        self.add_input('composition', val=thermo.b0, desc='moles of atoms present in mixture')
+        self.add_input('composition', val=np.ones(pi_shape)*thermo.b0, desc='moles of atoms present in mixture')
 
-        self.add_input('P', val=1.0, units="bar", desc="Pressure")
+        self.add_input('P', val=1.0, shape=shape, units="bar", desc="Pressure")
 
-        self.add_input('T', val=400., units="degK", desc="Temperature")
+        self.add_input('T', val=400., shape=shape, units="degK", desc="Temperature")
 
         # State vars
-        self.n_init = np.ones(num_prod) / num_prod / 10  # initial guess for n
+        self.n_init = np.ones(n_shape) / num_prod / 10  # initial guess for n
 
-        self.add_output('n', shape=num_prod,
+        self.add_output('n', shape=n_shape,
                         val=self.n_init,
                         desc="mole fractions of the mixture",
                         lower=MIN_VALID_CONCENTRATION,
-                        upper=1e2, 
+                        upper=1e2,
                         res_ref=10000.
                         )
 
-        self.add_output('pi', val=np.ones(num_element),
+        self.add_output('pi', val=np.ones(pi_shape),
                         desc="modified lagrange multipliers from the Gibbs lagrangian")
 
         # Explicit Outputs
-        self.add_output('n_moles', lower=1e-10, val=0.034, shape=1,
+        self.add_output('n_moles', lower=1e-10, val=0.034, shape=shape,
                         desc="1/molecular weight of gas")
 
-        # allocate the newton Jacobian
-        self.size = size = num_prod + num_element
-
-        self._dRdy = np.zeros((size, size))
-        self._rhs = np.zeros(size)  # used for solve_linear
-
         # Cached stuff for speed
         self.H0_T = None
         self.S0_T = None
-        self.dH0_dT = None
-        self.dS0_dT = None
-        self.sum_n_H0_T = None
+        self.weights = None
 
         # self.deriv_options['check_type'] = 'cs'
         # self.deriv_options['check_step_size'] = 1e-50
         # self.deriv_options['type'] = 'fd'
         # self.deriv_options['step_size'] = 1e-5
 
-        self.declare_partials('n', ['n', 'pi', 'P', 'T'])
-        self.declare_partials('pi', ['n', 'composition'])
-        self.declare_partials('n_moles', 'n')
-        self.declare_partials('n_moles', 'n_moles', val=-1)
+        rows, cols = block_diag_pattern(vec_size, num_prod, num_prod)
+        self.declare_partials('n', 'n', rows=rows, cols=cols)
+        rows, cols = block_diag_pattern(vec_size, num_prod, num_element)
+        self.declare_partials('n', 'pi', rows=rows, cols=cols)
+        rows, cols = block_diag_pattern(vec_size, num_prod, 1)
+        self.declare_partials('n', ['P', 'T'], rows=rows, cols=cols)
+
+        rows, cols = block_diag_pattern(vec_size, num_element, num_prod)
+        self.declare_partials('pi', 'n', rows=rows, cols=cols, val=np.tile(thermo.aij.ravel(), vec_size))
+        ar = np.arange(vec_size*num_element)
+        self.declare_partials('pi', 'composition', rows=ar, cols=ar, val=-1.)
+
+        rows, cols = block_diag_pattern(vec_size, 1, num_prod)
+        self.declare_partials('n_moles', 'n', rows=rows, cols=cols, val=1.)
+        ar = np.arange(vec_size)
+        self.declare_partials('n_moles', 'n_moles', rows=ar, cols=ar, val=-1.)
 
     def apply_nonlinear(self, inputs, outputs, resids):
         thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        num_element = thermo.num_element
 
         T = inputs['T']
-        P = inputs['P'] / P_REF
-        composition = inputs['composition']
-        n = outputs['n']
-        n_moles = np.sum(n)
-        pi = outputs['pi']
+        P = (inputs['P'] / P_REF)[:, np.newaxis]
+        composition = inputs['composition'].reshape((vec_size, num_element))
+        n = outputs['n'].reshape((vec_size, num_prod))
+        n_moles = np.sum(n, axis=1)
+        pi = outputs['pi'].reshape((vec_size, num_element))
 
         # Output equation for n_moles
         resids['n_moles'] = n_moles - outputs['n_moles']
 
         try:
-            self.H0_T = H0_T = thermo.H0(T)
-            self.S0_T = S0_T = thermo.S0(T)
+            H0_T, S0_T = self._eval_all(T)[:2]
+            self.H0_T = H0_T
+            self.S0_T = S0_T
         except:
-            raise AnalysisError('Bad Temp')
+            raise om.AnalysisError('Bad Temp')
             # T[:] = 500.
             # self.H0_T = H0_T = thermo.H0(T)
             # self.S0_T = S0_T = thermo.S0(T)
@@ -161,167 +394,388 @@ class ChemEq(om.ImplicitComponent):
 
         try:
             np.seterr(all='raise')
-            self.mu = H0_T - S0_T + np.log(n) + np.log(P) - np.log(n_moles)
+            self.mu = H0_T - S0_T + np.log(n) + np.log(P) - np.log(n_moles)[:, np.newaxis]
             np.seterr(all='warn')
         except:
             print('ChemEQ error in: ', self.pathname)
             print('n', n)
             print('P', P)
             print('n_moles', n_moles)
-            self.mu = H0_T - S0_T + np.log(n) + np.log(1e-5) - np.log(n_moles)
+            self.mu = H0_T - S0_T + np.log(n) + np.log(1e-5) - np.log(n_moles)[:, np.newaxis]
             np.seterr(all='warn')
 
-        resids_n = (self.mu - np.sum(pi * thermo.aij.T, axis=1))
+        resids_n = self.mu - pi.dot(thermo.aij)
         if self.use_trace_damping:
-            self.weights = _resid_weighting(n * n_moles)
+            self.weights = _resid_weighting(n * n_moles[:, np.newaxis])
             resids_n *= self.weights
 
         # Zero out resids when a concentration drops too low.
-        if self.remove_trace_species:
-            # for j, composition in enumerate(n):
-            #     if composition <= 1.0e-10:
-            #         resids['n'][j] = 0.0
-            self._trace = np.where(n <= MIN_VALID_CONCENTRATION+1e-20)
-            resids_n[self._trace] = 0.
+        self._trace = (n <= MIN_VALID_CONCENTRATION+1e-20) & self.remove_trace_species[:, np.newaxis]
+        if self.options['active_set']:
+            # a species whose chemical potential is below the element potentials would
+            # lower the Gibbs energy by growing, so it goes back into the active set
+            self._trace &= resids_n.real >= 0.
+        resids_n[self._trace] = 0.
 
         # this keeps our vector.__setitem__ calls to a minimum
-        resids['n'] = resids_n
+        resids['n'] = resids_n.reshape(outputs['n'].shape)
 
         # residuals from the conservation of mass
-        resids['pi'] = np.sum(thermo.aij * n, axis=1) - composition
+        resids['pi'] = (n.dot(thermo.aij.T) - composition).reshape(outputs['pi'].shape)
+
+        resid_norm = np.linalg.norm(resids_n, axis=1)
+        self.remove_trace_species = resid_norm < 1e-4
+
+        if self.options['warm_start_cache'] > 0 and not outputs._under_complex_step:
+            # close enough to converged to be a good seed for another point.
+            # The newton solver stops with the trace species still a bit off, so the tolerances are loose.
+            # This gets called a lot once things are converged, so the point is only
+            # put in the cache the next time something needs a seed
+            done = resid_norm < 1e-3
+            if np.any(done):
+                resids_pi = resids['pi'].reshape((vec_size, num_element))
+                done &= np.linalg.norm(resids_pi, axis=1) < 1e-5*np.linalg.norm(composition, axis=1)
+                if np.any(done):
+                    self._get_cache().defer(self, np.where(done)[0], T[done], inputs['P'][done],
+                                            composition[done], n[done], pi[done])
+
+    def _get_cache(self):
+        size = self.options['warm_start_cache']
+        if size <= 0:
+            return None
+        return get_equilibrium_cache(self.options['thermo'], size)
+
+    def solve_nonlinear(self, inputs, outputs):
+        """
+        Reduced CEA iteration (NASA RP-1311, eqns 2.24 and 2.26 with no condensed species).
+
+        Only the element potentials `pi` and the correction to ln(n_moles) are solved for
+        in a linear system of size (num_element+1). The species corrections are then
+        recovered in closed form. Species that drop to MIN_VALID_CONCENTRATION are
+        held there (matching the lower bound used by the newton solver) and are
+        brought back in if their chemical potential says they should grow.
+        """
+        thermo = self.options['thermo']
+        aij = thermo.aij
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        num_element = thermo.num_element
 
-        if np.linalg.norm(resids['n']) < 1e-4:
-            self.remove_trace_species = True
-        else:
-            self.remove_trace_species = False
+        T = inputs['T']
+        P = inputs['P'] / P_REF
+        b0 = inputs['composition'].reshape((vec_size, num_element))
+
+        H0_T, S0_T = self._eval_all(T)[:2]
+        self.H0_T = H0_T
+        self.S0_T = S0_T
+        mu0 = H0_T - S0_T + np.log(P)[:, np.newaxis]
+
+        # start from the current state where it is reasonable, otherwise from the default guess
+        n = outputs['n'].reshape((vec_size, num_prod))
+        n_init = self.n_init.reshape((vec_size, num_prod))
+        warm = np.all(np.isfinite(n), axis=1) & np.all(n >= MIN_VALID_CONCENTRATION, axis=1) & (np.sum(n, axis=1) < 1e2)
+        n_guess = np.where(warm[:, np.newaxis], n, n_init)
+
+        # points that would start from the default guess get seeded from the cache instead
+        cache = self._get_cache()
+        cold = np.where(~warm | np.all(n == n_init, axis=1))[0]
+        if cache is not None and len(cold):
+            n_cached, _, found = cache.lookup(T[cold].real, inputs['P'][cold].real, b0[cold].real)
+            n_guess[cold[found]] = n_cached[found]
+            warm[cold[found]] = True
+
+        nj, pi, converged, iter_count = self._reduced_solve(mu0, b0, n_guess)
+
+        # points that didn't converge from the warm start get another shot from the default guess
+        retry = np.where(~converged & warm)[0]
+        if len(retry):
+            nj[retry], pi[retry], converged[retry], retry_count = self._reduced_solve(mu0[retry], b0[retry], n_init[retry])
+            iter_count[retry] += retry_count
+
+        self.reduced_iter_count = np.sum(iter_count)
+
+        if cache is not None and not inputs._under_complex_step:
+            idx = np.where(converged)[0]
+            cache.defer(self, idx, T[idx], inputs['P'][idx], b0[idx], nj[idx], pi[idx])
+
+        if not np.all(converged):
+            raise om.AnalysisError(f'{self.pathname}: reduced equilibrium solver failed to converge '
+                                f'in {self.options["reduced_maxiter"]} iterations')
+
+        # If the species left above the floor can't span all the elements (e.g. a stoichiometric
+        # mixture at low temperature) then pi is not uniquely defined and the linearization is
+        # singular. Hold just enough of the floored species slightly above the floor so they
+        # stay in the linear system, which mimics what the newton solver ends up doing.
+        trace = nj <= MIN_VALID_CONCENTRATION+1e-20
+        deficient = np.linalg.matrix_rank(aij * ~trace[:, np.newaxis, :]) < num_element
+        for k in np.where(deficient)[0]:
+            for j in np.where(trace[k])[0]:
+                trace[k, j] = False
+                nj[k, j] = 1.0001*MIN_VALID_CONCENTRATION
+                if np.linalg.matrix_rank(aij[:, ~trace[k]]) == num_element:
+                    break
+
+        n_moles = np.sum(nj, axis=1)
+        outputs['n'] = nj.reshape(outputs['n'].shape)
+        outputs['pi'] = pi.reshape(outputs['pi'].shape)
+        outputs['n_moles'] = n_moles
+
+        # leave the same cached data behind that apply_nonlinear would, so linearize is consistent
+        self.weights = _resid_weighting(nj * n_moles[:, np.newaxis])
+        self._trace = trace
+        self.remove_trace_species = np.ones(vec_size, dtype=bool)
+
+    def _reduced_solve(self, mu0, b0, n_guess):
+        """
+        Run the reduced iteration for a stack of points. Each point only iterates until it has converged.
+
+        Returns the species concentrations, pi, a converged flag and the iteration count for each point.
+        """
+        thermo = self.options['thermo']
+        aij = thermo.aij
+        num_element = thermo.num_element
+        maxiter = self.options['reduced_maxiter']
+        tol = self.options['reduced_tol']
+
+        npts = n_guess.shape[0]
+        ln_min = np.log(MIN_VALID_CONCENTRATION)
+        element_species = (aij > 0).astype(float)
+
+        nj = np.maximum(n_guess, MIN_VALID_CONCENTRATION)
+        ln_nj = np.log(nj)
+        n_moles = np.sum(nj, axis=1)
+        ln_n = np.log(n_moles)
+        active = nj > MIN_VALID_CONCENTRATION
+
+        pi = np.zeros((npts, num_element))
+        converged = np.zeros(npts, dtype=bool)
+        iter_count = np.zeros(npts, dtype=int)
+        full_rank = np.ones(npts, dtype=bool)
+        last_active = np.zeros_like(active)
+        rank_checked = np.zeros(npts, dtype=bool)
+
+        for i in range(maxiter):
+
+            # only keep iterating on the points that haven't converged
+            r = np.where(~converged)[0]
+            if len(r) == 0:
+                break
+            iter_count[r] += 1
+
+            act = active[r]
+            nj_r = nj[r]
+            ln_nj_r = ln_nj[r]
+            ln_n_r = ln_n[r]
+            n_moles_r = n_moles[r]
+
+            # never leave an element without any active species, or the system is singular
+            orphans = act.astype(float).dot(aij.T) == 0
+            if np.any(orphans):
+                act |= orphans.astype(float).dot(element_species) > 0
+
+            mu = mu0[r] + ln_nj_r - ln_n_r[:, np.newaxis]
+            n_act = nj_r * act
+            aij_n = aij * n_act[:, np.newaxis, :]
+
+            lhs = np.empty((len(r), num_element+1, num_element+1))
+            lhs[:, :num_element, :num_element] = aij_n.dot(aij.T)
+            lhs[:, :num_element, num_element] = lhs[:, num_element, :num_element] = np.sum(aij_n, axis=2)
+            lhs[:, num_element, num_element] = np.sum(n_act, axis=1) - n_moles_r
+
+            rhs = np.empty((len(r), num_element+1))
+            rhs[:, :num_element] = b0[r] - nj_r.dot(aij.T) + np.einsum('kij,kj->ki', aij_n, mu)
+            rhs[:, num_element] = n_moles_r - np.sum(nj_r, axis=1) + np.sum(n_act*mu, axis=1)
+
+            # if the active species can't span all the elements (e.g. a stoichiometric mixture
+            # at low temperature) then the system is singular, so take the least squares step
+            changed = ~rank_checked[r] | np.any(act != last_active[r], axis=1)
+            if np.any(changed):
+                rc = r[changed]
+                full_rank[rc] = np.linalg.matrix_rank(aij * act[changed][:, np.newaxis, :]) == num_element
+                last_active[rc] = act[changed]
+                rank_checked[rc] = True
+            fr = full_rank[r]
+            x = np.empty((len(r), num_element+1))
+            if np.any(fr):
+                x[fr] = np.linalg.solve(lhs[fr], rhs[fr][:, :, np.newaxis])[:, :, 0]
+            for k in np.where(~fr)[0]:
+                x[k] = np.linalg.lstsq(lhs[k], rhs[k], rcond=None)[0]
+            pi_r = x[:, :num_element]
+            dln_n = x[:, num_element]
+            dln_nj = pi_r.dot(aij) + dln_n[:, np.newaxis] - mu
+
+            # trace species whose chemical potential is now below the element potentials should grow
+            revived = ~act & (dln_nj > 0)
+
+            err = np.maximum(np.max(np.abs(n_act*dln_nj), axis=1)/n_moles_r, np.abs(dln_n))
+            done = (err < tol) & ~np.any(revived, axis=1)
+            pi[r] = pi_r
+            converged[r[done]] = True
+
+            # take the step on everything that isn't done yet
+            keep = ~done
+            r = r[keep]
+            act = act[keep] | revived[keep]
+            dln_nj = dln_nj[keep]
+            dln_n = dln_n[keep]
+            ln_nj_r = ln_nj_r[keep]
+            ln_n_r = ln_n_r[keep]
+
+            # CEA control factor to limit the step size
+            ln_frac = ln_nj_r - ln_n_r[:, np.newaxis]
+            major = act & (ln_frac > -LN_SIZE)
+            max_corr = np.maximum(5*np.abs(dln_n), np.max(np.where(major, dln_nj, -np.inf), axis=1))
+            lam = np.where(max_corr > 2., 2./max_corr, 1.)
+            minor = act & (ln_frac <= -LN_SIZE) & (dln_nj >= 0) & (dln_nj != dln_n[:, np.newaxis])
+            with np.errstate(divide='ignore', invalid='ignore'):
+                lam_minor = np.where(minor, np.abs((-ln_frac - LN_TRACE_TARGET)/(dln_nj - dln_n[:, np.newaxis])), np.inf)
+            lam = np.minimum(lam, np.min(lam_minor, axis=1))
+
+            ln_nj_r = np.where(act, ln_nj_r + lam[:, np.newaxis]*dln_nj, ln_nj_r)
+            ln_n[r] = ln_n_r + lam*dln_n
+
+            # anything that falls below the floor gets removed from the active set
+            active[r] = act & (ln_nj_r > ln_min)
+            ln_nj[r] = np.maximum(ln_nj_r, ln_min)
+            nj[r] = np.exp(ln_nj[r])
+            n_moles[r] = np.exp(ln_n[r])
+
+        return nj, pi, converged, iter_count
 
     def linearize(self, inputs, outputs, J):
 
-        self._calc_dRdy(inputs, outputs)
-        dRdy = self._dRdy
-
         thermo = self.options['thermo']
-
-        num_element = thermo.num_element
+        vec_size = self.options['vec_size']
         num_prod = thermo.num_prod
 
         P = inputs['P'] / P_REF
-        n = outputs['n']
-        n_moles = np.sum(n)
-
-        # TODO: Talk to John about this problem.
-        # hack to handle the fact that n_moles doesn't get set if you only call apply_linear
-        if n_moles < 1e-30:
-            n_moles = np.sum(n)
+        n = outputs['n'].reshape((vec_size, num_prod))
+        n_moles = np.sum(n, axis=1)
 
         qP = 1.0 / P_REF / P  # quotient_P or 1/P
 
-        end_element = num_prod + num_element
-
-        J_n_n = dRdy[:num_prod, :num_prod]
-
-        J_n_pi = dRdy[:num_prod, num_prod: end_element]
-
-        J_n_n_moles = -n/n_moles
-
         if self.use_trace_damping:
-            J_n_P = (self.weights * qP).reshape((-1, 1))
+            if outputs._under_complex_step:
+                weights = self.weights.astype(complex)
+            else:
+                weights = self.weights.real
         else:
-            J_n_P = qP*np.ones((num_prod, 1))
-
-        T = inputs['T']
-        dH0_dT = thermo.H0_applyJ(T, 1)
-        dS0_dT = thermo.S0_applyJ(T, 1)
-        if self.use_trace_damping:
-            J_n_T = ((dH0_dT - dS0_dT) * self.weights).reshape((num_prod, 1))
-        else:
-            J_n_T = ((dH0_dT - dS0_dT)).reshape((num_prod, 1))
-
-        J['pi', 'n'] = dRdy[num_prod:end_element, :num_prod]
-        J['pi', 'composition'] = -np.eye(num_element)
-
-        J['n_moles', 'n'] = np.ones((1, num_prod))
-
-        if self.remove_trace_species:
-            # non-vectorized loop; left here for code clarity
-            # for j, is_trace in enumerate(self._trace):
-            #     if is_trace:
-            #         J_n_n[:, j] = 0.
-            #         J_n_n[j, :] = 0.
-            #         J_n_n[j, j] = 1.
-
-            #         J['n', 'P'][j, :] = 0
-            #         J['n', 'T'][j, :] = 0
-            #         J['n', 'pi'][j, :] = 0
-
-            #         J['pi', 'n'][:, j] = 0.
+            weights = np.ones((vec_size, num_prod))
 
-            mask = self._trace
-            J_n_n[:, mask] = 0.
-            J_n_n[mask, :] = 0.
-            J_n_n[mask, mask] = 1.
-
-            J_n_P[mask, :] = 0
-            J_n_T[mask, :] = 0
-            J_n_pi[mask, :] = 0
-            J_n_n_moles[mask] = 0
+        # dRgibbs_dn
+        J_n_n = np.empty((vec_size, num_prod, num_prod), dtype=n.dtype)
+        J_n_n[:] = -1. / n_moles[:, np.newaxis, np.newaxis]
+        diag = np.arange(num_prod)
+        J_n_n[:, diag, diag] += 1. / n
+        J_n_n *= weights[:, :, np.newaxis]
 
-            # J['pi', 'n'][:, mask] = 0.
+        # dRgibbs_dpi
+        J_n_pi = -thermo.aij.T * weights[:, :, np.newaxis]
 
-        J['n', 'n'] = J_n_n
-        J['n', 'P'] = J_n_P
-        J['n', 'T'] = J_n_T
-        J['n', 'pi'] = J_n_pi
+        J_n_P = weights * qP[:, np.newaxis]
 
-    def _calc_dRdy(self, inputs, outputs):
-        """ Computes the Jacobian for the newton solver. This Jacobian
-        contains the derivatives of all residual equations with respect to
-        the state variables, which are ['n', 'pi', and sometimes 'T'] """
+        T = inputs['T']
+        dH0_dT, dS0_dT = self._eval_all(T)[3:5]
+        J_n_T = (dH0_dT - dS0_dT) * weights
 
+        # Replace J for tiny values of n with identity
+        mask = self._trace
+        if np.any(mask):
+            k, j = np.nonzero(mask)
+            J_n_n[mask] = 0.
+            J_n_n.transpose((0, 2, 1))[mask] = 0.
+            J_n_n[k, j, j] = 1.
+
+            J_n_P[mask] = 0
+            J_n_T[mask] = 0
+            J_n_pi[mask] = 0
+
+        J['n', 'n'] = J_n_n.ravel()
+        J['n', 'P'] = J_n_P.ravel()
+        J['n', 'T'] = J_n_T.ravel()
+        J['n', 'pi'] = J_n_pi.ravel()
+
+        if self.options['active_set']:
+            self._factor_active(n, weights)
+
+    def _factor_active(self, n, weights):
+        """
+        Condense the newton system down to the active species.
+
+        Trace species have identity rows and zero columns in dRn/dn, so their corrections
+        are known directly and they only show up on the right hand side of the mass balance.
+        The active block is W*(diag(1/n) - 1/n_moles), so the active species corrections can be
+        written in closed form in terms of pi and the total mole correction (the same reduction
+        used by the CEA iteration), which leaves a (num_element+1) system for each point.
+        """
+        aij = self.options['thermo'].aij
+        num_element = self.options['thermo'].num_element
+
+        active = ~self._trace
+        self._n_act = n_act = n * active
+        self._n_moles_lin = n_moles = np.sum(n, axis=1)
+        # weights are only ever divided out for the active species
+        self._inv_w = np.where(active, 1./np.where(active, weights, 1.), 0.)
+
+        aij_n = aij * n_act[:, np.newaxis, :]
+        G = np.empty((len(n), num_element+1, num_element+1), dtype=n.dtype)
+        G[:, :num_element, :num_element] = aij_n.dot(aij.T)
+        G[:, num_element, :num_element] = np.sum(aij_n, axis=2)
+        G[:, :num_element, num_element] = G[:, num_element, :num_element] / n_moles[:, np.newaxis]
+        G[:, num_element, num_element] = np.sum(n_act, axis=1)/n_moles - 1.
+        self._G_inv = np.linalg.inv(G)
+
+    def solve_linear(self, d_outputs, d_residuals, mode):
         thermo = self.options['thermo']
         aij = thermo.aij
+        vec_size = self.options['vec_size']
         num_prod = thermo.num_prod
         num_element = thermo.num_element
 
-        n = outputs['n']
-        n_moles = np.sum(n)
-        # pi = outputs['pi']
+        trace = self._trace
+        n_act = self._n_act
+        inv_w = self._inv_w
+        n_moles = self._n_moles_lin[:, np.newaxis]
 
-        if outputs._under_complex_step:
-            dRdy = self._dRdy = self._dRdy.astype(np.complex)
-            if self.use_trace_damping:
-                self.weights = self.weights.astype(np.complex)
-        else:
-            dRdy = self._dRdy = self._dRdy.real
-            if self.use_trace_damping:
-                self.weights = self.weights.real
+        rhs = np.empty((vec_size, num_element+1, 1), dtype=self._G_inv.dtype)
 
-        # dRgibbs_dn
+        if mode == 'fwd':
+            r_n = d_residuals['n'].reshape((vec_size, num_prod))
+            r_pi = d_residuals['pi'].reshape((vec_size, num_element))
 
-        MW = 1 / n_moles
-        dRdy[:num_prod, :num_prod] = (-MW)
-        diag = (1 / n - MW)
-        np.fill_diagonal(dRdy[:num_prod, :num_prod], diag)
-        # multiples each row by one element of the vector
-        if self.use_trace_damping:
-            dRdy[:num_prod, :num_prod] *= self.weights[:, np.newaxis]
+            # raw (un-weighted) gibbs residuals of the active species
+            nq = n_act*r_n*inv_w
+            dn_trace = r_n*trace
 
-        end_element = num_prod + num_element
-        # dRgibbs_dpi
-        dRdy[:num_prod, num_prod:end_element] = (-aij.T)
-        if self.use_trace_damping:
-            dRdy[:num_prod, num_prod:end_element] *= self.weights[:, np.newaxis]
+            rhs[:, :num_element, 0] = r_pi - (dn_trace + nq).dot(aij.T)
+            rhs[:, num_element, 0] = -np.sum(nq, axis=1)
+            x = np.matmul(self._G_inv, rhs)[:, :, 0]
+            dpi = x[:, :num_element]
+            dln_n = x[:, num_element:] / n_moles
 
-        # dRmass_dn
-        dRdy[num_prod:end_element, :num_prod] = aij
+            dn = nq + n_act*(dln_n + dpi.dot(aij)) + dn_trace
 
-        # Replace J for tiny values of n with identity
-        if self.remove_trace_species:
-            n = outputs['n']
-            for j in range(num_prod):
-                if n[j] <= 1.0e-10:
-                    dRdy[j, :] = 0.0
-                    dRdy[j, j] = -1.0
+            d_outputs['n'] = dn.reshape(d_outputs['n'].shape)
+            d_outputs['pi'] = dpi.reshape(d_outputs['pi'].shape)
+            d_outputs['n_moles'] = np.sum(dn, axis=1) - d_residuals['n_moles']
+
+        else:  # rev
+            b_pi = d_outputs['pi'].reshape((vec_size, num_element))
+            x_nm = -d_outputs['n_moles']
+            b_n = d_outputs['n'].reshape((vec_size, num_prod)) - x_nm[:, np.newaxis]
+
+            rhs[:, :num_element, 0] = (n_act*b_n).dot(aij.T) + b_pi
+            rhs[:, num_element, 0] = np.sum(n_act*b_n, axis=1)
+            x = np.matmul(self._G_inv, rhs)[:, :, 0]
+            x_pi = x[:, :num_element]
+            u = x[:, num_element:] / n_moles
+
+            b_n -= x_pi.dot(aij)
+            x_n = b_n*trace + n_act*(b_n - u)*inv_w
+
+            d_residuals['n'] = x_n.reshape(d_residuals['n'].shape)
+            d_residuals['pi'] = x_pi.reshape(d_residuals['pi'].shape)
+            d_residuals['n_moles'] = x_nm
 
 
 class SetTotalTP(om.Group): 
@@ -330,6 +784,10 @@ class SetTotalTP(om.Group):
 
         self.options.declare('spec', recordable=False)
         self.options.declare('composition')
+        self.options.declare('eq_solver', default='newton', values=('newton', 'reduced'),
+                              desc='Method used to converge the chemical equilibrium. See `ChemEq`')
+        self.options.declare('vec_size', default=1, types=int,
+                              desc='number of independent T, P points to solve at once')
 
 
     def setup(self):
@@ -344,9 +802,13 @@ class SetTotalTP(om.Group):
         # these have to be part of the API for the unit_comps to use
         self.composition = self.thermo.b0
         
-        self.add_subsystem('chem_eq', ChemEq(thermo=self.thermo), promotes=['*'])
+        vec_size = self.options['vec_size']
+
+        self.add_subsystem('chem_eq', ChemEq(thermo=self.thermo, eq_solver=self.options['eq_solver'], 
+                                             vec_size=vec_size), 
+                           promotes=['*'])
 
-        self.add_subsystem('props', ThermoCalcs(thermo=self.thermo), promotes=['*'])
+        self.add_subsystem('props', ThermoCalcs(thermo=self.thermo, vec_size=vec_size), promotes=['*'])
 
 
 
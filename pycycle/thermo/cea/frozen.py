@@ -0,0 +1,199 @@
+import warnings
+
+import numpy as np
+from scipy.linalg import lu_factor, lu_solve
+from scipy.optimize import linprog
+
+import openmdao.api as om
+
+from pycycle.constants import P_REF, R_UNIVERSAL_ENG, R_UNIVERSAL_SI, MIN_VALID_CONCENTRATION, CEA_AIR_COMPOSITION
+from pycycle.thermo.cea import species_data
+
+
+def frozen_basis(thermo, b0, T_ref=298.15):
+    """
+    Pick the num_element species that hold the frozen composition.
+
+    The frozen composition is the low temperature limit of the equilibrium, where the mixing
+    entropy no longer matters and the Gibbs minimization turns into a linear program
+    (min sum(n*g0) s.t. aij.n = b0, n >= 0). The optimal basis of that program only depends on
+    b0 through feasibility, so it can be reused for any composition that keeps all its
+    species non-negative.
+    """
+    num_element = thermo.num_element
+    aij = thermo.aij
+
+    H0_T, S0_T = thermo.eval_all(np.array([T_ref]))[:2]
+    g0 = H0_T - S0_T
+
+    res = linprog(g0, A_eq=aij, b_eq=b0, bounds=(0, None), method='highs')
+    if res.status != 0:
+        raise ValueError(f'Could not find a frozen composition for elements {thermo.elements}: {res.message}')
+
+    # any species with no reduced cost is part of an optimal basis. Prefer the ones
+    # that are actually present, then fill in whatever is needed to span the elements
+    reduced_cost = g0 - aij.T.dot(res.eqlin.marginals)
+    candidates = np.where(np.abs(reduced_cost) <= 1e-8*np.max(np.abs(g0)))[0]
+    candidates = sorted(candidates, key=lambda j: -res.x[j])
+
+    basis = []
+    for j in candidates:
+        if np.linalg.matrix_rank(aij[:, basis + [j]]) == len(basis) + 1:
+            basis.append(j)
+        if len(basis) == num_element:
+            break
+
+    if len(basis) < num_element:
+        raise ValueError(f'Could not find a frozen composition for elements {thermo.elements}')
+
+    return np.array(sorted(basis))
+
+
+class FrozenProps(om.ExplicitComponent):
+    """
+    Ideal gas mixture properties for a fixed (frozen) set of species moles implied by the composition.
+    There is no equilibrium solve, so this is only valid where dissociation is negligible.
+    """
+
+    def initialize(self):
+        self.options.declare('thermo', desc='thermodynamic data object', recordable=False)
+        self.options.declare('T_ref', default=298.15,
+                             desc='temperature used to pick the frozen species')
+        self.options.declare('T_max', default=None, allow_none=True,
+                             desc='warn if the temperature goes above this value, '
+                                  'since the frozen composition is no longer a good approximation')
+
+    def setup(self):
+
+        thermo = self.options['thermo']
+        num_element = thermo.num_element
+
+        self.add_input('composition', val=thermo.b0, desc='moles of atoms present in mixture')
+        self.add_input('T', val=284., units="degK", desc="Temperature")
+        self.add_input('P', val=1., units='bar', desc="Pressure")
+
+        self.add_output('h', val=1., units="cal/g", desc="enthalpy")
+        self.add_output('S', val=1., units="cal/(g*degK)", desc="entropy")
+        self.add_output('gamma', val=1.4, lower=1.0, upper=2.0, desc="ratio of specific heats")
+        self.add_output('Cp', val=1., units="cal/(g*degK)", desc="Specific heat at constant pressure")
+        self.add_output('Cv', val=1., units="cal/(g*degK)", desc="Specific heat at constant volume")
+        self.add_output('rho', val=0.0004, units="g/cm**3", desc="density")
+        self.add_output('R', val=1., units='(N*m)/(kg*degK)', desc='Specific gas constant')
+
+        self._set_basis(thermo.b0)
+        self._warned = False
+
+        self.declare_partials(['h', 'S', 'gamma', 'Cp', 'Cv'], ['T', 'composition'])
+        self.declare_partials(['rho'], ['T', 'P', 'composition'])
+        self.declare_partials('S', 'P')
+        self.declare_partials('R', 'composition')
+
+    def _set_basis(self, b0):
+        thermo = self.options['thermo']
+        self.basis = frozen_basis(thermo, b0, self.options['T_ref'])
+        self.lu = lu_factor(thermo.aij[:, self.basis])
+
+    def _species(self, b0):
+        # moles of the frozen species
+        n = lu_solve(self.lu, b0)
+        if np.any(n.real < -1e-12*np.max(np.abs(b0))):
+            # composition moved far enough to make the basis infeasible (e.g. lean to rich)
+            self._set_basis(b0.real)
+            n = lu_solve(self.lu, b0)
+        return n
+
+    def compute(self, inputs, outputs):
+        thermo = self.options['thermo']
+        T_max = self.options['T_max']
+
+        T = inputs['T']
+        P = inputs['P']
+
+        if T_max is not None and T.real[0] > T_max and not self._warned:
+            warnings.warn(f'{self.pathname}: frozen composition thermo used at T={T.real[0]:.1f} degK, '
+                          f'which is above the limit of {T_max} degK')
+            self._warned = True
+
+        nj = self._species(inputs['composition'])
+        n_moles = np.sum(nj)
+        H0_T, S0_T, Cp0_T = (arr[self.basis] for arr in thermo.eval_all(T)[:3])
+
+        # species that aren't present contribute nothing, this just keeps the log finite
+        nj_log = np.where(nj.real > MIN_VALID_CONCENTRATION, nj, MIN_VALID_CONCENTRATION)
+
+        outputs['h'] = R_UNIVERSAL_ENG*T*np.sum(nj*H0_T)
+        outputs['S'] = R_UNIVERSAL_ENG*np.sum(nj*(S0_T + np.log(n_moles/nj_log/(P/P_REF))))
+        outputs['Cp'] = Cp = R_UNIVERSAL_ENG*np.sum(nj*Cp0_T)
+        outputs['Cv'] = Cv = Cp - R_UNIVERSAL_ENG*n_moles
+        outputs['gamma'] = Cp/Cv
+        outputs['rho'] = P/(n_moles*R_UNIVERSAL_SI*T)*100  # 1 Bar is 100 Kpa
+        outputs['R'] = R_UNIVERSAL_SI*n_moles
+
+    def compute_partials(self, inputs, J):
+        thermo = self.options['thermo']
+
+        T = inputs['T']
+        P = inputs['P']
+
+        nj = self._species(inputs['composition'])
+        n_moles = np.sum(nj)
+        H0_T, S0_T, Cp0_T, dH0_dT, dS0_dT, dCp0_dT = (arr[self.basis] for arr in thermo.eval_all(T))
+        nj_log = np.where(nj.real > MIN_VALID_CONCENTRATION, nj, MIN_VALID_CONCENTRATION)
+
+        # dn/db0 is the inverse of the basis element matrix, so push the species derivatives through it
+        def d_db0(dy_dn):
+            return lu_solve(self.lu, dy_dn, trans=1)
+
+        dnmoles_db0 = d_db0(np.ones(len(nj)))
+
+        Cp = R_UNIVERSAL_ENG*np.sum(nj*Cp0_T)
+        Cv = Cp - R_UNIVERSAL_ENG*n_moles
+        dCp_dT = R_UNIVERSAL_ENG*np.sum(nj*dCp0_dT)
+        dCp_db0 = R_UNIVERSAL_ENG*d_db0(Cp0_T)
+        dCv_db0 = dCp_db0 - R_UNIVERSAL_ENG*dnmoles_db0
+
+        J['h', 'T'] = R_UNIVERSAL_ENG*(np.sum(nj*H0_T) + T*np.sum(nj*dH0_dT))
+        J['h', 'composition'] = R_UNIVERSAL_ENG*T*d_db0(H0_T)
+
+        J['S', 'T'] = R_UNIVERSAL_ENG*np.sum(nj*dS0_dT)
+        J['S', 'P'] = -R_UNIVERSAL_ENG*n_moles/P
+        J['S', 'composition'] = R_UNIVERSAL_ENG*d_db0(S0_T + np.log(n_moles/nj_log/(P/P_REF)))
+
+        J['Cp', 'T'] = dCp_dT
+        J['Cp', 'composition'] = dCp_db0
+        J['Cv', 'T'] = dCp_dT
+        J['Cv', 'composition'] = dCv_db0
+
+        J['gamma', 'T'] = dCp_dT/Cv - Cp*dCp_dT/Cv**2
+        J['gamma', 'composition'] = dCp_db0/Cv - Cp*dCv_db0/Cv**2
+
+        J['rho', 'T'] = -P/(n_moles*R_UNIVERSAL_SI*T**2)*100
+        J['rho', 'P'] = 1/(n_moles*R_UNIVERSAL_SI*T)*100
+        J['rho', 'composition'] = -P/(n_moles**2*R_UNIVERSAL_SI*T)*100*dnmoles_db0
+
+        J['R', 'composition'] = R_UNIVERSAL_SI*dnmoles_db0
+
+
+class SetTotalTP(om.Group):
+
+    def initialize(self):
+
+        self.options.declare('spec', recordable=False)
+        self.options.declare('composition')
+        self.options.declare('T_max', default=None, allow_none=True,
+                             desc='warn if the temperature goes above this value. See `FrozenProps`')
+
+    def setup(self):
+
+        init_elements = self.options['composition']
+        if init_elements is None:
+            init_elements = CEA_AIR_COMPOSITION
+
+        self.thermo = species_data.Properties(self.options['spec'],
+                                              init_elements=init_elements)
+
+        # these have to be part of the API for the unit_comps to use
+        self.composition = self.thermo.b0
+
+        self.add_subsystem('props', FrozenProps(thermo=self.thermo, T_max=self.options['T_max']),
+                           promotes=['*'])
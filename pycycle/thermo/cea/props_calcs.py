@@ -3,6 +3,7 @@ import numpy as np
 from openmdao.api import ExplicitComponent
 
 from pycycle.constants import P_REF, R_UNIVERSAL_ENG, R_UNIVERSAL_SI, MIN_VALID_CONCENTRATION
+from pycycle.thermo.cea.species_data import block_diag_pattern
 
 
 class PropsCalcs(ExplicitComponent):
@@ -10,66 +11,88 @@ class PropsCalcs(ExplicitComponent):
 
     def initialize(self):
         self.options.declare('thermo', desc='thermodynamic data object', recordable=False)
+        self.options.declare('vec_size', default=1, types=int,
+                             desc='number of independent points to compute at once')
 
     def setup(self):
 
         thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        ne1 = thermo.num_element + 1
 
-        self.add_input('T', val=284., units="degK", desc="Temperature")
-        self.add_input('P', val=1., units='bar', desc="Pressure")
-        self.add_input('n', val=np.ones(thermo.num_prod),
+        if vec_size > 1:
+            self._eval_all = thermo.eval_all_vec
+            shape = vec_size
+            n_shape = (vec_size, num_prod)
+            r_shape = (vec_size, ne1)
+        else:
+            self._eval_all = thermo.eval_all
+            shape = 1
+            n_shape = num_prod
+            r_shape = ne1
+
+        self.add_input('T', val=284., shape=shape, units="degK", desc="Temperature")
+        self.add_input('P', val=1., shape=shape, units='bar', desc="Pressure")
+        self.add_input('n', val=np.ones(n_shape),
                        desc="molar concentration of the mixtures, last element is the total molar concentration")
-        self.add_input('n_moles', val=1., desc="1/molar_mass for gaseous mixture")
+        self.add_input('n_moles', val=1., shape=shape, desc="1/molar_mass for gaseous mixture")
 
-        ne1 = thermo.num_element + 1
-        self.add_input('result_T', val=np.ones(ne1),
-                       desc="result of the linear solve for T", shape=ne1)
-        self.add_input('result_P', val=np.ones(ne1),
-                       desc="result of the linear solve for T", shape=ne1)
-
-        self.add_output('h', val=1., units="cal/g", desc="enthalpy")
-        self.add_output('S', val=1., units="cal/(g*degK)", desc="entropy")
-        self.add_output('gamma', val=1.4, lower=1.0, upper=2.0, desc="ratio of specific heats")
-        self.add_output('Cp', val=1., units="cal/(g*degK)", desc="Specific heat at constant pressure")
-        self.add_output('Cv', val=1., units="cal/(g*degK)", desc="Specific heat at constant volume")
-        self.add_output('rho', val=0.0004, units="g/cm**3", desc="density")
-
-        self.add_output('R', val=1., units='(N*m)/(kg*degK)', desc='Specific gas constant')
+        self.add_input('result_T', val=np.ones(r_shape),
+                       desc="result of the linear solve for T", shape=r_shape)
+        self.add_input('result_P', val=np.ones(r_shape),
+                       desc="result of the linear solve for T", shape=r_shape)
+
+        self.add_output('h', val=1., shape=shape, units="cal/g", desc="enthalpy")
+        self.add_output('S', val=1., shape=shape, units="cal/(g*degK)", desc="entropy")
+        self.add_output('gamma', val=1.4, shape=shape, lower=1.0, upper=2.0, desc="ratio of specific heats")
+        self.add_output('Cp', val=1., shape=shape, units="cal/(g*degK)", desc="Specific heat at constant pressure")
+        self.add_output('Cv', val=1., shape=shape, units="cal/(g*degK)", desc="Specific heat at constant volume")
+        self.add_output('rho', val=0.0004, shape=shape, units="g/cm**3", desc="density")
+
+        self.add_output('R', val=1., shape=shape, units='(N*m)/(kg*degK)', desc='Specific gas constant')
         # self.deriv_options['check_type'] = "cs"
 
         # partial derivs setup
-        self.declare_partials('h', ['n', 'T'])
-        self.declare_partials('S', ['n', 'T', 'P'])
-        self.declare_partials('S', 'n_moles')
-        self.declare_partials('Cp', ['n', 'T', 'result_T'])
-        self.declare_partials('rho', ['T', 'P', 'n_moles'])
-        self.declare_partials('gamma', ['n', 'n_moles', 'T', 'result_T', 'result_P'])
-        self.declare_partials('Cv', ['n', 'n_moles', 'T', 'result_T', 'result_P'])
+        # every point is independent, so all the partials are block diagonal
+        ar = np.arange(vec_size)
+        n_rows, n_cols = block_diag_pattern(vec_size, 1, num_prod)
+        r_rows, r_cols = block_diag_pattern(vec_size, 1, ne1)
 
-        self.declare_partials('R', 'n_moles', val=R_UNIVERSAL_SI)
+        self.declare_partials(['h', 'S', 'Cp', 'gamma', 'Cv'], 'n', rows=n_rows, cols=n_cols)
+        self.declare_partials(['h', 'S', 'Cp', 'rho', 'gamma', 'Cv'], 'T', rows=ar, cols=ar)
+        self.declare_partials(['S', 'rho'], 'P', rows=ar, cols=ar)
+        self.declare_partials(['S', 'rho', 'gamma', 'Cv'], 'n_moles', rows=ar, cols=ar)
+        self.declare_partials(['Cp', 'gamma', 'Cv'], 'result_T', rows=r_rows, cols=r_cols)
+        self.declare_partials(['gamma', 'Cv'], 'result_P', rows=r_rows, cols=r_cols)
+
+        self.declare_partials('R', 'n_moles', rows=ar, cols=ar, val=R_UNIVERSAL_SI)
 
 
     def compute(self, inputs, outputs):
         thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
         num_prod = thermo.num_prod
         num_element = thermo.num_element
 
         T = inputs['T']
         P = inputs['P']
-        result_T = inputs['result_T']
+        result_T = inputs['result_T'].reshape((vec_size, num_element+1))
 
-        nj = inputs['n'][:num_prod]
+        nj = inputs['n'].reshape((vec_size, num_prod))
         # nj[nj<0] = 1e-10 # ensure all concentrations stay non-zero
         n_moles = inputs['n_moles']
 
-        self.dlnVqdlnP = dlnVqdlnP = -1 + inputs['result_P'][num_element]
-        self.dlnVqdlnT = dlnVqdlnT = 1 - result_T[num_element]
+        self.dlnVqdlnP = dlnVqdlnP = -1 + inputs['result_P'].reshape((vec_size, num_element+1))[:, num_element]
+        self.dlnVqdlnT = dlnVqdlnT = 1 - result_T[:, num_element]
+
+        H0_T, S0_T, Cp0_T = (arr.reshape((vec_size, num_prod)) for arr in self._eval_all(T)[:3])
+        self.H0_T = H0_T
+        self.S0_T = S0_T
+        self.Cp0_T = Cp0_T
 
-        self.Cp0_T = Cp0_T = thermo.Cp0(T)
-        Cpf = np.sum(nj*Cp0_T)
+        Cpf = np.sum(nj*Cp0_T, axis=1)
 
-        self.H0_T = H0_T = thermo.H0(T)
-        self.S0_T = S0_T = thermo.S0(T)
         self.nj_H0 = nj_H0 = nj*H0_T
 
         # Cpe = 0
@@ -77,20 +100,20 @@ class PropsCalcs(ExplicitComponent):
         #     for j in range(0, num_prod):
         #         Cpe -= thermo.aij[i][j]*nj[j]*H0_T[j]*self.result_T[i]
         # vectorization of this for loop for speed
-        Cpe = -np.sum(np.sum(thermo.aij*nj_H0, axis=1)*result_T[:num_element])
-        Cpe += np.sum(nj_H0*H0_T)  # nj*H0_T**2
-        Cpe -= np.sum(nj_H0)*result_T[num_element]
+        Cpe = -np.sum(nj_H0.dot(thermo.aij.T)*result_T[:, :num_element], axis=1)
+        Cpe += np.sum(nj_H0*H0_T, axis=1)  # nj*H0_T**2
+        Cpe -= np.sum(nj_H0, axis=1)*result_T[:, num_element]
 
-        outputs['h'] = np.sum(nj_H0)*R_UNIVERSAL_ENG*T
+        outputs['h'] = np.sum(nj_H0, axis=1)*R_UNIVERSAL_ENG*T
 
         try:
-            val = (S0_T+np.log(n_moles/nj/(P/P_REF)))
+            val = (S0_T+np.log(n_moles[:, np.newaxis]/nj/(P[:, np.newaxis]/P_REF)))
         except FloatingPointError:
-            P = 1e-5
-            val = (S0_T+np.log(n_moles/nj/(P/P_REF)))
+            P = 1e-5*np.ones(vec_size)
+            val = (S0_T+np.log(n_moles[:, np.newaxis]/nj/(P[:, np.newaxis]/P_REF)))
 
 
-        outputs['S'] = R_UNIVERSAL_ENG * np.sum(nj*val)
+        outputs['S'] = R_UNIVERSAL_ENG * np.sum(nj*val, axis=1)
         outputs['Cp'] = Cp = (Cpe+Cpf)*R_UNIVERSAL_ENG
         outputs['Cv'] = Cv = Cp + n_moles*R_UNIVERSAL_ENG*dlnVqdlnT**2/dlnVqdlnP
 
@@ -103,25 +126,26 @@ class PropsCalcs(ExplicitComponent):
     def compute_partials(self, inputs, J):
 
         thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
         num_prod = thermo.num_prod
         num_element = thermo.num_element
+        aij = thermo.aij
 
         T = inputs['T']
         P = inputs['P']
-        nj = inputs['n']
+        nj = inputs['n'].reshape((vec_size, num_prod))
         n_moles = inputs['n_moles']
-        result_T = inputs['result_T']
-        result_T_last = result_T[num_element]
-        result_T_rest = result_T[:num_element]
+        result_T = inputs['result_T'].reshape((vec_size, num_element+1))
+        result_T_last = result_T[:, num_element]
+        result_T_rest = result_T[:, :num_element]
 
-        dlnVqdlnP = -1 + inputs['result_P'][num_element]
+        dlnVqdlnP = -1 + inputs['result_P'].reshape((vec_size, num_element+1))[:, num_element]
         dlnVqdlnT = 1 - result_T_last
 
-        Cp0_T = thermo.Cp0(T)
-        Cpf = np.sum(nj * Cp0_T)
+        H0_T, S0_T, Cp0_T, dH0_dT, dS0_dT, dCp0_dT = (arr.reshape((vec_size, num_prod)) for arr in self._eval_all(T))
+
+        Cpf = np.sum(nj * Cp0_T, axis=1)
 
-        H0_T = thermo.H0(T)
-        S0_T = thermo.S0(T)
         nj_H0 = nj * H0_T
 
         # Cpe = 0
@@ -129,89 +153,84 @@ class PropsCalcs(ExplicitComponent):
         #     for j in range(0, num_prod):
         #         Cpe -= thermo.aij[i][j]*nj[j]*H0_T[j]*self.result_T[i]
         # vectorization of this for loop for speed
-        Cpe = -np.sum(np.sum(thermo.aij * nj_H0, axis=1) * result_T_rest)
-        Cpe += np.sum(nj_H0 * H0_T)  # nj*H0_T**2
-        Cpe -= np.sum(nj_H0) * result_T_last
+        Cpe = -np.sum(nj_H0.dot(aij.T) * result_T_rest, axis=1)
+        Cpe += np.sum(nj_H0 * H0_T, axis=1)  # nj*H0_T**2
+        Cpe -= np.sum(nj_H0, axis=1) * result_T_last
 
         Cp = (Cpe + Cpf) * R_UNIVERSAL_ENG
         Cv = Cp + n_moles * R_UNIVERSAL_ENG * dlnVqdlnT ** 2 / dlnVqdlnP
 
-        dH0_dT = thermo.H0_applyJ(T, 1.)
-        dS0_dT = thermo.S0_applyJ(T, 1.)
-        dCp0_dT = thermo.Cp0_applyJ(T, 1.)
         sum_nj_R = n_moles*R_UNIVERSAL_SI
 
-        drho_dT = P/(sum_nj_R*T**2)*100
-        drho_dnmoles = -P/(n_moles**2*R_UNIVERSAL_SI*T)*100
-
-        dCpe_dT = 2*np.sum(nj*H0_T*dH0_dT)
+        dCpe_dT = 2*np.sum(nj*H0_T*dH0_dT, axis=1)
         # for i in range(num_element):
         #     self.dCpe_dT -= np.sum(aij[i]*nj*self.dH0_dT)*self.result_T[i]
-        dCpe_dT -= np.sum(np.sum(thermo.aij*nj*dH0_dT, axis=1)*result_T_rest)
-        dCpe_dT -= np.sum(nj*dH0_dT)*result_T_last
+        dCpe_dT -= np.sum((nj*dH0_dT).dot(aij.T)*result_T_rest, axis=1)
+        dCpe_dT -= np.sum(nj*dH0_dT, axis=1)*result_T_last
 
-        dCpf_dT = np.sum(nj*dCp0_dT)
+        dCpf_dT = np.sum(nj*dCp0_dT, axis=1)
 
-        J['h', 'T'] = R_UNIVERSAL_ENG*(np.sum(nj*dH0_dT)*T + np.sum(nj*H0_T))
-        J['h', 'n'] = R_UNIVERSAL_ENG*T*H0_T
+        J['h', 'T'] = R_UNIVERSAL_ENG*(np.sum(nj*dH0_dT, axis=1)*T + np.sum(nj*H0_T, axis=1))
+        J['h', 'n'] = (R_UNIVERSAL_ENG*T[:, np.newaxis]*H0_T).ravel()
 
-        J['S', 'n'] = R_UNIVERSAL_ENG*(S0_T + np.log(n_moles) - np.log(P/P_REF) - np.log(nj) - 1)
+        dS_dn = R_UNIVERSAL_ENG*(S0_T + np.log(n_moles/(P/P_REF))[:, np.newaxis] - np.log(nj) - 1)
         # zero out any derivs w.r.t trace species
-        _trace = np.where(nj <= MIN_VALID_CONCENTRATION+1e-20)
-        J['S', 'n'][0, _trace] = 0
-        J['S', 'T'] = R_UNIVERSAL_ENG*np.sum(nj*dS0_dT)
-        J['S', 'P'] = -R_UNIVERSAL_ENG*np.sum(nj/P)
-        J['S', 'n_moles'] = R_UNIVERSAL_ENG*np.sum(nj)/n_moles
+        dS_dn[nj <= MIN_VALID_CONCENTRATION+1e-20] = 0
+        J['S', 'n'] = dS_dn.ravel()
+        J['S', 'T'] = R_UNIVERSAL_ENG*np.sum(nj*dS0_dT, axis=1)
+        J['S', 'P'] = -R_UNIVERSAL_ENG*np.sum(nj, axis=1)/P
+        J['S', 'n_moles'] = R_UNIVERSAL_ENG*np.sum(nj, axis=1)/n_moles
         J['rho', 'T'] = -P/(sum_nj_R*T**2)*100
         J['rho', 'n_moles'] = -P/(n_moles**2*R_UNIVERSAL_SI*T)*100
         J['rho', 'P'] = 1/(sum_nj_R*T)*100
 
+        # for j in range(num_prod):
+        #     for i in range(num_element):
+        #         dCp_dnj[j] -= R_UNIVERSAL_ENG*thermo.aij[i][j]*H0_T[j]*result_T[i]
         dCp_dnj = R_UNIVERSAL_ENG*(Cp0_T + H0_T**2)
-        for j in range(num_prod):
-            for i in range(num_element):
-                dCp_dnj[j] -= R_UNIVERSAL_ENG*thermo.aij[i][j]*H0_T[j]*result_T[i]
-        dCp_dnj -= R_UNIVERSAL_ENG * H0_T * result_T_last
-        J['Cp', 'n'] = dCp_dnj
-
+        dCp_dnj -= R_UNIVERSAL_ENG*H0_T*result_T_rest.dot(aij)
+        dCp_dnj -= R_UNIVERSAL_ENG * H0_T * result_T_last[:, np.newaxis]
+        J['Cp', 'n'] = dCp_dnj.ravel()
 
-        dCp_dresultT = np.zeros(num_element+1)
+        dCp_dresultT = np.zeros((vec_size, num_element+1), dtype=Cp.dtype)
         # for i in range(num_element):
         #     self.dCp_dresultT[i] = -R_UNIVERSAL_ENG*np.sum(aij[i]*nj_H0)
-        dCp_dresultT[:num_element] = -R_UNIVERSAL_ENG*np.sum(thermo.aij*nj_H0, axis=1)
-        dCp_dresultT[num_element] = - R_UNIVERSAL_ENG*np.sum(nj_H0)
-        J['Cp', 'result_T'] = dCp_dresultT
+        dCp_dresultT[:, :num_element] = -R_UNIVERSAL_ENG*nj_H0.dot(aij.T)
+        dCp_dresultT[:, num_element] = - R_UNIVERSAL_ENG*np.sum(nj_H0, axis=1)
+        J['Cp', 'result_T'] = dCp_dresultT.ravel()
 
         dCp_dT = (dCpe_dT + dCpf_dT)*R_UNIVERSAL_ENG
         J['Cp', 'T'] = dCp_dT
 
-        J['Cv', 'n'] = dCp_dnj
+        J['Cv', 'n'] = dCp_dnj.ravel()
 
         dCv_dnmoles = R_UNIVERSAL_ENG*dlnVqdlnT**2/dlnVqdlnP
         J['Cv', 'n_moles'] = dCv_dnmoles
         J['Cv', 'T'] = dCp_dT
 
 
-        dCv_dresultP = np.zeros((1, num_element+1))
-        dCv_dresultP[0, -1] = -R_UNIVERSAL_ENG*n_moles*(dlnVqdlnT/dlnVqdlnP)**2
-        J['Cv', 'result_P'] = dCv_dresultP
+        dCv_dresultP = np.zeros((vec_size, num_element+1), dtype=Cp.dtype)
+        dCv_dresultP[:, -1] = -R_UNIVERSAL_ENG*n_moles*(dlnVqdlnT/dlnVqdlnP)**2
+        J['Cv', 'result_P'] = dCv_dresultP.ravel()
 
-        J['Cv', 'result_T'] = dCp_dresultT
-        J['Cv', 'result_T'][0, -1] -= n_moles*R_UNIVERSAL_ENG/dlnVqdlnP*(2*dlnVqdlnT)
-        dCv_dresultT_last = J['Cv', 'result_T'][0, -1]
+        dCv_dresultT = dCp_dresultT.copy()
+        dCv_dresultT[:, -1] -= n_moles*R_UNIVERSAL_ENG/dlnVqdlnP*(2*dlnVqdlnT)
+        J['Cv', 'result_T'] = dCv_dresultT.ravel()
+        dCv_dresultT_last = dCv_dresultT[:, -1]
 
-        J['gamma', 'n'] = dCp_dnj*(Cp/Cv-1)/(dlnVqdlnP*Cv)
+        J['gamma', 'n'] = (dCp_dnj*((Cp/Cv-1)/(dlnVqdlnP*Cv))[:, np.newaxis]).ravel()
         J['gamma', 'n_moles'] = Cp/dlnVqdlnP/Cv**2*dCv_dnmoles
         J['gamma', 'T'] = dCp_dT/dlnVqdlnP/Cv*(Cp/Cv-1)
 
 
-        dgamma_dresultT = np.zeros((1, num_element+1))
-        dgamma_dresultT[0, :num_element] = 1/Cv/dlnVqdlnP*dCp_dresultT[:num_element]*(Cp/Cv-1)
-        dgamma_dresultT[0, -1] = (-dCp_dresultT[-1]/Cv+Cp/Cv**2*dCv_dresultT_last)/dlnVqdlnP
-        J['gamma', 'result_T'] = dgamma_dresultT
+        dgamma_dresultT = np.zeros((vec_size, num_element+1), dtype=Cp.dtype)
+        dgamma_dresultT[:, :num_element] = (1/Cv/dlnVqdlnP*(Cp/Cv-1))[:, np.newaxis]*dCp_dresultT[:, :num_element]
+        dgamma_dresultT[:, -1] = (-dCp_dresultT[:, -1]/Cv+Cp/Cv**2*dCv_dresultT_last)/dlnVqdlnP
+        J['gamma', 'result_T'] = dgamma_dresultT.ravel()
 
-        gamma_dresultP = np.zeros((1, num_element+1))
-        gamma_dresultP[0, num_element] = Cp/Cv/dlnVqdlnP*(dCv_dresultP[0, -1]/Cv + 1/dlnVqdlnP)
-        J['gamma', 'result_P'] = gamma_dresultP
+        gamma_dresultP = np.zeros((vec_size, num_element+1), dtype=Cp.dtype)
+        gamma_dresultP[:, num_element] = Cp/Cv/dlnVqdlnP*(dCv_dresultP[:, -1]/Cv + 1/dlnVqdlnP)
+        J['gamma', 'result_P'] = gamma_dresultP.ravel()
 
 
 if __name__ == "__main__":
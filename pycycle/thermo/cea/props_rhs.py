@@ -1,9 +1,11 @@
 import numpy as np
+from scipy.linalg import lu_factor, lu_solve
 
 from openmdao.api import ExplicitComponent
 
 from pycycle.constants import R_UNIVERSAL_ENG, R_UNIVERSAL_SI, MIN_VALID_CONCENTRATION
 from pycycle.thermo.cea import species_data
+from pycycle.thermo.cea.species_data import block_diag_pattern
 
 
 class PropsRHS(ExplicitComponent):
@@ -99,7 +101,7 @@ class PropsRHS(ExplicitComponent):
         outputs['rhs_P'][num_element] = inputs['n_moles']
 
         # rhs for T
-        self.H0_T = H0_T = thermo.H0(T)
+        self.H0_T = H0_T = thermo.eval_all(T)[0]
         n_H0 = n*H0_T
         outputs['rhs_T'][:num_element] = np.sum(thermo.aij*n_H0, axis=1)
         outputs['rhs_T'][num_element] = np.sum(n_H0)
@@ -121,7 +123,7 @@ class PropsRHS(ExplicitComponent):
         nj = inputs['n']
 
         H0_T = self.H0_T
-        nj_dH0dT = thermo.H0_applyJ(T, nj)
+        nj_dH0dT = nj*thermo.eval_all(T)[3]
 
         self.drhsT_dT[:num_element] = np.sum(aij*nj_dH0dT, axis=1)
         self.drhsT_dT[num_element] = np.sum(nj_dH0dT)
@@ -137,6 +139,172 @@ class PropsRHS(ExplicitComponent):
         # derivs of lhs_TP are constants, specified in setup
 
 
+class PropsRHSSolve(ExplicitComponent):
+    """
+    Builds the T and P derivative linear systems (same as PropsRHS) and solves both
+    of them with a single LU factorization of the shared lhs matrix.
+
+    Drop in replacement for PropsRHS feeding two LinearSystemComps.
+    """
+
+    def initialize(self):
+        self.options.declare('thermo', desc='thermodynamic data object', recordable=False)
+        self.options.declare('vec_size', default=1, types=int,
+                             desc='number of independent points to compute at once')
+
+    def setup(self):
+
+        thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        num_element = thermo.num_element
+        ne1 = num_element + 1
+
+        if vec_size > 1:
+            self._eval_all = thermo.eval_all_vec
+            shape = vec_size
+            n_shape = (vec_size, num_prod)
+            b_shape = (vec_size, num_element)
+            r_shape = (vec_size, ne1)
+        else:
+            self._eval_all = thermo.eval_all
+            shape = 1
+            n_shape = num_prod
+            b_shape = num_element
+            r_shape = ne1
+
+        self.add_input('T', val=284., shape=shape, units="degK", desc="Total Temperature")
+        self.add_input('n', val=np.zeros(n_shape),
+                       desc="molar concentration of the mixtures, last element is "
+                       "the total molar concentration")  # kg-mol/kg
+        self.add_input('n_moles', val=1., shape=shape, desc="1/molar_mass for gaseous mixture")
+        self.add_input('composition', val=np.ones(b_shape)*thermo.b0,
+                       desc="assigned kg-atoms of element i per total kg of reactant")  # kg-atom/kg
+
+        self.add_output('result_T', val=np.ones(r_shape), desc="result of the linear solve for T")
+        self.add_output('result_P', val=np.ones(r_shape), desc="result of the linear solve for P")
+
+        self.lhs = np.zeros((vec_size, ne1, ne1))
+        self.rhs = np.zeros((vec_size, ne1, 2))
+
+        rows, cols = block_diag_pattern(vec_size, ne1, 1)
+        self.declare_partials('result_T', 'T', rows=rows, cols=cols)
+        self.declare_partials('result_P', 'n_moles', rows=rows, cols=cols)
+        rows, cols = block_diag_pattern(vec_size, ne1, num_prod)
+        self.declare_partials(['result_T', 'result_P'], 'n', rows=rows, cols=cols)
+        rows, cols = block_diag_pattern(vec_size, ne1, num_element)
+        self.declare_partials(['result_T', 'result_P'], 'composition', rows=rows, cols=cols)
+
+    def _factor(self, lhs):
+        # a single point uses the LAPACK LU directly, stacks of points get a batched inverse
+        if self.options['vec_size'] > 1:
+            self.lhs_inv = np.linalg.inv(lhs)
+        else:
+            self.lu = lu_factor(lhs[0])
+
+    def _solve(self, rhs):
+        if self.options['vec_size'] > 1:
+            return np.matmul(self.lhs_inv, rhs)
+        return lu_solve(self.lu, rhs[0])[np.newaxis]
+
+    def compute(self, inputs, outputs):
+
+        thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        num_element = thermo.num_element
+        aij = thermo.aij
+
+        T = inputs['T']
+        n = inputs['n'].reshape((vec_size, num_prod))
+        b0 = inputs['composition'].reshape((vec_size, num_element))
+
+        if inputs._under_complex_step:
+            lhs = self.lhs = self.lhs.astype(complex)
+            rhs = self.rhs = self.rhs.astype(complex)
+        else:
+            lhs = self.lhs = self.lhs.real
+            rhs = self.rhs = self.rhs.real
+
+        lhs[:, :num_element, :num_element] = np.matmul(aij*n[:, np.newaxis, :], aij.T)
+        lhs[:, num_element, :num_element] = b0
+        lhs[:, :num_element, num_element] = b0
+        lhs[:, num_element, num_element] = 0.
+
+        # rhs for T
+        self.H0_T = H0_T = self._eval_all(T)[0].reshape((vec_size, num_prod))
+        n_H0 = n*H0_T
+        rhs[:, :num_element, 0] = n_H0.dot(aij.T)
+        rhs[:, num_element, 0] = np.sum(n_H0, axis=1)
+
+        # rhs for P
+        rhs[:, :num_element, 1] = b0
+        rhs[:, num_element, 1] = inputs['n_moles']
+
+        self._factor(lhs)
+        self.x = x = self._solve(rhs)
+
+        outputs['result_T'] = x[:, :, 0].reshape(outputs['result_T'].shape)
+        outputs['result_P'] = x[:, :, 1].reshape(outputs['result_P'].shape)
+
+    def compute_partials(self, inputs, J):
+        # x = A^-1 b, so dx/dy = A^-1 (db/dy - dA/dy x)
+        # all the columns get solved together, reusing the factorization from compute
+
+        thermo = self.options['thermo']
+        vec_size = self.options['vec_size']
+        num_prod = thermo.num_prod
+        num_element = thermo.num_element
+        ne1 = num_element + 1
+        aij = thermo.aij
+
+        T = inputs['T']
+        n = inputs['n'].reshape((vec_size, num_prod))
+
+        x_T = self.x[:, :, 0]
+        x_P = self.x[:, :, 1]
+
+        dtype = complex if inputs._under_complex_step else float
+        # columns: [T | n (result_T) | composition (result_T) | n (result_P) | n_moles | composition (result_P)]
+        ncol = 1 + 2*num_prod + 1 + 2*num_element
+        rhs = np.zeros((vec_size, ne1, ncol), dtype=dtype)
+
+        i_T = 0
+        i_nT = slice(1, 1+num_prod)
+        i_bT = slice(1+num_prod, 1+num_prod+num_element)
+        i_nP = slice(i_bT.stop, i_bT.stop+num_prod)
+        i_nm = i_nP.stop
+        i_bP = slice(i_nm+1, i_nm+1+num_element)
+
+        nj_dH0dT = n*self._eval_all(T)[3].reshape((vec_size, num_prod))
+        rhs[:, :num_element, i_T] = nj_dH0dT.dot(aij.T)
+        rhs[:, num_element, i_T] = np.sum(nj_dH0dT, axis=1)
+
+        # d(lhs)/dn_k x = a_k (a_k . x), only in the element rows
+        rhs[:, :num_element, i_nT] = aij*self.H0_T[:, np.newaxis, :] - aij*x_T[:, :num_element].dot(aij)[:, np.newaxis, :]
+        rhs[:, num_element, i_nT] = self.H0_T
+        rhs[:, :num_element, i_nP] = -aij*x_P[:, :num_element].dot(aij)[:, np.newaxis, :]
+
+        rhs[:, num_element, i_nm] = 1.
+
+        # composition shows up in the last row and column of lhs, and the top of rhs_P
+        eye = np.eye(num_element)
+        rhs[:, :num_element, i_bT] = -x_T[:, num_element, np.newaxis, np.newaxis]*eye
+        rhs[:, num_element, i_bT] = -x_T[:, :num_element]
+        rhs[:, :num_element, i_bP] = (1 - x_P[:, num_element, np.newaxis, np.newaxis])*eye
+        rhs[:, num_element, i_bP] = -x_P[:, :num_element]
+
+        dx = self._solve(rhs)
+
+        J['result_T', 'T'] = dx[:, :, i_T].ravel()
+        J['result_T', 'n'] = dx[:, :, i_nT].ravel()
+        J['result_T', 'composition'] = dx[:, :, i_bT].ravel()
+        J['result_P', 'n'] = dx[:, :, i_nP].ravel()
+        J['result_P', 'n_moles'] = dx[:, :, i_nm].ravel()
+        J['result_P', 'composition'] = dx[:, :, i_bP].ravel()
+
+
+
 if __name__ == "__main__":
 
     from openmdao.api import Problem, Group, IndepVarComp, LinearSystemComp
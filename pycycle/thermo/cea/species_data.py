@@ -1,3 +1,4 @@
+import os
 from collections import OrderedDict
 
 import numpy as np
@@ -5,182 +6,272 @@ from scipy import interpolate
 
 from pycycle import constants
 
-from pycycle.thermo.cea.thermo_data import co2_co_o2
-from pycycle.thermo.cea.thermo_data import janaf
-from pycycle.thermo.cea.thermo_data import wet_air
+from pycycle.thermo.cea.species_db import LazySpeciesDB, species_db
+
+
+# compiled from the python modules in thermo_data, see species_db
+_thermo_data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'thermo_data')
+co2_co_o2 = LazySpeciesDB(os.path.join(_thermo_data_dir, 'co2_co_o2.npz'))
+janaf = LazySpeciesDB(os.path.join(_thermo_data_dir, 'janaf.npz'))
+wet_air = LazySpeciesDB(os.path.join(_thermo_data_dir, 'wet_air.npz'))
 
 #from ad.admath import log
 from numpy import log
-class Properties(object):
-    """Compute H, S, Cp given a species and temperature"""
-    
-    def __init__(self, thermo_data_module, init_elements=None):
 
-        self.a = None
-        self.a_T = None
-        self.b0 = None
-        self.element_wt = None
-        self.aij = None
-        self.products = None
-        self.elements = None
-        self.temp_ranges = None
-        self.valid_temp_range = None
-        self.wt_mole = None # array of mole weights
+
+def _poly_basis(Tt): 
+    """
+    Multipliers on the coefficients a0-a8 for H0, S0, Cp0, dH0_dT, dS0_dT, dCp0_dT (one row each). 
+    Shape is (6, 9) for a scalar Tt, or (6, 9, len(Tt)) for an array.
+    """
+    lnT = log(Tt)
+    T2 = Tt*Tt
+    T3 = T2*Tt
+    T4 = T3*Tt
+    iT = 1./Tt
+    iT2 = iT*iT
+    iT3 = iT2*iT
+    one = np.ones_like(Tt)
+    zero = np.zeros_like(Tt)
+    return np.array([
+        [-iT2, iT*lnT, one, Tt/2., T2/3., T3/4., T4/5., iT, zero], # H0
+        [-iT2/2., -iT, lnT, Tt, T2/2., T3/3., T4/4., zero, one], # S0
+        [iT2, iT, one, Tt, T2, T3, T4, zero, zero], # Cp0
+        [2*iT3, (1-lnT)*iT2, zero, .5*one, 2*Tt/3., 3*T2/4., 4*T3/5., -iT2, zero], # dH0_dT
+        [iT3, iT2, iT, one, Tt, T2, T3, zero, zero], # dS0_dT
+        [-2*iT3, -iT2, zero, one, 2*Tt, 3*T2, 4*T3, zero, zero], # dCp0_dT
+    ])
+
+
+class SpeciesTables(object):
+    """
+    Read-only species data for one thermo data set, reduced to the products 
+    that can be made from a given set of elements. 
+
+    These are shared between all the Properties instances with the same thermo data 
+    and element set, so get them from `get_species_tables` rather than building them directly.
+    """
+
+    def __init__(self, thermo_data_module, elements):
+
         self.thermo_data_module = thermo_data_module
-        self.prod_data = self.thermo_data_module.products
-        self.init_elements = init_elements
-        self.temp_base = None # array of lowest end of lowest temperature range
+        self.db = db = species_db(thermo_data_module)
 
-        if init_elements is not None :
+        elem_set = set(elements)
+        self.elements = sorted(elem_set)
 
-            elem_set = set(init_elements.keys())
-            self.elements = sorted(elem_set)
+        for element in self.elements:
+            if element not in db.elements:
+                if element in db.products:
+                    raise ValueError(f'The provided element `{element}` is a product in your provided thermo data, but is not an element.')
+                else:
+                    raise ValueError(f'The provided element `{element}` is not used in any products in your thermo data.')
 
+        prod_idx = db.product_index(elem_set)
+        elem_idx = [db.elements.index(e) for e in self.elements]
 
-            valid_elements = set()
+        self.products = [db.products[i] for i in prod_idx]
 
-            for compound in self.prod_data.keys():
-                valid_elements.update(self.prod_data[compound]['elements'].keys())
-                
-            for element in self.elements:
-                if element not in valid_elements:
-                    if element in self.prod_data.keys():
-                        raise ValueError(f'The provided element `{element}` is a product in your provided thermo data, but is not an element.')
-                    else:
-                        raise ValueError(f'The provided element `{element}` is not used in any products in your thermo data.')
+        self.num_element = num_element = len(self.elements)
+        self.num_prod = num_prod = len(self.products)
 
-            self.products = [name for name, prod_data in self.prod_data.items()
-                         if elem_set.issuperset(prod_data['elements'])]
-        
-        else:
-                raise ValueError('You have not provided `init_elements`. In order to set thermodynamic data it must be provided.')
+        self.element_wt = db.element_wt[elem_idx]
+        self.aij = db.aij[np.ix_(elem_idx, prod_idx)]
 
-        ### setting up object attributes ###
-        element_list = sorted(self.elements)
+        self.wt_mole = db.wt[prod_idx]
 
-        self.num_element = len(element_list)
-        self.num_prod = len(self.products)
+        #### pre-computed constants used in calculations ###
+        self.aij_prod = self.aij[:, np.newaxis, :] * self.aij[np.newaxis, :, :]
+        self.aij_prod_deriv = self.aij_prod.reshape((num_element**2, num_prod))
 
-        self.a = np.zeros((self.num_prod, 10))
-        self.a_T = self.a.T
+        #### polynomial bank for all the temperature ranges, gathered from the database ###
+        num_ranges = db.num_ranges[prod_idx]
+        max_ranges = max(num_ranges)
+        self.coeff_bank = db.coeff_bank[prod_idx, :max_ranges]
+        # edges of every range for each product, padded with inf when a product has fewer ranges
+        self.range_edges = db.range_edges[prod_idx, :max_ranges+1]
+        # interior edges are all that's needed to pick a range, anything off either end uses the closest range
+        interior = np.arange(max_ranges-1) < (num_ranges-1)[:, np.newaxis]
+        self.interior_edges = np.where(interior, self.range_edges[:, 1:-1], np.inf)
+        self.prod_idx = np.arange(num_prod)
 
-        element_wt = []
-        aij = []
+        self.temp_base = self.range_edges[:, 0].copy() # array of lowest end of lowest temperature range
 
-        for e in element_list:
-            element_wt.append(self.thermo_data_module.element_wts[e])
+        for arr in (self.element_wt, self.aij, self.wt_mole, self.aij_prod, self.aij_prod_deriv, 
+                    self.coeff_bank, self.range_edges, self.interior_edges, self.prod_idx, self.temp_base): 
+            arr.flags.writeable = False
 
-            row = [self.prod_data[r]['elements'].get(e,0) for r in self.products]
-            aij.append(row)
+    @property
+    def prod_data(self):
+        return self.db.prod_data
 
-        self.element_wt = np.array(element_wt)
-        self.aij = np.array(aij)
 
-        self.wt_mole = np.empty(self.num_prod)
-        for i,r in enumerate(self.products):
-            self.wt_mole[i] = self.prod_data[r]['wt']
+def block_diag_pattern(vec_size, nrow, ncol): 
+    """
+    rows and cols for a partial made of vec_size dense (nrow x ncol) blocks down the diagonal, 
+    as used by the components with a `vec_size` option. Values go in as an array of shape 
+    (vec_size, nrow, ncol), flattened.
+    """
+    r, c = np.meshgrid(np.arange(nrow), np.arange(ncol), indexing='ij')
+    k = np.arange(vec_size)[:, np.newaxis, np.newaxis]
+    return (k*nrow + r).ravel(), (k*ncol + c).ravel()
+
+
+# process wide registry of SpeciesTables, keyed on (species database, element set)
+_species_tables_registry = {}
 
-        #### pre-computed constants used in calculations ###
-        aij_prod = np.empty((self.num_element,self.num_element, self.num_prod))
-        for i in range(self.num_element):
-            for j in range(self.num_element):
-                aij_prod[i][j] = self.aij[i]*self.aij[j]
 
-        self.aij_prod = aij_prod
+def get_species_tables(thermo_data_module, elements):
+    """Return the shared SpeciesTables for the given thermo data and set of elements"""
 
-        self.aij_prod_deriv = np.zeros((self.num_element**2,self.num_prod))
-        for k in range(self.num_element**2):
-            for l in range(self.num_prod):
-                i = k//self.num_element
-                j = np.mod(k,self.num_element)
-                self.aij_prod_deriv[k][l] = self.aij_prod[i][j][l]
+    key = (species_db(thermo_data_module), frozenset(elements))
+    try:
+        return _species_tables_registry[key]
+    except KeyError:
+        tables = _species_tables_registry[key] = SpeciesTables(thermo_data_module, elements)
+        return tables
+
+
+class Properties(object):
+    """Compute H, S, Cp given a species and temperature"""
+    
+    def __init__(self, thermo_data_module, init_elements=None):
+
+        if init_elements is None: 
+            raise ValueError('You have not provided `init_elements`. In order to set thermodynamic data it must be provided.')
+
+        self.thermo_data_module = thermo_data_module
+        self.init_elements = init_elements
+        self.temp_ranges = None
+
+        # everything that only depends on the thermo data and the element set is shared
+        self.tables = tables = get_species_tables(thermo_data_module, init_elements.keys())
+        self.prod_data = tables.prod_data
+        self.elements = tables.elements
+        self.products = tables.products
+        self.num_element = tables.num_element
+        self.num_prod = tables.num_prod
+        self.element_wt = tables.element_wt
+        self.aij = tables.aij
+        self.wt_mole = tables.wt_mole # array of mole weights
+        self.aij_prod = tables.aij_prod
+        self.aij_prod_deriv = tables.aij_prod_deriv
+        self.coeff_bank = tables.coeff_bank
+        self.range_edges = tables.range_edges
+        self._interior_edges = tables.interior_edges
+        self._prod_idx = tables.prod_idx
+        self.temp_base = tables.temp_base
+
+        #### per-instance state ####
+        # coefficients for the current temperature range
+        self.a = np.zeros((self.num_prod, 10))
+        self.a_T = self.a.T
+        self.valid_temp_range = None
 
         #### Computing b0 values ###
-        self.b0 = np.zeros(self.num_element)
-        for i,e in enumerate(element_list): 
-            self.b0[i] = self.init_elements[e]
+        self.b0 = np.array([init_elements[e] for e in self.elements], dtype=float)
 
         self.b0 = self.b0*self.element_wt
         self.b0 = self.b0/np.sum(self.b0)
         self.b0 = self.b0/self.element_wt
 
+        self.coeff_table_builds = 0 # number of times the coefficient table was rebuilt
+
+        # memoized result of eval_all
+        self._eval_T = None
+        self._eval_cache = None
+        self._eval_vec_T = None
+        self._eval_vec_cache = None
+
         self.build_coeff_table(999) # just pick arbitrary default temperature so there is something there right away
         
 
-    def H0(self, Tt): # standard-state molar enthalpy for species j at temp T
+    def eval_all(self, Tt):
+        """Evaluate H0, S0, Cp0 and their temperature derivatives for every species in one pass.
+        The result is cached, so repeated calls at the same temperature are free. 
+
+        Returns (H0, S0, Cp0, dH0_dT, dS0_dT, dCp0_dT), each of length num_prod. 
+        The arrays are shared between callers and are read-only."""
+
         Tt = Tt[0]
+        if Tt == self._eval_T and type(Tt) is type(self._eval_T): 
+            return self._eval_cache
+
         if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
             self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return (-a_T[0]/Tt**2 + a_T[1]/Tt*log(Tt) + a_T[2] + a_T[3]*Tt/2. + a_T[4]*Tt**2/3. + a_T[5]*Tt**3/4. + a_T[6]*Tt**4/5.+a_T[7]/Tt)
+
+        result = _poly_basis(Tt).dot(self.a_T[:9])
+        result.flags.writeable = False
+
+        self._eval_T = Tt
+        self._eval_cache = tuple(result)
+        return self._eval_cache
+
+    def eval_all_vec(self, Tt): 
+        """Same as eval_all, but for an array of temperatures. The coefficients are gathered 
+        per temperature from the coefficient bank, and each result has shape (len(Tt), num_prod)."""
+
+        if self._eval_vec_T is not None and Tt.dtype == self._eval_vec_T.dtype and np.array_equal(Tt, self._eval_vec_T): 
+            return self._eval_vec_cache
+
+        a = self.coeffs(Tt)[:, :9, :] # (num_prod, 9, len(Tt))
+        result = np.einsum('kjt,pjt->ktp', _poly_basis(Tt), a)
+        result.flags.writeable = False
+
+        self._eval_vec_T = Tt.copy()
+        self._eval_vec_cache = tuple(result)
+        return self._eval_vec_cache
+
+    def H0(self, Tt): # standard-state molar enthalpy for species j at temp T
+        return self.eval_all(Tt)[0]
 
     def S0(self, Tt): # standard-state molar entropy for species j at temp T
-        Tt = Tt[0]
-        if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
-            self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return (-a_T[0]/(2*Tt**2) - a_T[1]/Tt + a_T[2]*log(Tt) + a_T[3]*Tt + a_T[4]*Tt**2/2. + a_T[5]*Tt**3/3. + a_T[6]*Tt**4/4.+a_T[8])
+        return self.eval_all(Tt)[1]
 
     def Cp0(self, Tt): #molar heat capacity at constant pressure for
                     #standard state for species or reactant j, J/(kg-mole)_j(K)
-        Tt = Tt[0]
-        if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
-            self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return a_T[0]/Tt**2 + a_T[1]/Tt + a_T[2] + a_T[3]*Tt + a_T[4]*Tt**2 + a_T[5]*Tt**3 + a_T[6]*Tt**4
+        return self.eval_all(Tt)[2]
 
     def H0_applyJ(self, Tt, vec):
-        Tt = Tt[0]
-        if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
-            self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return vec*(2*a_T[0]/Tt**3 + a_T[1]*(1-log(Tt))/Tt**2 + a_T[3]/2. + 2*a_T[4]/3.*Tt + 3*a_T[5]/4.*Tt**2 + 4*a_T[6]/5.*Tt**3 - a_T[7]/Tt**2)
+        return vec*self.eval_all(Tt)[3]
 
     def S0_applyJ(self, Tt, vec):
-        Tt = Tt[0]
-        if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
-            self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return vec*(a_T[0]/(Tt**3) + a_T[1]/Tt**2 + a_T[2]/Tt + a_T[3] + a_T[4]*Tt + a_T[5]*Tt**2 + 4*a_T[6]/4.*Tt**3)
+        return vec*self.eval_all(Tt)[4]
 
     def Cp0_applyJ(self, Tt, vec):
-        Tt = Tt[0]
-        if Tt < self.valid_temp_range[0] or Tt > self.valid_temp_range[1]: # runs if temperature is outside range of current coefficients
-            self.build_coeff_table(Tt)
-        a_T = self.a_T
-        return vec*(-2*a_T[0]/Tt**3 - a_T[1]/Tt**2 + a_T[3] + 2.*a_T[4]*Tt + 3.*a_T[5]*Tt**2 + 4.*a_T[6]*Tt**3)
+        return vec*self.eval_all(Tt)[5]
 
-    def build_coeff_table(self, Tt):
-        """Build the temperature specific coeff array and find the highest-low value and
-        the lowest-high value of temperatures from all the reactants to give the
-        valid range for the data fits."""
-
-        if self.temp_base is None:
-            self.temp_base = np.zeros(self.num_prod)
+    def range_index(self, Tt):
+        """Index of the temperature range that applies to each product. 
+        Returns shape (num_prod,) for scalar Tt, or (num_prod, len(Tt)) for an array"""
 
-        max_low, min_high = -1e50, 1e50
-        for i,p in enumerate(self.products):
-            tr = self.prod_data[p]['ranges']
+        Tt = np.asarray(Tt)
+        if Tt.ndim == 0: 
+            return np.sum(self._interior_edges < Tt, axis=1)
+        return np.sum(self._interior_edges[:, :, np.newaxis] < Tt, axis=1)
 
-            if self.temp_base[i] == 0:
-                self.temp_base[i] = tr[0]
+    def coeffs(self, Tt):
+        """Polynomial coefficients for each product, gathered from the coefficient bank in one shot. 
+        Returns shape (num_prod, 10) for scalar Tt, or (num_prod, 10, len(Tt)) for an array"""
 
-            j = int(np.searchsorted(tr, Tt))
-            if j == 0: # dont run off the start
-                j = 1
-            elif j == len(tr): # don't run off the end
-                j -= 1
+        idx = self.range_index(Tt)
+        if idx.ndim == 1: 
+            return self.coeff_bank[self._prod_idx, idx]
+        return np.moveaxis(self.coeff_bank[self._prod_idx[:, np.newaxis], idx], -1, 1)
 
-            # find valid range
-            low, high = tr[j-1], tr[j]
-            max_low = max(low, max_low)
-            min_high = min(high, min_high)
+    def build_coeff_table(self, Tt):
+        """Build the temperature specific coeff array and find the highest-low value and
+        the lowest-high value of temperatures from all the reactants to give the
+        valid range for the data fits."""
 
-            # built a data
-            data = self.prod_data[p]['coeffs'][j-1]
+        idx = self.range_index(Tt)
 
-            # have to slice because some rows are 9 long and others 10
-            self.a[i][:len(data)] = data
+        # a_T is a view of a, so it has to be updated in place
+        self.a[:] = self.coeff_bank[self._prod_idx, idx]
 
-        self.valid_temp_range = (max_low, min_high)
+        low = self.range_edges[self._prod_idx, idx]
+        high = self.range_edges[self._prod_idx, idx+1]
+        self.valid_temp_range = (np.max(low), np.min(high))
 
+        self.coeff_table_builds += 1
+        self._eval_T = None
@@ -0,0 +1,304 @@
+"""
+Compiled species databases for the CEA thermo.
+
+A SpeciesDB holds the thermo data of every product as contiguous arrays: the polynomial coefficients
+of each temperature range, the edges of the ranges, the molecular weights and the element matrix.
+It's saved to a single .npz, and a LazySpeciesDB only loads it the first time it's used, so nothing
+is parsed when the thermo is imported. The products that can be made from a set of elements are
+found from the element matrix, once per element set.
+
+The databases in thermo_data are compiled from the python modules next to them with
+
+    python -m pycycle.thermo.cea.species_db pycycle.thermo.cea.thermo_data.janaf pycycle/thermo/cea/thermo_data/janaf.npz
+
+and databases can be compiled from the NASA Glenn thermo.inp format (9 coefficient polynomials)
+the same way, giving the path of the thermo.inp file instead of a module.
+"""
+import json
+from collections import OrderedDict
+
+import numpy as np
+
+
+# powers of T of the 7 coefficients of each range in thermo.inp, the only ones the polynomials support
+INP_T_EXPONENTS = (-2., -1., 0., 1., 2., 3., 4.)
+
+
+class SpeciesDB(object):
+    """
+    Thermo data of a set of products, as arrays.
+
+    The products are in the order they were given, and the elements sorted. Products with fewer
+    temperature ranges than the most have their coefficients padded with zeros and their range
+    edges with inf.
+    """
+
+    def __init__(self, products, element_wts, elements, aij, wt, coeff_bank, range_edges, num_ranges,
+                 reactants=None):
+        self.products = tuple(products)
+        self.element_wts = dict(element_wts)
+        self.elements = tuple(elements)
+        self.reactants = reactants if reactants is not None else {}
+
+        self.element_wt = np.array([self.element_wts[e] for e in self.elements], dtype=float)
+        self.aij = np.asarray(aij, dtype=float) # (element, product)
+        self.wt = np.asarray(wt, dtype=float)
+        self.coeff_bank = np.asarray(coeff_bank, dtype=float) # (product, range, 10)
+        self.range_edges = np.asarray(range_edges, dtype=float) # (product, range+1)
+        self.num_ranges = np.asarray(num_ranges, dtype=int)
+
+        for arr in (self.element_wt, self.aij, self.wt, self.coeff_bank, self.range_edges, self.num_ranges):
+            arr.flags.writeable = False
+
+        self._product_index = {}
+        self._prod_data = None
+
+    def product_index(self, elements):
+        """
+        Indices of the products made only of the given elements, in database order.
+        """
+        key = frozenset(elements)
+        try:
+            return self._product_index[key]
+        except KeyError:
+            missing = [i for i, e in enumerate(self.elements) if e not in key]
+            idx = np.flatnonzero(~np.any(self.aij[missing] != 0., axis=0))
+            idx.flags.writeable = False
+            self._product_index[key] = idx
+            return idx
+
+    @property
+    def prod_data(self):
+        """
+        The products in the layout of the python thermo data modules, built the first time it's asked for.
+        """
+        if self._prod_data is None:
+            self._prod_data = OrderedDict()
+            for i, name in enumerate(self.products):
+                n = self.num_ranges[i]
+                self._prod_data[name] = {'coeffs': self.coeff_bank[i, :n],
+                                         'ranges': self.range_edges[i, :n+1],
+                                         'wt': self.wt[i],
+                                         'elements': {e: self.aij[j, i] for j, e in enumerate(self.elements)
+                                                      if self.aij[j, i] != 0.}}
+        return self._prod_data
+
+    def save(self, path):
+        """
+        Save the database to a .npz file.
+        """
+        np.savez(path, products=np.array(self.products), elements=np.array(self.elements),
+                 aij=self.aij, wt=self.wt, coeff_bank=self.coeff_bank, range_edges=self.range_edges,
+                 num_ranges=self.num_ranges,
+                 element_wts=np.array(json.dumps(self.element_wts)),
+                 reactants=np.array(json.dumps(self.reactants)))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a database saved with `save`.
+        """
+        with np.load(path) as data:
+            return cls(products=[str(p) for p in data['products']],
+                       element_wts=json.loads(str(data['element_wts'])),
+                       elements=[str(e) for e in data['elements']],
+                       aij=data['aij'], wt=data['wt'], coeff_bank=data['coeff_bank'],
+                       range_edges=data['range_edges'], num_ranges=data['num_ranges'],
+                       reactants=json.loads(str(data['reactants']), object_pairs_hook=OrderedDict))
+
+
+class LazySpeciesDB(object):
+    """
+    A SpeciesDB that isn't loaded until it's used.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._db = None
+
+    def load(self):
+        if self._db is None:
+            self._db = SpeciesDB.load(self.path)
+        return self._db
+
+    def __getattr__(self, name):
+        if name.startswith('__') or name in ('path', '_db'):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __repr__(self):
+        return f'LazySpeciesDB({self.path!r})'
+
+
+def from_products(products, element_wts, reactants=None):
+    """
+    SpeciesDB from products laid out like the python thermo data modules: an ordered mapping of
+    product name to a dict with 'coeffs', 'ranges', 'wt' and 'elements'.
+    """
+    names = list(products)
+    elements = sorted(set().union(*(products[name]['elements'] for name in names)))
+
+    num_ranges = np.array([len(products[name]['coeffs']) for name in names], dtype=int)
+    max_ranges = max(num_ranges)
+
+    aij = np.array([[products[name]['elements'].get(e, 0) for name in names] for e in elements], dtype=float)
+    coeff_bank = np.zeros((len(names), max_ranges, 10))
+    range_edges = np.full((len(names), max_ranges+1), np.inf)
+    for i, name in enumerate(names):
+        range_edges[i, :num_ranges[i]+1] = products[name]['ranges']
+        for j, data in enumerate(products[name]['coeffs']):
+            # have to slice because some rows are 9 long and others 10
+            coeff_bank[i, j, :len(data)] = data
+
+    return SpeciesDB(names, element_wts, elements, aij, [products[name]['wt'] for name in names],
+                     coeff_bank, range_edges, num_ranges, reactants=reactants)
+
+
+def from_module(thermo_data_module):
+    """
+    SpeciesDB from one of the python thermo data modules.
+    """
+    return from_products(thermo_data_module.products, thermo_data_module.element_wts,
+                         reactants=getattr(thermo_data_module, 'reactants', None))
+
+
+def _inp_float(field):
+    return float(field.replace('D', 'E').replace('d', 'e'))
+
+
+def read_thermo_inp(lines):
+    """
+    Parse thermo.inp data into an ordered dict of species name to (phase, mol wt, elements, ranges, coeffs).
+
+    Only the products are read, the reactants after 'END PRODUCTS' are skipped.
+    """
+    records = [line.rstrip('\n') for line in lines
+               if line.strip() and not line.startswith(('!', '#'))]
+
+    # 'thermo' and the line with the default temperature ranges
+    if records and records[0].strip().lower().startswith('thermo'):
+        records = records[2:]
+
+    species = OrderedDict()
+    i = 0
+    while i < len(records):
+        line = records[i]
+        if line.upper().startswith('END'):
+            break
+
+        name = line[:24].split()[0]
+        info = records[i+1].ljust(80)
+        num_ranges = int(info[:2])
+        elements = OrderedDict()
+        for k in range(5):
+            symbol = info[10+8*k:12+8*k].strip()
+            count = info[12+8*k:18+8*k].strip()
+            if symbol and count and float(count) != 0.:
+                elements[symbol.capitalize() if len(symbol) == 2 else symbol] = float(count)
+        phase = int(info[50:52])
+        wt = float(info[52:65])
+        i += 2
+
+        ranges = []
+        coeffs = []
+        for k in range(num_ranges):
+            t_line = records[i].ljust(80)
+            exponents = tuple(float(t_line[23+5*n:28+5*n]) for n in range(7))
+            if exponents != INP_T_EXPONENTS:
+                raise ValueError(f'Species `{name}` has T exponents {exponents}, only {INP_T_EXPONENTS} are supported.')
+
+            T_low, T_high = float(t_line[:11]), float(t_line[11:22])
+            if not ranges:
+                ranges.append(T_low)
+            ranges.append(T_high)
+
+            a_line = records[i+1].ljust(80)
+            b_line = records[i+2].ljust(80)
+            a = [_inp_float(a_line[16*n:16*(n+1)]) for n in range(5)]
+            a += [_inp_float(b_line[16*n:16*(n+1)]) for n in range(2)]
+            b = [_inp_float(b_line[48+16*n:48+16*(n+1)]) for n in range(2)]
+            coeffs.append(a + b)
+            i += 3
+
+        if num_ranges == 0:
+            # condensed species at a single temperature, with just an enthalpy
+            i += 1
+
+        species[name] = (phase, wt, elements, np.array(ranges), coeffs)
+
+    return species
+
+
+def from_thermo_inp(path, species=None, element_wts=None, reactants=None):
+    """
+    SpeciesDB from a NASA Glenn thermo.inp file.
+
+    By default it holds every gas phase, neutral product. `species` picks them by name instead, in
+    that order. The element weights come from the monatomic gas species in the file, unless given in
+    `element_wts`.
+    """
+    with open(path) as f:
+        data = read_thermo_inp(f)
+
+    wts = {}
+    for name, (phase, wt, elements, _, _) in data.items():
+        if phase == 0 and len(elements) == 1 and list(elements.values()) == [1.]:
+            wts[list(elements)[0]] = wt
+    if element_wts is not None:
+        wts.update(element_wts)
+
+    if species is None:
+        species = [name for name, (phase, _, elements, _, coeffs) in data.items()
+                   if phase == 0 and coeffs and 'E' not in elements and not name.endswith(('+', '-'))]
+
+    products = OrderedDict()
+    for name in species:
+        if name not in data:
+            raise ValueError(f'Species `{name}` is not in {path}.')
+        _, wt, elements, ranges, coeffs = data[name]
+        products[name] = {'coeffs': coeffs, 'ranges': ranges, 'wt': wt, 'elements': elements}
+
+    used = set().union(*(p['elements'] for p in products.values()))
+    missing = sorted(used.difference(wts))
+    if missing:
+        raise ValueError(f'No weight for the elements {missing}, give them in `element_wts`.')
+
+    return from_products(products, {e: wts[e] for e in sorted(used)}, reactants=reactants)
+
+
+_module_dbs = {}
+
+
+def species_db(spec):
+    """
+    The SpeciesDB for a thermo data spec, which can be a SpeciesDB, a LazySpeciesDB or one of the
+    python thermo data modules. Modules are converted once.
+    """
+    if isinstance(spec, SpeciesDB):
+        return spec
+    if isinstance(spec, LazySpeciesDB):
+        return spec.load()
+    try:
+        return _module_dbs[spec]
+    except KeyError:
+        db = _module_dbs[spec] = from_module(spec)
+        return db
+
+
+if __name__ == "__main__":
+    import argparse
+    import importlib
+
+    parser = argparse.ArgumentParser(description='Compile a species database from a python thermo data '
+                                                 'module or a NASA thermo.inp file')
+    parser.add_argument('source', help='python module path, or thermo.inp file')
+    parser.add_argument('out', help='.npz file to write')
+    parser.add_argument('--species', nargs='+', default=None,
+                        help='products to keep from a thermo.inp file. Defaults to every gas phase neutral')
+    args = parser.parse_args()
+
+    if args.source.endswith('.inp'):
+        db = from_thermo_inp(args.source, species=args.species)
+    else:
+        db = from_module(importlib.import_module(args.source))
+    db.save(args.out)
@@ -0,0 +1,142 @@
+import time
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from pycycle.thermo.cea.chem_eq import SetTotalTP, ChemEq
+from pycycle.thermo.cea import species_data
+from pycycle import constants
+
+
+def _build(eq_solver, spec, composition, vec_size=1):
+
+    p = om.Problem()
+    p.model = SetTotalTP(spec=spec, composition=composition, eq_solver=eq_solver, vec_size=vec_size)
+    p.model.set_input_defaults('T', 500.*np.ones(vec_size), units='degK')
+    p.model.set_input_defaults('P', np.ones(vec_size), units='bar')
+    p.setup(check=False)
+    p.set_solver_print(level=-1)
+    p.final_setup()
+
+    return p
+
+
+class ChemEqSolverBenchmark(unittest.TestCase):
+    """ compares the reduced CEA iteration against the full newton solve over a T/P sweep """
+
+    def _sweep(self, spec, composition):
+
+        T_sweep = np.linspace(300., 2500., 12)
+        P_sweep = (0.3, 1., 10., 40.)
+
+        results = {}
+        for eq_solver in ('newton', 'reduced'):
+            p = _build(eq_solver, spec, composition)
+            vals = []
+            st = time.time()
+            for T in T_sweep:
+                for P in P_sweep:
+                    p.set_val('T', T, units='degK')
+                    p.set_val('P', P, units='bar')
+                    p.run_model()
+                    vals.append((p['n_moles'][0], p['h'][0], p['S'][0], p['gamma'][0]))
+            results[eq_solver] = (time.time() - st, np.array(vals))
+
+        t_newton, newton_vals = results['newton']
+        t_reduced, reduced_vals = results['reduced']
+        diff = np.max(np.abs(reduced_vals - newton_vals) / np.abs(newton_vals), axis=0)
+        print(f'\nnewton: {t_newton:.3f}s  reduced: {t_reduced:.3f}s  speedup: {t_newton/t_reduced:.2f}x')
+        # NOTE: the newton solver doesn't always converge the minor species all the way
+        #       (it tends to get stuck on the lower bound when the sweep moves to higher T), 
+        #       so the differences at high temperature are mostly newton error
+        print('max rel diff (n_moles, h, S, gamma):', diff)
+
+        return results
+
+    def benchmark_air(self):
+        self._sweep(species_data.janaf, constants.CEA_AIR_COMPOSITION)
+
+    def benchmark_air_fuel(self):
+        self._sweep(species_data.janaf, constants.CEA_AIR_FUEL_COMPOSITION)
+
+    def benchmark_co2_co_o2(self):
+        self._sweep(species_data.co2_co_o2, constants.CEA_CO2_CO_O2_COMPOSITION)
+
+    def benchmark_co2_co_o2_reference(self):
+        # reference values from CEA 
+        p = _build('reduced', species_data.co2_co_o2, constants.CEA_CO2_CO_O2_COMPOSITION)
+
+        for T, gamma in ((4000., 1.19054697), (1500., 1.16379233)):
+            p.set_val('T', T, units='degK')
+            p.set_val('P', 1.034210, units='bar')
+            p.run_model()
+            assert_near_equal(p['gamma'], gamma, 1e-4)
+
+    def benchmark_vec_size(self):
+        # one batched run_model over the whole grid vs a python loop over the points
+        T, P = np.meshgrid(np.linspace(300., 2500., 25), (0.3, 1., 10., 40.))
+        T = T.ravel()
+        P = P.ravel()
+
+        for eq_solver in ('newton', 'reduced'):
+            p = _build(eq_solver, species_data.janaf, constants.CEA_AIR_FUEL_COMPOSITION)
+            st = time.time()
+            gamma = []
+            for T_i, P_i in zip(T, P):
+                p.set_val('T', T_i, units='degK')
+                p.set_val('P', P_i, units='bar')
+                p.run_model()
+                gamma.append(p['gamma'][0])
+            t_loop = time.time() - st
+
+            p = _build(eq_solver, species_data.janaf, constants.CEA_AIR_FUEL_COMPOSITION, vec_size=len(T))
+            p.set_val('T', T, units='degK')
+            p.set_val('P', P, units='bar')
+            st = time.time()
+            p.run_model()
+            t_vec = time.time() - st
+
+            print(f'\n{eq_solver} {len(T)} points, loop: {t_loop:.3f}s  vec_size: {t_vec:.3f}s  '
+                  f'speedup: {t_loop/t_vec:.2f}x')
+            print('max rel diff in gamma:', np.max(np.abs(p['gamma'] - gamma)/np.abs(gamma)))
+
+    def benchmark_active_set(self):
+        # condensed newton linear solve vs the assembled DirectSolver, from the same starting point
+        thermo = species_data.Properties(species_data.janaf, init_elements=constants.CEA_AIR_FUEL_COMPOSITION)
+        T = np.linspace(600., 2800., 24)
+
+        for vec_size in (1, len(T)):
+            results = {}
+            for active_set in (True, False):
+                p = om.Problem()
+                p.model.add_subsystem('ceq', ChemEq(thermo=thermo, active_set=active_set, vec_size=vec_size),
+                                      promotes=['*'])
+                p.model.set_input_defaults('T', T[:vec_size], units='degK')
+                p.model.set_input_defaults('P', np.ones(vec_size), units='bar')
+                p.setup(check=False)
+                p.set_solver_print(level=-1)
+                p.final_setup()
+                init = {name: p[name].copy() for name in ('n', 'pi', 'n_moles')}
+
+                iters = 0
+                st = time.time()
+                for i in range(len(T)//vec_size):
+                    for name, val in init.items():
+                        p[name] = val
+                    p['T'] = T[i*vec_size:(i+1)*vec_size]
+                    p.run_model()
+                    iters += p.model.ceq.nonlinear_solver._iter_count
+                results[active_set] = (time.time() - st, iters, p['n'].copy())
+
+            t_active, iters_active, n_active = results[True]
+            t_direct, iters_direct, n_direct = results[False]
+            print(f'\nvec_size={vec_size} active set: {t_active:.3f}s ({iters_active} iterations)  '
+                  f'direct: {t_direct:.3f}s ({iters_direct} iterations)  speedup: {t_direct/t_active:.2f}x')
+            assert_near_equal(n_active, n_direct, 1e-6)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -28,6 +28,18 @@ class ChemEqTestCase(unittest.TestCase):
 
         assert_near_equal(p['n'], [8.15344263e-06, 2.27139552e-02, 4.07672148e-06], tol)
 
+    def test_set_total_tp_reduced(self):
+        p = self.p
+        p.model.add_subsystem('ceq', ChemEq(thermo=self.thermo, eq_solver='reduced'), promotes=["*"])
+        p.model.set_input_defaults('T', 1500., units='degK')
+        p.setup(check=False)
+        p.run_model()
+
+        tol = 1e-5
+
+        assert_near_equal(p['n'], [8.19251239e-06, 2.27139197e-02, 4.09125694e-06], tol)
+        assert_near_equal(p['n_moles'], 0.0227262, tol)
+
 
 if __name__ == "__main__":
 
@@ -1,3 +1,4 @@
+import time
 import unittest
 import numpy as np
 
@@ -35,6 +36,73 @@ class ChemEqTestCase(unittest.TestCase):
         print(check_val)
         assert_near_equal(p['n'], check_val, tol)
 
+    def test_set_total_tp_reduced(self):
+        p = self.p
+        p.model.add_subsystem('ceq', ChemEq(thermo=self.thermo, eq_solver='reduced'), promotes=["*"])
+        p.model.set_input_defaults('T', 1500., units='degK')
+        p.setup(check=False)
+        p.run_model()
+
+        # NOTE: the reduced solver converges the minor species (e.g. NO) all the way, 
+        #       where the trace damping in the newton solver leaves them short of equilibrium
+        check_val = np.array([3.23319235e-04, 1.16619243e-10, 1.10131067e-05, 1.00000000e-10,
+                              4.19206290e-05, 2.27520423e-07, 1.00000000e-10, 2.69368107e-02,
+                              6.33238966e-08, 7.21077404e-03])
+
+        tol = 1e-5
+
+        assert_near_equal(p['n'], check_val, tol)
+        assert_near_equal(p['n_moles'], 0.03452413, tol)
+
+    def _active_set_problem(self, active_set, mode='auto'):
+        p = Problem()
+        p.model.add_subsystem('ceq', ChemEq(thermo=self.thermo, active_set=active_set), promotes=["*"])
+        p.model.set_input_defaults('P', 1.034210, units="bar")
+        p.model.set_input_defaults('T', 1500., units='degK')
+        p.setup(check=False, mode=mode)
+        p.set_solver_print(level=-1)
+
+        return p
+
+    def test_active_set(self):
+
+        results = {}
+        for active_set in (True, False):
+            p = self._active_set_problem(active_set)
+            solver = p.model.ceq.nonlinear_solver
+
+            iters = 0
+            st = time.time()
+            for T in (1500., 2500., 1000.):
+                p['T'] = T
+                p.run_model()
+                iters += solver._iter_count
+            elapsed = time.time() - st
+            print(f'active_set={active_set}: {iters} newton iterations, {elapsed/3*1e3:.2f} ms per solve')
+
+            # totals go through the component's linear solver
+            J = p.compute_totals(of=['n', 'n_moles'], wrt=['T', 'P'])
+            results[active_set] = (p['n'].copy(), p['n_moles'].copy(), J)
+
+        n, n_moles, J = results[True]
+        n_ref, n_moles_ref, J_ref = results[False]
+        assert_near_equal(n, n_ref, 1e-6)
+        assert_near_equal(n_moles, n_moles_ref, 1e-8)
+        for key in J_ref:
+            assert_near_equal(J[key], J_ref[key], 1e-6)
+
+    def test_active_set_rev(self):
+
+        totals = []
+        for mode in ('fwd', 'rev'):
+            p = self._active_set_problem(True, mode=mode)
+            p.run_model()
+            totals.append(p.compute_totals(of=['n', 'pi', 'n_moles'], wrt=['T', 'P']))
+
+        J_fwd, J_rev = totals
+        for key in J_fwd:
+            assert_near_equal(J_rev[key], J_fwd[key], 1e-8)
+
 
 if __name__ == "__main__":
 
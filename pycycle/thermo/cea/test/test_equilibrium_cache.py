@@ -0,0 +1,178 @@
+import gc
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from pycycle.thermo.cea.chem_eq import ChemEq, EquilibriumCache, get_equilibrium_cache
+from pycycle.thermo.cea import species_data
+from pycycle import constants
+
+
+class _Owner(object):
+    """ stands in for a ChemEq deferring solutions to a cache """
+
+
+class EquilibriumCacheTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.b0 = np.array([[1., 2.]])
+
+    def _store(self, cache, T, val):
+        cache.store(np.array([T]), np.array([1.]), self.b0, np.array([[val, val, val]]), np.array([[val, val]]))
+
+    def test_nearest(self):
+        cache = EquilibriumCache(4, 3, 2)
+
+        n, pi, found = cache.lookup(np.array([500.]), np.array([1.]), self.b0)
+        self.assertFalse(found[0])
+
+        self._store(cache, 500., 1.)
+        self._store(cache, 1000., 2.)
+        self._store(cache, 2000., 3.)
+
+        n, pi, found = cache.lookup(np.array([1100., 1900.]), np.array([1., 1.]), np.vstack([self.b0, self.b0]))
+        self.assertTrue(np.all(found))
+        assert_near_equal(n[:, 0], [2., 3.])
+        assert_near_equal(pi[:, 0], [2., 3.])
+
+    def test_overwrite(self):
+        cache = EquilibriumCache(4, 3, 2)
+
+        self._store(cache, 500., 1.)
+        self._store(cache, 500., 2.)
+        self.assertEqual(cache.num_entries, 1)
+
+        n, pi, found = cache.lookup(np.array([500.]), np.array([1.]), self.b0)
+        assert_near_equal(n[0], [2., 2., 2.])
+
+    def test_lru_eviction(self):
+        cache = EquilibriumCache(2, 3, 2)
+
+        self._store(cache, 500., 1.)
+        self._store(cache, 1000., 2.)
+        # touch the 500 entry, so the 1000 entry is the least recently used
+        cache.lookup(np.array([500.]), np.array([1.]), self.b0)
+        self._store(cache, 2000., 3.)
+        self.assertEqual(cache.num_entries, 2)
+
+        n, pi, found = cache.lookup(np.array([900.]), np.array([1.]), self.b0)
+        # 1000 is gone, so 500 is the nearest
+        assert_near_equal(n[0, 0], 1.)
+
+    def test_defer(self):
+        cache = EquilibriumCache(4, 3, 2)
+        owner = _Owner()
+
+        idx = np.array([0])
+        T = np.array([500.])
+        P = np.array([1.])
+        # repeated solutions at the same point only keep the last one
+        cache.defer(owner, idx, T, P, self.b0, np.array([[1., 1., 1.]]), np.array([[1., 1.]]))
+        cache.defer(owner, idx, T, P, self.b0, np.array([[2., 2., 2.]]), np.array([[2., 2.]]))
+        self.assertEqual(cache.num_entries, 0)
+
+        # moving on to a new point stores the old one
+        cache.defer(owner, idx, 2*T, P, self.b0, np.array([[3., 3., 3.]]), np.array([[3., 3.]]))
+        self.assertEqual(cache.num_entries, 1)
+
+        # lookups see everything that is queued
+        n, pi, found = cache.lookup(np.array([500., 1000.]), np.array([1., 1.]), np.vstack([self.b0, self.b0]))
+        self.assertEqual(cache.num_entries, 2)
+        assert_near_equal(n[:, 0], [2., 3.])
+
+    def test_release(self):
+        cache = EquilibriumCache(4, 3, 2)
+        owner = _Owner()
+
+        cache.defer(owner, np.array([0]), np.array([500.]), np.array([1.]), self.b0,
+                    np.array([[1., 1., 1.]]), np.array([[1., 1.]]))
+        self.assertEqual(len(cache._owner_slots), 1)
+
+        # once the owner is gone its last solution is stored, and nothing is kept for it
+        del owner
+        gc.collect()
+        self.assertEqual(cache.num_entries, 1)
+        self.assertEqual(cache._pending, {})
+        self.assertEqual(cache._owner_slots, {})
+
+    def test_release_during_flush(self):
+        cache = EquilibriumCache(4, 3, 2)
+        owners = [_Owner(), _Owner()]
+
+        for i, owner in enumerate(owners):
+            cache.defer(owner, np.array([0]), np.array([500.+100*i]), np.array([1.]), self.b0,
+                        np.array([[1., 1., 1.]]), np.array([[1., 1.]]))
+        del owner
+
+        # the second owner gets collected while the first one's solution is being stored
+        store_pending = cache._store_pending
+        def _store_pending(key, pending):
+            if len(owners) > 1:
+                del owners[1]
+                gc.collect()
+            store_pending(key, pending)
+        cache._store_pending = _store_pending
+
+        cache.flush()
+        self.assertEqual(cache.num_entries, 2)
+        self.assertEqual(cache._pending, {})
+        self.assertEqual(list(cache._owner_slots), [id(owners[0])])
+
+    def test_shared(self):
+        thermo1 = species_data.Properties(species_data.janaf, init_elements=constants.AIR_ELEMENTS)
+        thermo2 = species_data.Properties(species_data.janaf, init_elements=constants.AIR_ELEMENTS)
+        thermo3 = species_data.Properties(species_data.co2_co_o2, init_elements=constants.CO2_CO_O2_ELEMENTS)
+
+        self.assertIs(get_equilibrium_cache(thermo1, 16), get_equilibrium_cache(thermo2, 16))
+        self.assertIsNot(get_equilibrium_cache(thermo1, 16), get_equilibrium_cache(thermo3, 16))
+
+
+class ChemEqWarmStartTestCase(unittest.TestCase):
+
+    def _problem(self, thermo, T, eq_solver, cache_size):
+        p = om.Problem()
+        p.model.add_subsystem('ceq', ChemEq(thermo=thermo, eq_solver=eq_solver, warm_start_cache=cache_size),
+                              promotes=['*'])
+        p.model.set_input_defaults('P', 1.034210, units='bar')
+        p.model.set_input_defaults('T', T, units='degK')
+        p.setup(check=False)
+        p.set_solver_print(level=-1)
+        return p
+
+    def _iter_count(self, p):
+        if p.model.ceq.options['eq_solver'] == 'newton':
+            return p.model.ceq.nonlinear_solver._iter_count
+        return p.model.ceq.reduced_iter_count
+
+    def test_warm_start(self):
+        # odd cache sizes, so this doesn't share a cache with anything else
+        for eq_solver in ('newton', 'reduced'):
+            thermo = species_data.Properties(species_data.janaf, init_elements=constants.CEA_AIR_FUEL_COMPOSITION)
+            size = 8 if eq_solver == 'newton' else 9
+
+            p_ref = self._problem(thermo, 2200., eq_solver, 0)
+            p_ref.run_model()
+            cold_iters = self._iter_count(p_ref)
+
+            # first point fills the cache, second one is a different component that starts from it
+            p1 = self._problem(thermo, 2000., eq_solver, size)
+            p1.run_model()
+            p2 = self._problem(thermo, 2200., eq_solver, size)
+            p2.run_model()
+            warm_iters = self._iter_count(p2)
+
+            cache = get_equilibrium_cache(thermo, size)
+            self.assertGreater(cache.num_entries, 0)
+            self.assertGreater(cache.hits, 0)
+
+            print(f'{eq_solver}: {cold_iters} iterations from the default guess, {warm_iters} from the cache')
+            self.assertLess(warm_iters, cold_iters)
+            assert_near_equal(p2['n'], p_ref['n'], 1e-4)
+            assert_near_equal(p2['n_moles'], p_ref['n_moles'], 1e-5)
+
+
+if __name__ == "__main__":
+    unittest.main()
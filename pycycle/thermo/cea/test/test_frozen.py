@@ -0,0 +1,99 @@
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
+
+from pycycle.thermo.thermo import Thermo
+from pycycle.thermo.cea.frozen import SetTotalTP, frozen_basis
+from pycycle.thermo.cea import species_data
+from pycycle import constants
+
+
+def _build(method, mode='total_TP', composition=constants.CEA_AIR_FUEL_COMPOSITION):
+
+    p = om.Problem()
+    p.model = Thermo(mode=mode, method=method,
+                     thermo_kwargs={'composition': composition, 'spec': species_data.janaf})
+    p.setup(check=False, force_alloc_complex=True)
+    p.set_solver_print(level=-1)
+
+    return p
+
+
+class FrozenThermoTestCase(unittest.TestCase):
+
+    def test_basis(self):
+
+        thermo = species_data.Properties(species_data.janaf, init_elements=constants.CEA_AIR_FUEL_COMPOSITION)
+        basis = frozen_basis(thermo, thermo.b0)
+        self.assertEqual([thermo.products[j] for j in basis], ['Ar', 'CO2', 'H2O', 'N2', 'O2'])
+
+    def test_matches_cea_cold(self):
+
+        p_cea = _build('CEA')
+        p_frozen = _build('FROZEN')
+
+        for T, P in ((600., 1.), (800., 10.)):
+            for p in (p_cea, p_frozen):
+                p.set_val('T', T, units='degK')
+                p.set_val('P', P, units='bar')
+                p.run_model()
+
+            # nothing dissociates at these temperatures, so there should be no real difference
+            for name in ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R'):
+                assert_near_equal(p_frozen[name], p_cea[name], 5e-4)
+
+    def test_total_hP(self):
+
+        p = _build('FROZEN', mode='total_hP')
+        p.set_val('h', 80., units='cal/g')
+        p.set_val('P', 2., units='bar')
+        p.run_model()
+
+        p_TP = _build('FROZEN')
+        p_TP.set_val('T', p.get_val('T', units='degK'), units='degK')
+        p_TP.set_val('P', 2., units='bar')
+        p_TP.run_model()
+
+        assert_near_equal(p_TP.get_val('h', units='cal/g'), 80., 1e-8)
+
+    def test_partials(self):
+
+        p = om.Problem()
+        p.model = SetTotalTP(spec=species_data.janaf, composition=constants.CEA_AIR_FUEL_COMPOSITION)
+        p.setup(check=False, force_alloc_complex=True)
+
+        p['T'] = 800.
+        p['P'] = 3.
+        p.run_model()
+
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+    def test_rich(self):
+
+        p = om.Problem()
+        p.model = SetTotalTP(spec=species_data.janaf, composition=constants.CEA_AIR_FUEL_COMPOSITION)
+        p.setup(check=False, force_alloc_complex=True)
+        props = p.model.props
+        lean_basis = props.basis
+
+        # add enough fuel to use up all the oxygen
+        b0 = p['composition'].copy()
+        b0[1] += 0.01 # C
+        b0[2] += 0.02 # H
+        p['composition'] = b0
+        p['T'] = 500.
+        p.run_model()
+
+        self.assertFalse(np.array_equal(props.basis, lean_basis))
+        self.assertTrue(np.all(props._species(b0) >= 0.))
+
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+
+if __name__ == "__main__":
+    unittest.main()
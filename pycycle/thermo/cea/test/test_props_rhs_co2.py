@@ -4,9 +4,9 @@ import numpy as np
 
 from openmdao.api import Problem, Group
 
-from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
 
-from pycycle.thermo.cea.props_rhs import PropsRHS
+from pycycle.thermo.cea.props_rhs import PropsRHS, PropsRHSSolve
 from pycycle.thermo.cea.props_calcs import PropsCalcs
 from pycycle.thermo.cea import species_data
 from pycycle import constants
@@ -52,6 +52,45 @@ class PropsRHSTestCase(unittest.TestCase):
         assert_near_equal(p['rhs_P'], goal_rhs_P, tol)
         assert_near_equal(p['lhs_TP'], goal_lhs_TP, tol)
 
+class PropsRHSSolveTestCase(unittest.TestCase):
+
+    def setUp(self):
+
+        self.thermo = species_data.Properties(species_data.co2_co_o2, init_elements=constants.CO2_CO_O2_ELEMENTS)
+
+        p = self.prob = Problem()
+        p.model = Group()
+
+        p.model.add_subsystem('props_rhs', PropsRHSSolve(thermo=self.thermo), promotes=['*'])
+        p.model.set_input_defaults('T', 4000., units='degK')
+
+        n = np.array([0.02040741, 0.0023147, 0.0102037])
+        p.model.set_input_defaults('n', n)
+
+        b = np.array([0.02272211, 0.04544422])
+        p.model.set_input_defaults('composition', b)
+        p.model.set_input_defaults('n_moles', 0.03292581)
+
+        p.setup(check=False, force_alloc_complex=True)
+
+    def test_total_solve(self):
+
+        p = self.prob
+        p.run_model()
+
+        tol = 1e-4
+        assert_near_equal(p['result_T'], [-1.74791977, 1.81604241, -0.24571810], tol)
+        assert_near_equal(p['result_P'], [0.48300853, 0.48301125, -0.01522548], tol)
+
+    def test_partials(self):
+
+        p = self.prob
+        p.run_model()
+
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1e-8, rtol=1e-8)
+
+
 class PropsCalcsTestCase(unittest.TestCase):
 
     def setUp(self):
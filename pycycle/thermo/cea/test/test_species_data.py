@@ -136,6 +136,85 @@ class SpeciesDataTestCase(unittest.TestCase):
         self.assertEqual(products3, products3_expected)
         self.assertEqual(set(elements3), elements3_expected)
 
+    def test_shared_tables(self):
+
+        thermo1 = species_data.Properties(thermo_data_module=species_data.janaf, init_elements=AIR_ELEMENTS)
+        elements = {'Ar':1., 'C':1., 'N':1., 'O':1.}
+        thermo2 = species_data.Properties(thermo_data_module=species_data.janaf, init_elements=elements)
+        thermo3 = species_data.Properties(thermo_data_module=species_data.co2_co_o2, init_elements=CO2_CO_O2_ELEMENTS)
+
+        # same thermo data and elements share the read-only tables, but not the composition
+        self.assertIs(thermo1.tables, thermo2.tables)
+        self.assertIs(thermo1.aij, thermo2.aij)
+        self.assertIsNot(thermo1.tables, thermo3.tables)
+        self.assertFalse(np.allclose(thermo1.b0, thermo2.b0))
+        with self.assertRaises(ValueError):
+            thermo1.aij[0, 0] = 2.
+
+        # the coefficient table and eval cache are per instance
+        H0_1 = thermo1.H0(np.array([500.]))
+        H0_2 = thermo2.H0(np.array([2000.]))
+        self.assertIs(thermo1.H0(np.array([500.])), H0_1)
+        self.assertEqual(thermo1.valid_temp_range, (200., 1000.))
+        self.assertEqual(thermo2.valid_temp_range, (1000., 6000.))
+
+    def test_eval_all(self):
+
+        thermo = species_data.Properties(thermo_data_module=species_data.janaf, init_elements=AIR_ELEMENTS)
+
+        for T in (800., 1200., 2500.): 
+            Tt = np.array([T])
+            H0, S0, Cp0, dH0_dT, dS0_dT, dCp0_dT = thermo.eval_all(Tt)
+
+            # cached on T
+            self.assertIs(thermo.eval_all(Tt)[0], H0)
+
+            # check the derivatives with complex step
+            Tc = np.array([T + 1e-40j])
+            H0c, S0c, Cp0c = thermo.eval_all(Tc)[:3]
+            assert_near_equal(H0c.imag/1e-40, dH0_dT, 1e-10)
+            assert_near_equal(S0c.imag/1e-40, dS0_dT, 1e-10)
+            assert_near_equal(Cp0c.imag/1e-40, dCp0_dT, 1e-10)
+            assert_near_equal(H0c.real, H0, 1e-15)
+
+            # Cp0 = d(T*H0)/dT and dS0/dT = Cp0/T
+            assert_near_equal(H0 + T*dH0_dT, Cp0, 1e-8)
+            assert_near_equal(dS0_dT, Cp0/T, 1e-8)
+
+        # the single value methods get the same numbers
+        Tt = np.array([800.])
+        assert_near_equal(thermo.H0(Tt), thermo.eval_all(Tt)[0], 1e-15)
+        assert_near_equal(thermo.S0_applyJ(Tt, 2.), 2*thermo.eval_all(Tt)[4], 1e-15)
+
+    def test_coeff_bank(self):
+
+        thermo = species_data.Properties(thermo_data_module=species_data.janaf, init_elements=AIR_ELEMENTS)
+
+        T = np.array([150., 800., 1000., 1500., 6500., 25000.])
+        coeffs = thermo.coeffs(T)
+        self.assertEqual(coeffs.shape, (thermo.num_prod, 10, len(T)))
+
+        # gather for an array of temperatures has to match the table built one temperature at a time
+        for i, Tt in enumerate(T): 
+            thermo.build_coeff_table(Tt)
+            assert_near_equal(coeffs[:, :, i], thermo.a, 1e-15)
+
+            # and match the raw thermo data 
+            for j, prod in enumerate(thermo.products): 
+                tr = thermo.prod_data[prod]['ranges']
+                k = min(max(int(np.searchsorted(tr, Tt)), 1), len(tr)-1) - 1
+                data = thermo.prod_data[prod]['coeffs'][k]
+                assert_near_equal(thermo.a[j, :len(data)], data, 1e-15)
+
+        # the table only gets rebuilt when T leaves the valid range
+        thermo.H0(np.array([1500.]))
+        n_builds = thermo.coeff_table_builds
+        thermo.H0(np.array([1200.]))
+        thermo.S0(np.array([2000.]))
+        self.assertEqual(thermo.coeff_table_builds, n_builds)
+        thermo.H0(np.array([800.]))
+        self.assertEqual(thermo.coeff_table_builds, n_builds+1)
+
 
 
 if __name__ == "__main__":
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import unittest
+from collections import OrderedDict
+
+import numpy as np
+
+from pycycle.constants import AIR_ELEMENTS
+from pycycle.thermo.cea import species_data
+from pycycle.thermo.cea.species_db import SpeciesDB, LazySpeciesDB, from_module, from_products, \
+    from_thermo_inp, species_db
+from pycycle.thermo.cea.thermo_data import janaf, wet_air, co2_co_o2
+
+
+def _inp_species(name, data, phase=0):
+    """
+    NASA thermo.inp lines for a product in the layout of the python thermo data modules.
+    """
+    elements = ''.join(f'{e.upper():<2}{n:6.2f}' for e, n in data['elements'].items())
+    lines = [f'{name:<24}test data',
+             f"{len(data['coeffs']):2d} {'test':<6} {elements:<40}{phase:2d}{data['wt']:13.7f}{0.:15.3f}"]
+    fmt = lambda vals: ''.join(f'{v:16.9E}'.replace('E', 'D') for v in vals)
+    for T_low, T_high, coeffs in zip(data['ranges'][:-1], data['ranges'][1:], data['coeffs']):
+        lines.append(f' {T_low:10.3f}{T_high:11.3f}7' + ''.join(f'{e:5.1f}' for e in (-2, -1, 0, 1, 2, 3, 4)))
+        lines.append(fmt(coeffs[:5]))
+        lines.append(fmt(coeffs[5:7]) + ' '*16 + fmt(coeffs[7:9]))
+    return lines
+
+
+class SpeciesDBTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_compiled_data(self):
+        # the shipped databases are up to date with the modules they were compiled from
+        for module, lazy in ((janaf, species_data.janaf), (wet_air, species_data.wet_air),
+                             (co2_co_o2, species_data.co2_co_o2)):
+            db, compiled = from_module(module), species_db(lazy)
+
+            self.assertEqual(compiled.products, tuple(module.products))
+            self.assertEqual(compiled.elements, db.elements)
+            self.assertEqual(compiled.element_wts, module.element_wts)
+            self.assertEqual(compiled.reactants, getattr(module, 'reactants', {}))
+            for name in ('aij', 'wt', 'coeff_bank', 'range_edges', 'num_ranges'):
+                np.testing.assert_array_equal(getattr(compiled, name), getattr(db, name))
+
+            for name, data in module.products.items():
+                np.testing.assert_array_equal(compiled.prod_data[name]['ranges'], data['ranges'])
+                self.assertEqual(compiled.prod_data[name]['elements'], dict(data['elements']))
+
+    def test_lazy(self):
+        path = os.path.join(self.tempdir, 'janaf.npz')
+        from_module(janaf).save(path)
+
+        lazy = LazySpeciesDB(path)
+        self.assertIsNone(lazy._db)
+
+        self.assertEqual(lazy.products, tuple(janaf.products))
+        self.assertIsInstance(lazy._db, SpeciesDB)
+        self.assertIs(species_db(lazy), lazy._db)
+
+        # the module is converted once
+        self.assertIs(species_db(janaf), species_db(janaf))
+
+    def test_product_index(self):
+        db = species_db(species_data.janaf)
+
+        idx = db.product_index(AIR_ELEMENTS)
+        self.assertIs(db.product_index(list(AIR_ELEMENTS)), idx)
+
+        expected = [name for name, data in janaf.products.items() if set(AIR_ELEMENTS).issuperset(data['elements'])]
+        self.assertEqual([db.products[i] for i in idx], expected)
+        self.assertEqual([db.products[i] for i in db.product_index(['O'])], ['O', 'O2'])
+
+        thermo = species_data.Properties(species_data.janaf, init_elements=AIR_ELEMENTS)
+        self.assertEqual(thermo.products, expected)
+
+    def test_thermo_inp(self):
+        names = ['O', 'CO', 'CO2', 'O2']
+        lines = ['! comment', 'thermo',
+                 '    200.000   1000.000   6000.000  20000.000   9/09/04']
+        for name in names:
+            lines += _inp_species(name, janaf.products[name])
+        # charged and condensed species are left out by default
+        lines += _inp_species('O+', {'coeffs': janaf.products['O']['coeffs'], 'ranges': janaf.products['O']['ranges'],
+                                     'wt': 15.9989, 'elements': OrderedDict([('O', 1), ('E', -1)])})
+        lines += _inp_species('CO2(L)', janaf.products['CO2'], phase=1)
+        lines += ['END PRODUCTS', 'N2   ignored reactant', 'END REACTANTS']
+
+        path = os.path.join(self.tempdir, 'thermo.inp')
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+
+        db = from_thermo_inp(path, element_wts={'C': janaf.element_wts['C']})
+        expected = from_products(OrderedDict((name, janaf.products[name]) for name in names),
+                                 {'C': janaf.element_wts['C'], 'O': janaf.element_wts['O']})
+
+        self.assertEqual(db.products, tuple(names))
+        self.assertEqual(db.elements, ('C', 'O'))
+        self.assertEqual(db.element_wts, expected.element_wts)
+        for name in ('aij', 'wt', 'range_edges', 'num_ranges'):
+            np.testing.assert_array_equal(getattr(db, name), getattr(expected, name))
+        np.testing.assert_allclose(db.coeff_bank, expected.coeff_bank, rtol=1e-9)
+
+        db = from_thermo_inp(path, species=['CO2', 'O2'], element_wts={'C': 12.})
+        self.assertEqual(db.products, ('CO2', 'O2'))
+
+        with self.assertRaises(ValueError) as cm:
+            from_thermo_inp(path, species=['CO'])
+        self.assertEqual(str(cm.exception), "No weight for the elements ['C'], give them in `element_wts`.")
+
+        with self.assertRaises(ValueError) as cm:
+            from_thermo_inp(path, species=['H2O'], element_wts={'C': 12.})
+        self.assertEqual(str(cm.exception), f'Species `H2O` is not in {path}.')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -116,6 +116,9 @@ class ThermoAddTestCase(unittest.TestCase):
         assert_near_equal(p['composition_out'], np.array([0.00031442, 0.00197246, 0.00392781, 0.05243129, 0.01408717]), tolerance=tol)
         assert_near_equal(p['mass_avg_h'], (62.15*10+4.44635*5)/(62.15+4.44635), tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-6, rtol=1.e-6)
+
     def test_mix_2flow(self): 
 
         thermo_spec = species_data.janaf 
@@ -145,6 +148,8 @@ class ThermoAddTestCase(unittest.TestCase):
         # assert_near_equal(p['composition_out'], np.array([0.0003149, 0.00186566, 0.00371394, 0.05251212, 0.01410888]), tolerance=tol)
         assert_near_equal(p['composition_out'], np.array([0.00031442, 0.00197246, 0.00392781, 0.05243129, 0.01408717]), tolerance=tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-6, rtol=1.e-6)
 
     def test_war_vals(self):
         """
@@ -4,6 +4,17 @@ import openmdao.api as om
 
 from pycycle.constants import CEA_AIR_COMPOSITION
 from pycycle.thermo.cea.species_data import Properties, janaf
+from pycycle.thermo.cea.species_db import species_db
+
+
+def _mass_fractions(b0, wt_mole):
+    """
+    Mass fractions of the elements from their moles per unit mass, and their derivatives.
+    """
+    mass = b0 * wt_mole
+    total = np.sum(mass)
+    frac = mass / total
+    return frac, (np.diag(wt_mole) - np.outer(frac, wt_mole)) / total
 
 
 class ThermoAdd(om.ExplicitComponent):
@@ -30,7 +41,7 @@ class ThermoAdd(om.ExplicitComponent):
         Computes the thermo data for the mixed properties according to whatever options are configured
         """
 
-        spec = self.options['spec']
+        db = species_db(self.options['spec'])
 
         inflow_composition = self.options['inflow_composition']
         if inflow_composition is None: 
@@ -47,7 +58,7 @@ class ThermoAdd(om.ExplicitComponent):
         mixed_flow_elements = inflow_composition.copy()
         if mix_mode == "reactant": # get the elements from the reactant dict in the spec
             for reactant in mix_composition: 
-                mixed_flow_elements.update(spec.reactants[reactant]) #adds the fuel elements to the mix outflow
+                mixed_flow_elements.update(db.reactants[reactant]) #adds the fuel elements to the mix outflow
         else: # flow mode 
             for flow_elements in mix_composition: 
                 mixed_flow_elements.update(flow_elements)
@@ -83,13 +94,10 @@ class ThermoAdd(om.ExplicitComponent):
         self.init_fuel_amounts_1kg = {}
 
         if mix_mode == 'reactant': 
+            reactants = species_db(spec).reactants
             for reactant in self.mix_composition: 
-                self.init_fuel_amounts_1kg[reactant] = np.zeros(mixed_thermo.num_element)
-                ifa_1kg = self.init_fuel_amounts_1kg[reactant]
-                for i, e in enumerate(self.mixed_elements): 
-                    ifa_1kg[i] = spec.reactants[reactant].get(e, 0) * spec.element_wts[e]
-
-                ifa_1kg[:] = ifa_1kg/sum(ifa_1kg) # make it 1 kg of fuel
+                ifa_1kg = np.array([reactants[reactant].get(e, 0) for e in self.mixed_elements]) * self.mixed_wt_mole
+                self.init_fuel_amounts_1kg[reactant] = ifa_1kg/sum(ifa_1kg) # make it 1 kg of fuel
 
         else: # flow 
             mix_b0 = {}
@@ -139,9 +147,23 @@ class ThermoAdd(om.ExplicitComponent):
             j = self.mixed_elements.index(e)
             self.in_out_flow_idx_map[j,i] = 1.
 
-        self.declare_partials('*', '*', method='cs')
-        # NOTE: Due to some complexity from python vectorization, 
-        # computing partials manually is tricky and will not be much faster than pure CS
+        self.declare_partials('composition_out', ['Fl_I:stat:W', 'Fl_I:tot:composition'])
+        self.declare_partials('mass_avg_h', ['Fl_I:stat:W', 'Fl_I:tot:h'])
+        if mix_mode == 'reactant':
+            self.declare_partials('Wout', 'Fl_I:stat:W')
+        else:
+            self.declare_partials('Wout', 'Fl_I:stat:W', val=1.)
+
+        for name in mix_names:
+            self.declare_partials('mass_avg_h', f'{name}:h')
+
+            if mix_mode == 'reactant':
+                self.declare_partials(['composition_out', 'mass_avg_h', 'Wout'], f'{name}:ratio')
+                self.declare_partials(f'{name}:W', ['Fl_I:stat:W', f'{name}:ratio'])
+            else:
+                self.declare_partials('composition_out', [f'{name}:W', f'{name}:composition'])
+                self.declare_partials('mass_avg_h', f'{name}:W')
+                self.declare_partials('Wout', f'{name}:W', val=1.)
 
     def compute(self, inputs, outputs):
         W = inputs['Fl_I:stat:W']
@@ -190,3 +212,74 @@ class ThermoAdd(om.ExplicitComponent):
         outputs['mass_avg_h'] = mass_avg_h
         outputs['Wout'] = W_out
 
+    def compute_partials(self, inputs, J):
+        W = inputs['Fl_I:stat:W']
+        h = inputs['Fl_I:tot:h']
+
+        # mass fractions of the incoming flow, in the outflow order
+        in_map = self.in_out_flow_idx_map
+        frac_in, dfrac_in = _mass_fractions(in_map.dot(inputs['Fl_I:tot:composition']), self.mixed_wt_mole)
+        dfrac_in = dfrac_in.dot(in_map)
+
+        # every stream adds its mass fractions times its mass flow to b0_out
+        b0_out = frac_in * W
+        dW = frac_in.copy()
+        W_out = W.copy()
+        W_times_h = h * W
+
+        if self.options['mix_mode'] == 'reactant':
+            for name, reactant in zip(self.mix_names, self.mix_composition):
+                ratio = inputs[f'{name}:ratio']
+                W_mix = W * ratio
+                fuel_1kg = self.init_fuel_amounts_1kg[reactant]
+                b0_out += fuel_1kg * W_mix
+                dW += fuel_1kg * ratio
+                W_out += W_mix
+                W_times_h += inputs[f'{name}:h'] * W_mix
+
+                J[f'{name}:W', 'Fl_I:stat:W'] = ratio
+                J[f'{name}:W', f'{name}:ratio'] = W
+        else:
+            mix_fracs = {}
+            for name in self.mix_names:
+                W_mix = inputs[f'{name}:W']
+                frac, dfrac = _mass_fractions(inputs[f'{name}:composition'], self.mix_wt_mole[name])
+                mix_map = self.mix_out_flow_idx_maps[name]
+                mix_fracs[name] = mix_map.dot(frac), mix_map.dot(dfrac)
+                b0_out += mix_fracs[name][0] * W_mix
+                W_out += W_mix
+                W_times_h += inputs[f'{name}:h'] * W_mix
+
+        # composition_out normalizes b0_out back to 1 kg and converts it to moles
+        sum_b0 = np.sum(b0_out)
+        compo_out = b0_out / sum_b0 / self.mixed_wt_mole
+        dcompo = (np.diag(1. / self.mixed_wt_mole) - np.outer(compo_out, np.ones(len(b0_out)))) / sum_b0
+
+        mass_avg_h = W_times_h / W_out
+
+        J['composition_out', 'Fl_I:stat:W'] = dcompo.dot(dW)
+        J['composition_out', 'Fl_I:tot:composition'] = W * dcompo.dot(dfrac_in)
+        J['mass_avg_h', 'Fl_I:tot:h'] = W / W_out
+
+        if self.options['mix_mode'] == 'reactant':
+            dW_out = 1. + sum(inputs[f'{name}:ratio'] for name in self.mix_names)
+            dW_times_h = h + sum(inputs[f'{name}:h'] * inputs[f'{name}:ratio'] for name in self.mix_names)
+            J['Wout', 'Fl_I:stat:W'] = dW_out
+            J['mass_avg_h', 'Fl_I:stat:W'] = (dW_times_h - mass_avg_h * dW_out) / W_out
+
+            for name, reactant in zip(self.mix_names, self.mix_composition):
+                ratio = inputs[f'{name}:ratio']
+                J['composition_out', f'{name}:ratio'] = W * dcompo.dot(self.init_fuel_amounts_1kg[reactant])
+                J['Wout', f'{name}:ratio'] = W
+                J['mass_avg_h', f'{name}:ratio'] = W * (inputs[f'{name}:h'] - mass_avg_h) / W_out
+                J['mass_avg_h', f'{name}:h'] = W * ratio / W_out
+        else:
+            J['mass_avg_h', 'Fl_I:stat:W'] = (h - mass_avg_h) / W_out
+
+            for name in self.mix_names:
+                W_mix = inputs[f'{name}:W']
+                frac, dfrac = mix_fracs[name]
+                J['composition_out', f'{name}:W'] = dcompo.dot(frac)
+                J['composition_out', f'{name}:composition'] = W_mix * dcompo.dot(dfrac)
+                J['mass_avg_h', f'{name}:W'] = (inputs[f'{name}:h'] - mass_avg_h) / W_out
+                J['mass_avg_h', f'{name}:h'] = W_mix / W_out
@@ -1,63 +1,199 @@
-import numpy as np
-import openmdao.api as om
-import pickle
-
-from pycycle.thermo.cea import chem_eq as cea_thermo
-from pycycle.thermo.tabular import tabular_thermo as tab_thermo
-from pycycle.thermo.tabular import tab_thermo_gen as tab_thermo_gen
-from pycycle.thermo.cea.species_data import janaf
-from pycycle.constants import TAB_AIR_FUEL_COMPOSITION
-
-p = om.Problem()
-p.model = om.Group()
-
-p.model.add_subsystem('tab', tab_thermo.SetTotalTP(thermo_spec='air_jetA.pkl', composition=TAB_AIR_FUEL_COMPOSITION), promotes_inputs=['*'])
-
-p.model.add_subsystem('cea', tab_thermo_gen.TabThermoGenAirFuel(thermo_data=janaf, thermo_method='CEA'), promotes_inputs=['*'])
-
-p.set_solver_print(level=-1)
-p.setup()
+"""
+Accuracy and speed of TABULAR thermo compared to CEA.
 
-p['FAR'] = 0.00
-p['P'] = 101325 #7857143.1 
-p['T'] = 500 #1977.8 
+`compare_points` evaluates both thermo methods over a seeded random envelope of (FAR, P, T)
+points and records the error of the table at every point, along with the time each method
+takes per point. `run_cycle` sets up and runs one model, recording the setup and run times and the
+Newton iteration counts. The cycle models themselves are in `example_cycles/thermo_comparison.py`,
+which also runs the envelope and writes everything to one file.
 
+Results are plain dictionaries, so `write_results` can store them as json and runs can be
+compared release to release.
 
-temp = np.random.rand(10,3)
+Command line usage, for the envelope only:
 
-for i, row in enumerate(temp):
-    p['FAR'] = row[0]*(0.05)
-    p['P'] = row[1]*1e6
-    p['T'] = row[2]*(2500-150)+150
-    print(p['FAR'], p['P'], p['T'])
+    python -m pycycle.thermo.tabular.tab_cea_comparison tab_cea_points.json --num_points 200 --seed 0
+"""
+import json
+import time
+import platform
+import argparse
 
-    p.run_model()
-
-    tab = p.get_val('tab.h')[0]
-    cea = p.get_val('cea.flow:h', units='J/kg')[0]
-    print('h:', abs((tab-cea)/cea))
-
-    tab = p.get_val('tab.S')[0]
-    cea = p.get_val('cea.flow:S', units='J/kg/degK')[0]
-    print('S:', abs((tab-cea)/cea))
-
-    tab = p.get_val('tab.gamma')[0]
-    cea = p.get_val('cea.flow:gamma')[0]
-    print('gamma:', abs((tab-cea)/cea))
-
-    tab = p.get_val('tab.Cp')[0]
-    cea = p.get_val('cea.flow:Cp', units='J/kg/degK')[0]
-    print('Cp:', abs((tab-cea)/cea))
-
-    tab = p.get_val('tab.Cv')[0]
-    cea = p.get_val('cea.flow:Cv', units='J/kg/degK')[0]
-    print('Cv:', abs((tab-cea)/cea))
+import numpy as np
+import openmdao
+import openmdao.api as om
 
-    tab = p.get_val('tab.rho')[0]
-    cea = p.get_val('cea.flow:rho', units='kg/m**3')[0]
-    print('rho:', abs((tab-cea)/cea))
-    
-    tab = p.get_val('tab.R')[0]
-    cea = p.get_val('cea.flow:R', units='J/kg/degK')[0]
-    print('R:', abs((tab-cea)/cea))
-    print()
\ No newline at end of file
+import pycycle
+from pycycle.constants import AIR_JETA_TAB_SPEC, TAB_AIR_FUEL_COMPOSITION
+from pycycle.thermo.tabular.tabular_thermo import SetTotalTP
+from pycycle.thermo.tabular.tab_thermo_gen import compute_row, PROP_UNITS, REFINE_PROPS
+
+
+def envelope_points(num_points, seed=0, FAR=(0., 0.05), P=(1e3, 1e7), T=(200., 2500.)):
+    """
+    Return FAR, P and T arrays of `num_points` random points in the given ranges.
+
+    FAR and T are uniform, P is uniform in log space. The same seed always gives the same points.
+    """
+    rng = np.random.default_rng(seed)
+    FARs = rng.uniform(FAR[0], FAR[1], num_points)
+    Ps = 10**rng.uniform(np.log10(P[0]), np.log10(P[1]), num_points)
+    Ts = rng.uniform(T[0], T[1], num_points)
+    return FARs, Ps, Ts
+
+
+def compare_points(FAR, P, T, spec=AIR_JETA_TAB_SPEC, fuel_type="Jet-A(g)"):
+    """
+    Evaluate CEA and the tabular `spec` at every (FAR, P, T) point, one point at a time.
+
+    The error of h and S is relative to their spread over all the points, because their zeros are
+    arbitrary. Every other property is relative to the CEA value.
+    The times are per point, for a run_model of each method.
+    """
+    FAR, P, T = (np.atleast_1d(np.asarray(x, dtype=float)) for x in (FAR, P, T))
+    names = list(PROP_UNITS)
+
+    cea = np.empty((len(names), len(FAR)))
+    st = time.perf_counter()
+    for i in range(len(FAR)):
+        cea[:, i] = compute_row(FAR[i], P[i], T[i:i+1], fuel_type=fuel_type)[:, 0]
+    cea_time = (time.perf_counter() - st) / len(FAR)
+
+    p = om.Problem()
+    p.model.add_subsystem('tab', SetTotalTP(spec=spec, composition=TAB_AIR_FUEL_COMPOSITION),
+                          promotes=['*'])
+    p.setup(check=False)
+    p.final_setup()
+
+    tab = np.empty_like(cea)
+    st = time.perf_counter()
+    for i in range(len(FAR)):
+        p['composition'] = FAR[i]
+        p.set_val('P', P[i], units='Pa')
+        p.set_val('T', T[i], units='degK')
+        p.run_model()
+        for j, name in enumerate(names):
+            tab[j, i] = p.get_val(name, units=PROP_UNITS[name])[0]
+    tab_time = (time.perf_counter() - st) / len(FAR)
+
+    errors = {}
+    for j, name in enumerate(names):
+        if REFINE_PROPS.get(name) == 'spread':
+            errors[name] = np.abs(tab[j] - cea[j]) / np.ptp(cea[j])
+        else:
+            errors[name] = np.abs((tab[j] - cea[j]) / cea[j])
+
+    points = [{'FAR': FAR[i], 'P': P[i], 'T': T[i],
+               'error': {name: errors[name][i] for name in names}} for i in range(len(FAR))]
+
+    return {'num_points': len(FAR),
+            'max_error': {name: np.max(err) for name, err in errors.items()},
+            'mean_error': {name: np.mean(err) for name, err in errors.items()},
+            'CEA_time_per_point': cea_time,
+            'TABULAR_time_per_point': tab_time,
+            'points': points}
+
+
+def run_cycle(make_problem, setup_values=None, outputs=()):
+    """
+    Set up and run the model from `make_problem()`, which returns an om.Problem that hasn't been set up.
+
+    `setup_values(prob)` sets the inputs and initial guesses after setup. Records the setup time
+    (through final_setup), the run time, the values of `outputs`, and the Newton iterations: the
+    total over every Newton solver in the model, and the count of the top level solver of each
+    group right below the model (the points of an MPCycle). A run that raises an AnalysisError is
+    recorded as not converged, instead of stopping the comparison.
+    """
+    st = time.perf_counter()
+    prob = make_problem()
+    prob.setup(check=False)
+    if setup_values is not None:
+        setup_values(prob)
+    prob.set_solver_print(level=-1)
+    prob.final_setup()
+    setup_time = time.perf_counter() - st
+
+    # count the iterations of every solve, not just the last one
+    total_iters = [0]
+    for system in prob.model.system_iter(recurse=True, include_self=True):
+        solver = system.nonlinear_solver
+        if isinstance(solver, om.NewtonSolver):
+            def _solve(solver=solver, _solve=solver._solve):
+                _solve()
+                total_iters[0] += solver._iter_count
+            solver._solve = _solve
+
+    converged = True
+    st = time.perf_counter()
+    try:
+        prob.run_model()
+    except om.AnalysisError:
+        converged = False
+    run_time = time.perf_counter() - st
+
+    point_iters = {}
+    for system in prob.model.system_iter(recurse=False):
+        if isinstance(system.nonlinear_solver, om.NewtonSolver):
+            point_iters[system.name] = system.nonlinear_solver._iter_count
+
+    return {'converged': converged,
+            'setup_time': setup_time,
+            'run_time': run_time,
+            'newton_iterations': total_iters[0],
+            'point_newton_iterations': point_iters,
+            'outputs': {name: prob.get_val(name).tolist() for name in outputs}}
+
+
+def compare_cycle(make_problem, setup_values=None, outputs=()):
+    """
+    Run `make_problem(thermo_method)` with CEA and with TABULAR thermo through `run_cycle`, and add the
+    relative error of each TABULAR output compared to CEA.
+    """
+    results = {method: run_cycle(lambda: make_problem(method), setup_values, outputs)
+               for method in ('CEA', 'TABULAR')}
+
+    errors = {}
+    for name in outputs:
+        cea = np.asarray(results['CEA']['outputs'][name])
+        tab = np.asarray(results['TABULAR']['outputs'][name])
+        errors[name] = np.max(np.abs((tab - cea) / cea))
+    results['error'] = errors
+
+    return results
+
+
+def _to_json(obj):
+    if isinstance(obj, np.ndarray):
+        return obj.tolist()
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f'{type(obj).__name__} is not JSON serializable')
+
+
+def write_results(path, results):
+    """
+    Write the results to `path` as json, along with the versions they were produced with.
+    """
+    data = {'versions': {'pycycle': pycycle.__version__, 'openmdao': openmdao.__version__,
+                         'numpy': np.__version__, 'python': platform.python_version()}}
+    data.update(results)
+
+    with open(path, 'w') as f:
+        json.dump(data, f, indent=2, default=_to_json)
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Compare TABULAR thermo with CEA over a random envelope of points')
+    parser.add_argument('out_file', help='json file to write the results to')
+    parser.add_argument('--num_points', type=int, default=200, help='number of random points')
+    parser.add_argument('--seed', type=int, default=0, help='seed of the random points')
+    args = parser.parse_args()
+
+    points = compare_points(*envelope_points(args.num_points, seed=args.seed))
+    write_results(args.out_file, {'envelope': dict(points, seed=args.seed)})
+
+    for name, err in points['max_error'].items():
+        print(f'{name:>6}: max error {err:.2e}, mean {points["mean_error"][name]:.2e}')
+    print(f'CEA {points["CEA_time_per_point"]*1e3:.2f} ms, '
+          f'TABULAR {points["TABULAR_time_per_point"]*1e3:.2f} ms per point')
@@ -0,0 +1,232 @@
+import weakref
+
+import numpy as np
+
+import openmdao.api as om
+
+from pycycle.spline_interp import SplineTable, SPLINE_METHODS, spline_coeffs
+
+
+# name, default value, units of each tabulated property
+TAB_PROPS = (('h', 1.0, 'J/kg'),
+             ('S', 1.0, 'J/kg/degK'),
+             ('gamma', 1.4, None),
+             ('Cp', 1.0, 'J/kg/degK'),
+             ('Cv', 1.0, 'J/kg/degK'),
+             ('rho', 1.0, 'kg/m**3'),
+             ('R', 287.0, 'J/kg/degK'))
+
+# for each mode: the suffix of the composition and P axes in the spec, the last grid axis as (input name, spec key, default value, units),
+# and the outputs as (output name, spec key, default value, units)
+TAB_MODES = {'TP': ('', ('T', 'T', 273.0, 'degK'),
+                    tuple((name, name, val, units) for name, val, units in TAB_PROPS)),
+             'hP': ('_inv', ('h', 'h_hP', 1.0, 'J/kg'),
+                    (('T', 'T_hP', 273.0, 'degK'),)),
+             'SP': ('_inv', ('S', 'S_SP', 1.0, 'J/kg/degK'),
+                    (('T', 'T_SP', 273.0, 'degK'),))}
+
+
+# interpolation methods TabularProps can do itself
+TAB_INTERP_METHODS = ('slinear',) + SPLINE_METHODS
+
+
+def _spec_grid(spec, composition, suffix, x_key):
+    sorted_compo = sorted(composition.keys())
+    grid = [np.asarray(spec[param + suffix], dtype=float) for param in sorted_compo]
+    return grid + [np.asarray(spec['P' + suffix], dtype=float), np.asarray(spec[x_key], dtype=float)]
+
+
+class PropertyTable(object):
+    """
+    Multilinear interpolation of a set of properties tabulated on one (composition, P, x) grid.
+
+    Every property is tabulated on the same grid, so the grid cell and the interpolation weights
+    only need to be found once per point. They are applied to a single table with all the
+    properties stacked along its last axis, and the derivatives come from the same weights.
+    The cell and weights of the last point are cached, so the values and the derivatives at the
+    same point don't search the grid twice.
+
+    Outside of the grid the edge cells are extrapolated linearly.
+    """
+
+    def __init__(self, spec, composition, mode='TP'):
+        suffix, self.x_var, self.out_vars = TAB_MODES[mode]
+        self.grid = _spec_grid(spec, composition, suffix, self.x_var[1])
+        ndim = len(self.grid)
+        shape = tuple(len(g) for g in self.grid)
+
+        # (grid points, props), contiguous so each corner of a cell is a single row
+        self.table = np.stack([np.asarray(spec[key], dtype=float).reshape(shape) for _, key, _, _ in self.out_vars],
+                              axis=-1).reshape((-1, len(self.out_vars)))
+
+        # every corner of a cell as 0/1 offsets along each axis, and as an offset into the flat table
+        strides = np.cumprod((shape[1:] + (1,))[::-1])[::-1]
+        self._bits = (np.arange(2**ndim)[:, np.newaxis] >> np.arange(ndim)[::-1]) & 1
+        self._corner_offsets = self._bits.dot(strides)
+        self._strides = strides
+
+        # index of each property in the values
+        self.index = {name: i for i, (name, _, _, _) in enumerate(self.out_vars)}
+
+        self._x = None
+
+    def _interpolate(self, x):
+        """
+        Find the cell and the weights for the point x, and cache the corner values.
+        """
+        if self._x is not None and x.dtype == self._x.dtype and np.array_equal(x, self._x):
+            return
+
+        base = 0
+        t = np.empty(len(x), dtype=x.dtype)
+        inv_h = np.empty(len(x))
+        for d, g in enumerate(self.grid):
+            i = min(max(np.searchsorted(g, x[d].real, side='right') - 1, 0), len(g) - 2)
+            inv_h[d] = 1. / (g[i+1] - g[i])
+            t[d] = (x[d] - g[i]) * inv_h[d]
+            base += i * self._strides[d]
+
+        # weight of each corner along each axis
+        bits = self._bits
+        w_axis = np.where(bits, t, 1. - t)
+        self._weights = np.prod(w_axis, axis=1)
+        self._values = self.table[base + self._corner_offsets]
+        self._w_axis = w_axis
+        self._inv_h = inv_h
+        self._x = x.copy()
+
+    def values(self, x):
+        """
+        Values of every property at the point x = (composition..., P, x), in the order of out_vars.
+        """
+        self._interpolate(x)
+        return self._weights.dot(self._values)
+
+    def derivs(self, x):
+        """
+        Derivatives of every property with respect to each coordinate of x, shaped (len(x), props).
+        """
+        self._interpolate(x)
+
+        bits = self._bits
+        w_axis = self._w_axis
+        ndim = bits.shape[1]
+
+        # d(weight)/dx_d is the product of the weights along every other axis times +-1/h_d
+        dw = np.empty((ndim, len(bits)), dtype=w_axis.dtype)
+        for d in range(ndim):
+            others = np.prod(np.delete(w_axis, d, axis=1), axis=1)
+            dw[d] = np.where(bits[:, d], others, -others) * self._inv_h[d]
+        return dw.dot(self._values)
+
+
+# spline coefficients computed for specs that don't carry them, so they're only computed once per
+# table. They're found by the id of the table they came from, and dropped when it's garbage collected.
+# A table that gets replaced in its spec gets new ones.
+_SPLINE_COEFFS = {}
+
+
+def _spec_spline_coeffs(spec, grid, key, method):
+    coeffs = spec.get(f'{key}_{method}')
+    if coeffs is not None:
+        return coeffs
+
+    table = spec[key]
+    cache_key = (id(table), method)
+    cached = _SPLINE_COEFFS.get(cache_key)
+    if cached is not None and len(cached[0]) == len(grid) and \
+            all(np.array_equal(g, cached_g) for g, cached_g in zip(grid, cached[0])):
+        return cached[1]
+
+    coeffs = spline_coeffs(grid, table, method)
+    if cached is None:
+        try:
+            weakref.finalize(table, _SPLINE_COEFFS.pop, cache_key, None)
+        except TypeError:
+            # not an array, so nothing to tie them to
+            return coeffs
+    _SPLINE_COEFFS[cache_key] = (grid, coeffs)
+    return coeffs
+
+
+class SplinePropertyTable(SplineTable):
+    """
+    PropertyTable with tensor product cubic spline interpolation instead of multilinear.
+
+    Uses the spline coefficients saved in the spec (as '<key>_cubic', see tab_spec.add_spline_coeffs)
+    when it has them, and computes them otherwise, once per table.
+    """
+
+    def __init__(self, spec, composition, mode='TP', method='cubic'):
+        suffix, self.x_var, self.out_vars = TAB_MODES[mode]
+        grid = _spec_grid(spec, composition, suffix, self.x_var[1])
+        shape = tuple(len(g) for g in grid)
+
+        tables = [np.asarray(spec[key], dtype=float).reshape(shape) for _, key, _, _ in self.out_vars]
+        coeffs = [_spec_spline_coeffs(spec, grid, key, method) for _, key, _, _ in self.out_vars]
+        super().__init__(grid, tables, coeffs, method)
+
+        self.index = {name: i for i, (name, _, _, _) in enumerate(self.out_vars)}
+
+
+def property_table(spec, composition, mode='TP', interp_method='slinear'):
+    """
+    PropertyTable or SplinePropertyTable, depending on the interpolation method.
+    """
+    if interp_method == 'slinear':
+        return PropertyTable(spec, composition, mode=mode)
+    return SplinePropertyTable(spec, composition, mode=mode, method=interp_method)
+
+
+class TabularProps(om.ExplicitComponent):
+    """
+    Multilinear interpolation of all the tabular thermo properties at once, through a `PropertyTable`.
+
+    Gives the same results as MetaModelStructuredComp with method='slinear' and extrapolate=True,
+    including the linear extrapolation from the edge cells outside of the grid. With
+    interp_method='cubic' it matches method='cubic' instead, from precomputed spline coefficients.
+
+    In 'hP' and 'SP' mode it interpolates the inverse tables of the spec instead, giving T from h or S.
+    """
+
+    def initialize(self):
+        self.options.declare('spec', recordable=False)
+        self.options.declare('composition')
+        self.options.declare('mode', default='TP', values=tuple(TAB_MODES),
+                             desc='TP gives all the properties, hP and SP give T from the inverse tables')
+        self.options.declare('interp_method', default='slinear', values=TAB_INTERP_METHODS)
+
+    def setup(self):
+        composition = self.options['composition']
+        self._table = property_table(self.options['spec'], composition, mode=self.options['mode'],
+                                     interp_method=self.options['interp_method'])
+        x_name, _, x_val, x_units = self._table.x_var
+
+        sorted_compo = sorted(composition.keys())
+        self.add_input('composition', val=[composition[k] for k in sorted_compo])
+        self.add_input('P', 101325.0, units='Pa')
+        self.add_input(x_name, x_val, units=x_units)
+
+        for name, _, val, units in self._table.out_vars:
+            self.add_output(name, val, units=units)
+
+        self.declare_partials('*', '*')
+
+    def _point(self, inputs):
+        return np.concatenate((inputs['composition'], inputs['P'], inputs[self._table.x_var[0]]))
+
+    def compute(self, inputs, outputs):
+        result = self._table.values(self._point(inputs))
+
+        for i, (name, _, _, _) in enumerate(self._table.out_vars):
+            outputs[name] = result[i]
+
+    def compute_partials(self, inputs, J):
+        dresult = self._table.derivs(self._point(inputs))
+        ncomp = len(inputs['composition'])
+
+        x_name = self._table.x_var[0]
+        for i, (name, _, _, _) in enumerate(self._table.out_vars):
+            J[name, 'composition'] = dresult[:ncomp, i]
+            J[name, 'P'] = dresult[ncomp, i]
+            J[name, x_name] = dresult[ncomp+1, i]
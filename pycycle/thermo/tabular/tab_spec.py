@@ -0,0 +1,220 @@
+"""
+Storage for tabular thermo data.
+
+A spec maps the grid axes ('FAR', 'P', 'T', plus 'WAR' for wet air) and the property tables
+('h', 'S', 'gamma', ...) to arrays. The preferred format is a directory with one .npy file per
+array, which gets loaded memory mapped so every process using the same table shares its pages.
+.npz files (compressed or not) and the legacy pickled dictionaries can also be loaded, but both
+are read into memory.
+
+A spec can also carry inverse tables, T(composition, P, h) as 'T_hP' on the 'h_hP' axis and
+T(composition, P, S) as 'T_SP' on the 'S_SP' axis, both on finer composition and P axes
+('FAR_inv', 'P_inv', ...). When they are there, TABULAR total_hP and
+total_SP look up T directly instead of converging a balance on it.
+
+It can carry the cubic spline coefficients of the property tables too, as '<prop>_cubic', so a
+TABULAR interp_method='cubic' doesn't have to compute them.
+"""
+import os
+import pickle
+import argparse
+from collections.abc import Mapping
+
+import numpy as np
+
+from pycycle.spline_interp import spline_coeffs
+
+
+def save_spec(spec, path):
+    """
+    Write a spec to `path` as a directory of .npy files, one per array.
+
+    A `path` ending in .npz gets a single compressed file instead, which is smaller to ship but
+    can't be memory mapped.
+    """
+    if path.endswith('.npz'):
+        np.savez_compressed(path, **{name: np.asarray(val) for name, val in spec.items()})
+        return
+
+    os.makedirs(path, exist_ok=True)
+    for name, val in spec.items():
+        np.save(os.path.join(path, f'{name}.npy'), np.asarray(val))
+
+
+def load_spec(path, mmap=True):
+    """
+    Load a spec from a directory of .npy files, a .npz file or a pickle.
+
+    The .npy arrays are memory mapped (read only) unless `mmap` is False.
+    """
+    if os.path.isdir(path):
+        mmap_mode = 'r' if mmap else None
+        return {name[:-4]: np.load(os.path.join(path, name), mmap_mode=mmap_mode)
+                for name in sorted(os.listdir(path)) if name.endswith('.npy')}
+
+    if path.endswith('.npz'):
+        with np.load(path) as data:
+            return {name: data[name] for name in data.files}
+
+    with open(path, 'rb') as spec_data:
+        return pickle.load(spec_data)
+
+
+# the property tables of a spec
+PROPS = ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R')
+
+# inverse table: (property it inverts, name of the T table, name of the property axis)
+INVERSE_TABLES = (('h', 'T_hP', 'h_hP'),
+                  ('S', 'T_SP', 'S_SP'))
+
+
+def _refine(axis, refine):
+    """
+    `axis` with every interval split into `refine` equal intervals, and the linear interpolation
+    (lower index, weight) of each refined point on the original axis.
+    """
+    frac = np.arange(refine) / refine
+    fine = np.append((axis[:-1, np.newaxis] + frac*np.diff(axis)[:, np.newaxis]).ravel(), axis[-1])
+    i = np.minimum(np.searchsorted(axis, fine, side='right') - 1, len(axis) - 2)
+    return fine, i, (fine - axis[i]) / (axis[i+1] - axis[i])
+
+
+def _compo_names(spec):
+    """
+    Names of the composition axes of the forward tables, sorted.
+    """
+    inv_names = {'P_inv'}.union(*((T_name, axis_name) for _, T_name, axis_name in INVERSE_TABLES))
+    return sorted(name for name in spec if np.ndim(spec[name]) == 1 and name not in ('P', 'T')
+                  and name not in inv_names and not name.endswith('_inv'))
+
+
+def add_inverse_tables(spec, num=None, refine=2):
+    """
+    Return a copy of `spec` with the inverse tables T(composition, P, h) and T(composition, P, S) added.
+
+    Each (composition, P) row of the h and S tables is inverted exactly as the linear interpolation in T
+    sees it, including the linear extrapolation past the ends of the T grid. The inverse axes are evenly
+    spaced over the whole range of each property, with `num` points (4 times the T grid by default).
+
+    T at constant h or S is far from linear in P or the composition, so the inverse tables get their own
+    finer composition and P axes (named with an '_inv' suffix), with `refine` intervals for every interval
+    of the original ones. The extra rows are linear interpolations of the forward tables, just like the
+    forward lookup does it. Outside the composition and P ranges of the table the inverse lookup
+    extrapolates T, not h or S, so it won't agree with the balance on the forward table there.
+    """
+    T = np.asarray(spec['T'])
+    if num is None:
+        num = 4*len(T)
+
+    compo_names = _compo_names(spec)
+
+    inv_spec = dict(spec)
+    tables = {prop: np.asarray(spec[prop]) for prop, _, _ in INVERSE_TABLES}
+    for d, name in enumerate(compo_names + ['P']):
+        fine, i, t = _refine(np.asarray(spec[name]), refine)
+        inv_spec[f'{name}_inv'] = fine
+        # broadcast the weights along axis d
+        t = t.reshape((-1,) + (1,)*(len(compo_names) + 1 - d))
+        for prop, table in tables.items():
+            lo = np.take(table, i, axis=d)
+            hi = np.take(table, i+1, axis=d)
+            tables[prop] = lo*(1. - t) + hi*t
+
+    for prop, T_name, axis_name in INVERSE_TABLES:
+        table = tables[prop]
+        rows = table.reshape((-1, len(T)))
+        if np.any(np.diff(rows, axis=1) <= 0.):
+            raise ValueError(f"Can't invert '{prop}', it must increase with 'T' everywhere in the table.")
+
+        axis = np.linspace(rows.min(), rows.max(), num)
+        T_inv = np.empty((len(rows), num))
+        for r, row in enumerate(rows):
+            i = np.clip(np.searchsorted(row, axis, side='right') - 1, 0, len(T) - 2)
+            T_inv[r] = T[i] + (axis - row[i]) * (T[i+1] - T[i]) / (row[i+1] - row[i])
+
+        inv_spec[axis_name] = axis
+        inv_spec[T_name] = T_inv.reshape(table.shape[:-1] + (num,))
+
+    return inv_spec
+
+
+def add_spline_coeffs(spec, method='cubic'):
+    """
+    Return a copy of `spec` with the spline coefficients of each property table added, as '<prop>_<method>'.
+
+    They're shaped (2**ndim,) + the table shape, see pycycle.spline_interp.spline_coeffs.
+    """
+    grid = [spec[name] for name in _compo_names(spec)] + [spec['P'], spec['T']]
+    shape = tuple(len(g) for g in grid)
+
+    spline_spec = dict(spec)
+    for prop in PROPS:
+        if prop in spec:
+            spline_spec[f'{prop}_{method}'] = spline_coeffs(grid, np.asarray(spec[prop]).reshape(shape), method)
+    return spline_spec
+
+
+class LazySpec(Mapping):
+    """
+    A spec that isn't loaded until one of its arrays is needed.
+
+    Takes a list of candidate paths, and loads the first one that exists. This lets the
+    array-native format take precedence over a legacy pickle of the same data.
+    """
+
+    def __init__(self, *paths, mmap=True):
+        self.paths = paths
+        self.mmap = mmap
+        self._spec = None
+
+    @property
+    def loaded(self):
+        return self._spec is not None
+
+    def _load(self):
+        if self._spec is None:
+            for path in self.paths:
+                if os.path.exists(path):
+                    self._spec = load_spec(path, mmap=self.mmap)
+                    break
+            else:
+                raise FileNotFoundError(f'Could not find tabular thermo data in any of {self.paths}')
+        return self._spec
+
+    def __getitem__(self, key):
+        return self._load()[key]
+
+    def __iter__(self):
+        return iter(self._load())
+
+    def __len__(self):
+        return len(self._load())
+
+    def __repr__(self):
+        state = 'loaded' if self.loaded else 'not loaded'
+        return f'LazySpec({", ".join(repr(p) for p in self.paths)}, {state})'
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Convert a pickled tabular thermo spec to a directory of .npy files')
+    parser.add_argument('pickle_file', help='legacy pickled spec, or a spec in any other format load_spec reads')
+    parser.add_argument('out_dir', nargs='?', default=None,
+                        help='directory to write the .npy files to, or a compressed .npz file. '
+                             'Defaults to the pickle file name without the extension')
+    parser.add_argument('--inverse', action='store_true',
+                        help='also write the inverse tables used by TABULAR total_hP and total_SP')
+    parser.add_argument('--spline', action='store_true',
+                        help="also write the spline coefficients used by TABULAR interp_method='cubic'")
+    args = parser.parse_args()
+
+    out_dir = args.out_dir
+    if out_dir is None:
+        out_dir = os.path.splitext(args.pickle_file)[0]
+
+    spec = load_spec(args.pickle_file)
+    if args.inverse:
+        spec = add_inverse_tables(spec)
+    if args.spline:
+        spec = add_spline_coeffs(spec)
+    save_spec(spec, out_dir)
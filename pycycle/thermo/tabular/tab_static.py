@@ -0,0 +1,343 @@
+import numpy as np
+
+import openmdao.api as om
+
+from pycycle.thermo.tabular.tab_props import property_table, TAB_INTERP_METHODS
+
+
+class TabularStatic(om.ExplicitComponent):
+    """
+    Static temperature and pressure from the tabular properties, with the Newton iterations done
+    inside the component instead of by a balance and PsResid under a Newton solver.
+
+    The static state has the total entropy and satisfies ht = hs + V**2/2, where V comes from the
+    Mach number in 'MN' mode and from the area in 'area' mode. The two residuals and their
+    derivatives with respect to (Ps, Ts) come straight from the table interpolation (multilinear or
+    cubic spline, the same as the properties), so the 2x2 Newton converges in a handful of
+    lookups. In 'Ps' mode only Ts is solved, from the entropy.
+
+    The partials come from the implicit function theorem on the converged residuals, so the
+    component looks explicit to the rest of the model.
+    """
+
+    def initialize(self):
+        self.options.declare('spec', recordable=False)
+        self.options.declare('composition')
+        self.options.declare('mode', values=('MN', 'area', 'Ps'))
+        self.options.declare('interp_method', default='slinear', values=TAB_INTERP_METHODS)
+        self.options.declare('maxiter', default=50, desc='maximum number of Newton iterations')
+        self.options.declare('tol', default=1e-10, desc='tolerance on the scaled residuals')
+
+    def setup(self):
+        composition = self.options['composition']
+        mode = self.options['mode']
+
+        self._table = property_table(self.options['spec'], composition,
+                                     interp_method=self.options['interp_method'])
+
+        sorted_compo = sorted(composition.keys())
+        self.add_input('composition', val=[composition[k] for k in sorted_compo])
+        self.add_input('S', val=1., units='J/kg/degK', desc='entropy')
+
+        self.add_output('T', val=500., units='degK', desc='static temperature')
+
+        if mode == 'Ps':
+            # MN, V, Vsonic and area are explicit once Ts is known, so PsCalc takes care of them
+            self.add_input('Ps', val=1e5, units='Pa', desc='static pressure')
+            self._wrt = ('composition', 'S', 'Ps')
+            self.declare_partials('T', self._wrt)
+
+        else:
+            self.add_input('ht', val=1., units='J/kg', desc='total enthalpy reference condition')
+            self.add_input('W', val=1., units='kg/s', desc='mass flow rate')
+
+            # only used for the starting point
+            self.add_input('guess:gamt', val=1.4, desc='gamma computed from set total')
+            self.add_input('guess:Pt', val=1.0, units='bar', desc='total pressure')
+
+            # bar, like PsResid, so the Ps residuals seen by an outer Newton are on the same scale
+            self.add_output('Ps', val=1., units='bar', desc='static pressure')
+            self.add_output('V', val=100., units='m/s', desc='velocity')
+            self.add_output('Vsonic', val=330., units='m/s', desc='speed of sound')
+
+            if mode == 'MN':
+                self.add_input('MN', val=.5, desc='Mach number')
+                self.add_output('area', val=1., units='m**2', desc='flow area')
+                self._wrt = ('composition', 'S', 'ht', 'W', 'MN')
+            else:
+                self.add_input('guess:MN', val=0.5, desc='guess for Mach number')
+                self.add_input('area', val=np.inf, units='m**2', desc='flow area')
+                self.add_output('MN', val=.5, desc='Mach number')
+                self._wrt = ('composition', 'S', 'ht', 'W', 'area')
+
+            self.declare_partials(('T', 'Ps', 'V', 'Vsonic', 'area' if mode == 'MN' else 'MN'), self._wrt)
+
+        self._guess_cache = None
+        self._solution = None
+        self._choked = False
+        self._last = None
+
+    def _state(self, inputs, P, T, choked=False):
+        """
+        Residuals at (P, T) and the quantities their derivatives are built from.
+
+        The derivatives are with respect to x = (composition..., P, T) and with respect to the
+        scalar inputs other than the composition, in the order of self._wrt.
+        With `choked`, the area mode residuals are those of the sonic state instead.
+        """
+        mode = self.options['mode']
+        idx = self._table.index
+
+        x = np.concatenate((inputs['composition'], np.atleast_1d(P), np.atleast_1d(T)))
+        vals = self._table.values(x)
+        dvals = self._table.derivs(x)
+        ndim = len(x)
+
+        s = {'x': x}
+        for name in ('h', 'S', 'gamma', 'R', 'rho', 'Cp'):
+            s[name] = vals[idx[name]]
+            s['d' + name] = dvals[:, idx[name]]
+
+        # scalar inputs after the composition
+        nz = len(self._wrt) - 1
+
+        dr1_dz = np.zeros(nz, dtype=x.dtype)
+        dr1_dz[0] = -1.
+        r1 = s['S'] - inputs['S'][0]
+
+        if mode == 'Ps':
+            s['r'] = np.array([r1])
+            s['dr_dx'] = s['dS'][np.newaxis, :]
+            s['dr_dz'] = dr1_dz[np.newaxis, :]
+            return s
+
+        eT = np.zeros(ndim)
+        eT[-1] = 1.
+        s['a2'] = a2 = s['gamma'] * s['R'] * T
+        s['da2'] = s['dgamma'] * s['R'] * T + s['gamma'] * s['dR'] * T + s['gamma'] * s['R'] * eT
+
+        W = inputs['W'][0]
+        dr2_dz = np.zeros(nz, dtype=x.dtype)
+        dr2_dz[1] = -1.
+        if mode == 'MN' or choked:
+            MN = inputs['MN'][0] if mode == 'MN' else 1.
+            r2 = s['h'] + .5 * MN**2 * a2 - inputs['ht'][0]
+            dr2_dx = s['dh'] + .5 * MN**2 * s['da2']
+            if mode == 'MN':
+                dr2_dz[3] = MN * a2
+        else:
+            area = inputs['area'][0]
+            if np.isinf(area.real):
+                s['V'] = V = 0. * W
+                s['dV_dx'] = np.zeros(ndim, dtype=x.dtype)
+                s['dV_dz'] = np.zeros(nz, dtype=x.dtype)
+            else:
+                s['V'] = V = W / (s['rho'] * area)
+                s['dV_dx'] = -V * s['drho'] / s['rho']
+                s['dV_dz'] = np.zeros(nz, dtype=x.dtype)
+                s['dV_dz'][2] = 1. / (s['rho'] * area)
+                s['dV_dz'][3] = -V / area
+            r2 = s['h'] + .5 * V**2 - inputs['ht'][0]
+            dr2_dx = s['dh'] + V * s['dV_dx']
+            dr2_dz += V * s['dV_dz']
+
+        s['r'] = np.array([r1, r2])
+        s['dr_dx'] = np.array([s['dS'], dr2_dx])
+        s['dr_dz'] = np.array([dr1_dz, dr2_dz])
+        return s
+
+    def _scaled_norm(self, s):
+        # S is scaled by Cp and h by Cp*T, so the tolerance is relative for both
+        scale = np.array([1., s['x'][-1].real])[:len(s['r'])] * s['Cp'].real
+        return np.max(np.abs(s['r'].real) / scale)
+
+    def _solve(self, inputs):
+        """
+        (P, T) and the state there. The same inputs always give back the same solution, so
+        compute_partials and repeated evaluations don't re-solve and land on different round-off.
+        """
+        x_in = inputs.asarray()
+        if self._last is not None and x_in.dtype == self._last[0].dtype and np.array_equal(x_in, self._last[0]):
+            self._choked = self._last[2]
+            return self._last[1]
+
+        result = self._iterate(inputs)
+        self._last = (x_in.copy(), result, self._choked)
+        return result
+
+    def _iterate(self, inputs):
+        mode = self.options['mode']
+        maxiter = self.options['maxiter']
+        tol = self.options['tol']
+        dtype = complex if np.iscomplexobj(inputs['composition']) or np.iscomplexobj(inputs['S']) else float
+
+        if mode == 'Ps':
+            P = inputs['Ps'][0]
+            T = self._solution[1] if self._solution is not None else 500.
+        else:
+            # isentropic guess, only re-applied when it changes, so the last solution is the
+            # starting point otherwise (same as PsResid)
+            gamt = inputs['guess:gamt'][0]
+            MN = inputs['MN'][0] if mode == 'MN' else inputs['guess:MN'][0]
+            P_guess = 1e5 * inputs['guess:Pt'][0] * (1 + (gamt - 1) / 2 * MN**2)**(-gamt / (gamt - 1))
+            if self._solution is None or self._guess_cache is None \
+                    or np.abs(P_guess - self._guess_cache) > 1e-10 * np.abs(P_guess):
+                self._guess_cache = P_guess
+                P = P_guess
+                T = self._solution[1] if self._solution is not None else 500.
+                T = self._solve_T(inputs, P, T, tol, maxiter)
+            else:
+                P, T = self._solution
+
+        P = np.asarray(P, dtype=dtype) + 0.
+        T = np.asarray(T, dtype=dtype) + 0.
+
+        self._choked = False
+
+        if mode == 'Ps':
+            T = self._solve_T(inputs, P, T, tol, maxiter)
+            s = self._state(inputs, P, T)
+            self._solution = (P.real, T.real)
+            return P, T, s
+
+        converged, P_new, T_new, s = self._newton(inputs, P, T, tol, maxiter)
+
+        if not converged and mode == 'area':
+            # the flow doesn't fit through the area at any Mach number, so this is the choked
+            # (sonic) state, where the subsonic and supersonic solutions meet
+            self._choked = True
+            P = 1e5 * inputs['guess:Pt'][0] * ((gamt + 1) / 2)**(-gamt / (gamt - 1)) + 0. * P
+            converged, P_new, T_new, s = self._newton(inputs, P, T, tol, maxiter, choked=True)
+            if converged:
+                return P_new, T_new, s
+
+        if not converged:
+            raise om.AnalysisError(f'{self.pathname}: static state did not converge in {maxiter} iterations, '
+                                   f'Ps={P_new.real}, Ts={T_new.real}')
+
+        self._solution = (P_new.real, T_new.real)
+        return P_new, T_new, s
+
+    def _newton(self, inputs, P, T, tol, maxiter, choked=False):
+        """
+        Newton iterations on (P, T) from the given starting point.
+        """
+        converged = False
+        for it in range(maxiter):
+            s = self._state(inputs, P, T, choked)
+            dP, dT = -np.linalg.solve(s['dr_dx'][:, -2:], s['r'])
+
+            if self._scaled_norm(s) < tol:
+                # one more step takes the residuals to round-off, and converges the imaginary
+                # part too when complex stepping
+                P = P + dP
+                T = T + dT
+                s = self._state(inputs, P, T, choked)
+                converged = True
+                break
+
+            alpha = min(1., .5 * np.abs(P.real / dP.real) if dP.real else 1.,
+                        .5 * np.abs(T.real / dT.real) if dT.real else 1.)
+            P = P + alpha * dP
+            T = T + alpha * dT
+
+        return converged, P, T, s
+
+    def _solve_T(self, inputs, P, T, tol, maxiter):
+        """
+        T with the given entropy at pressure P.
+        """
+        converged = False
+        for it in range(maxiter):
+            s = self._state(inputs, P, T)
+            r1 = s['S'] - inputs['S'][0]
+            dT = -r1 / s['dS'][-1]
+
+            if np.abs(r1.real) < tol * s['Cp'].real:
+                T = T + dT
+                converged = True
+                break
+
+            alpha = min(1., .5 * np.abs(T.real / dT.real)) if dT.real else 1.
+            T = T + alpha * dT
+
+        if not converged:
+            raise om.AnalysisError(f'{self.pathname}: static temperature did not converge in {maxiter} iterations, '
+                                   f'Ps={np.real(P)}, Ts={np.real(T)}')
+        return T
+
+    def _velocity_outputs(self, inputs, P, T, s):
+        """
+        V, Vsonic and area or MN, with their derivatives with respect to x and to the scalar inputs.
+        """
+        mode = self.options['mode']
+        nz = len(self._wrt) - 1
+
+        Vsonic = np.sqrt(s['a2'])
+        dVsonic = s['da2'] / (2 * Vsonic)
+        out = {'Vsonic': (Vsonic, dVsonic, np.zeros(nz))}
+
+        W = inputs['W'][0]
+        if mode == 'MN':
+            MN = inputs['MN'][0]
+            V = MN * Vsonic
+            dV_dz = np.zeros(nz, dtype=dVsonic.dtype)
+            dV_dz[3] = Vsonic
+            out['V'] = (V, MN * dVsonic, dV_dz)
+
+            if MN.real < 1e-16:
+                out['area'] = (np.inf, np.zeros_like(dVsonic), np.zeros(nz))
+            else:
+                area = W / (s['rho'] * V)
+                dA_dz = -area / V * dV_dz
+                dA_dz[2] = 1. / (s['rho'] * V)
+                out['area'] = (area, -area * (s['drho'] / s['rho'] + MN * dVsonic / V), dA_dz)
+        elif self._choked:
+            out['V'] = (Vsonic, dVsonic, np.zeros(nz))
+            out['MN'] = (1. + 0. * Vsonic, np.zeros_like(dVsonic), np.zeros(nz))
+        else:
+            V = s['V']
+            out['V'] = (V, s['dV_dx'], s['dV_dz'])
+            out['MN'] = (V / Vsonic, s['dV_dx'] / Vsonic - V / Vsonic**2 * dVsonic, s['dV_dz'] / Vsonic)
+
+        return out
+
+    def compute(self, inputs, outputs):
+        P, T, s = self._solve(inputs)
+
+        outputs['T'] = T
+        if self.options['mode'] == 'Ps':
+            return
+
+        outputs['Ps'] = P * 1e-5
+        for name, (val, _, _) in self._velocity_outputs(inputs, P, T, s).items():
+            outputs[name] = val
+
+    def compute_partials(self, inputs, J):
+        mode = self.options['mode']
+        ncomp = len(inputs['composition'])
+
+        P, T, s = self._solve(inputs)
+
+        # d(unknowns)/d(inputs) from dr/du du/dz + dr/dz = 0
+        dr_dz = np.hstack((s['dr_dx'][:, :ncomp], s['dr_dz']))
+        if mode == 'Ps':
+            du_dz = -dr_dz / s['dr_dx'][0, -1]
+            dT_dz = du_dz[0]
+            # Ps is an axis of x rather than an unknown
+            dT_dz[-1] = -s['dr_dx'][0, -2] / s['dr_dx'][0, -1]
+            self._set_partials(J, 'T', dT_dz, ncomp)
+            return
+
+        du_dz = -np.linalg.solve(s['dr_dx'][:, -2:], dr_dz)
+        self._set_partials(J, 'Ps', du_dz[0] * 1e-5, ncomp)
+        self._set_partials(J, 'T', du_dz[1], ncomp)
+
+        for name, (_, dg_dx, dg_dz) in self._velocity_outputs(inputs, P, T, s).items():
+            total = np.concatenate((dg_dx[:ncomp], dg_dz)) + dg_dx[-2:].dot(du_dz)
+            self._set_partials(J, name, total, ncomp)
+
+    def _set_partials(self, J, of, deriv, ncomp):
+        J[of, 'composition'] = deriv[:ncomp]
+        for i, wrt in enumerate(self._wrt[1:]):
+            J[of, wrt] = deriv[ncomp + i]
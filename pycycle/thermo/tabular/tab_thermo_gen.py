@@ -0,0 +1,414 @@
+"""
+Generates tabular thermo data from CEA.
+
+The grid is split into (FAR, P) rows, or (FAR, WAR, P) rows for wet air, each of which solves
+the whole T axis at once with a vectorized CEA equilibrium. Rows are spread over a process pool
+and every finished row is written to disk right away, so an interrupted run picks up where it left
+off when started again with the same output directory. The finished table is written as a directory of .npy files
+(see `pycycle.thermo.tabular.tab_spec`).
+
+Command line usage, for the same grid as the default table:
+
+    python -m pycycle.thermo.tabular.tab_thermo_gen air_jetA --FAR 0 0.05 20 --P 1 1e7 110 --T 100 3500 100
+
+Wet air tables get a WAR axis as well:
+
+    python -m pycycle.thermo.tabular.tab_thermo_gen air_jetA_wet --FAR 0 0.05 11 --WAR 0 0.04 5 \
+        --P 1e3 1e7 81 --T 150 2500 64 --logT
+
+That is how the shipped wet table was made. Entropy goes with log(P) and roughly log(T), so
+both axes are log spaced to keep the interpolation error even across the table.
+
+With --tol, the axes are only a starting point. They get refined where linear interpolation misses
+CEA by more than the given relative error, see `refine_grid`:
+
+    python -m pycycle.thermo.tabular.tab_thermo_gen air_jetA --FAR 0 0.05 3 --P 1 1e7 8 --T 100 3500 10 --tol 1e-3
+"""
+import os
+import time
+import shutil
+import argparse
+import multiprocessing
+
+import numpy as np
+import openmdao.api as om
+
+from pycycle.constants import CEA_AIR_COMPOSITION, CEA_AIR_FUEL_COMPOSITION
+from pycycle.thermo.cea.chem_eq import SetTotalTP
+from pycycle.thermo.cea.thermo_add import ThermoAdd
+from pycycle.thermo.cea.species_data import janaf, wet_air
+from pycycle.thermo.tabular.tab_props import TAB_PROPS
+from pycycle.thermo.tabular.tab_spec import save_spec, add_inverse_tables
+
+
+# units each property is stored in
+PROP_UNITS = {name: units for name, _, units in TAB_PROPS}
+
+# properties refine_grid controls the error of. h and S have arbitrary zeros, so their errors are
+# relative to the spread of the property over the table instead of to the local value.
+REFINE_PROPS = {'h': 'spread', 'S': 'spread', 'gamma': 'value', 'Cp': 'value'}
+
+
+class TabThermoGenRow(om.Group):
+    """
+    Equilibrium properties for a whole T axis at one composition and P.
+    """
+
+    def initialize(self):
+        self.options.declare('num_T', types=int,
+                             desc='number of temperatures solved at once')
+        self.options.declare('fuel_type', default="Jet-A(g)",
+                             desc='Type of fuel. None for pure air')
+        self.options.declare('wet', default=False, types=bool,
+                             desc='If True, water is mixed into the air at the ratio given by the WAR input')
+        self.options.declare('eq_solver', default='reduced', values=('newton', 'reduced'),
+                             desc='Method used to converge the chemical equilibrium. See `ChemEq`')
+
+    def setup(self):
+        num_T = self.options['num_T']
+        fuel_type = self.options['fuel_type']
+        wet = self.options['wet']
+
+        # both ratios are relative to the dry air, like the composition of the tabular thermo
+        reactants = []
+        if fuel_type is not None:
+            reactants.append(('FAR', fuel_type))
+        if wet:
+            reactants.append(('WAR', 'Water'))
+
+        if not reactants:
+            eq = SetTotalTP(spec=janaf, composition=CEA_AIR_COMPOSITION,
+                            eq_solver=self.options['eq_solver'], vec_size=num_T)
+            self.add_subsystem('eq', eq, promotes_inputs=['T', 'P'])
+        else:
+            names = tuple(name for name, _ in reactants)
+            mix = ThermoAdd(spec=wet_air, inflow_composition=CEA_AIR_COMPOSITION,
+                            mix_composition=tuple(reactant for _, reactant in reactants), mix_names=names)
+            self.add_subsystem('mix', mix, promotes_inputs=[(f'{name}:ratio', name) for name in names])
+
+            eq = SetTotalTP(spec=wet_air, composition=CEA_AIR_FUEL_COMPOSITION,
+                            eq_solver=self.options['eq_solver'], vec_size=num_T)
+            self.add_subsystem('eq', eq, promotes_inputs=['T', 'P'])
+
+            # the same mixture at every temperature
+            src_indices = np.arange(len(CEA_AIR_FUEL_COMPOSITION))
+            if num_T > 1:
+                src_indices = np.tile(src_indices, (num_T, 1))
+            self.connect('mix.composition_out', 'eq.composition', src_indices=src_indices, flat_src_indices=True)
+
+            self.set_input_defaults('mix.Fl_I:stat:W', 1.0, units='kg/s')
+            for name in names:
+                self.set_input_defaults(name, 0.02)
+
+        self.set_input_defaults('T', np.full(num_T, 273.15), units='degK')
+        self.set_input_defaults('P', np.full(num_T, 101325.), units='Pa')
+
+
+# one problem per process and kind of row, reused for every row that process computes
+_problems = {}
+
+
+def _row_problem(num_T, fuel_type, wet, eq_solver):
+    key = (num_T, fuel_type, wet, eq_solver)
+    if key not in _problems:
+        p = om.Problem(TabThermoGenRow(num_T=num_T, fuel_type=fuel_type, wet=wet, eq_solver=eq_solver))
+        p.setup(check=False)
+        p.set_solver_print(level=-1)
+        _problems[key] = p
+    return _problems[key]
+
+
+def compute_row(FAR, P, T, fuel_type="Jet-A(g)", eq_solver='reduced', WAR=0.):
+    """
+    Return the properties along the T axis at one FAR, WAR and P, as a (num props, len(T)) array
+    in the order of TAB_PROPS.
+    """
+    # pure dry air uses the smaller species set, like the original tables. Once there is water, the
+    # fuel is always there too (at FAR=0 if need be), so every wet row uses the same model
+    pure_air = FAR == 0. and WAR == 0.
+    wet = WAR != 0.
+    p = _row_problem(len(T), None if pure_air else fuel_type, wet, eq_solver)
+
+    if not pure_air:
+        p['FAR'] = FAR
+    if wet:
+        p['WAR'] = WAR
+    p.set_val('P', np.full(len(T), P), units='Pa')
+    p.set_val('T', T, units='degK')
+    p.run_model()
+
+    return np.array([p.get_val(f'eq.{name}', units=units) for name, units in PROP_UNITS.items()])
+
+
+def _compute_row(args):
+    idx, FAR, WAR, P, T, fuel_type, eq_solver = args
+    return idx, compute_row(FAR, P, T, fuel_type, eq_solver, WAR=WAR)
+
+
+def _row_path(chunk_dir, idx):
+    return os.path.join(chunk_dir, f'row_{"_".join(str(i) for i in idx)}.npy')
+
+
+def _rows(FAR, WAR, P, T, fuel_type, eq_solver):
+    """
+    Arguments of `_compute_row` for every row of the grid. Without a WAR axis the row indices
+    are (FAR, P), otherwise (FAR, WAR, P), matching the axes of the tables.
+    """
+    WARs = [0.] if WAR is None else WAR
+    rows = []
+    for i, FAR_i in enumerate(FAR):
+        for k, WAR_k in enumerate(WARs):
+            for j, P_j in enumerate(P):
+                idx = (i, j) if WAR is None else (i, k, j)
+                rows.append((idx, FAR_i, WAR_k, P_j, T, fuel_type, eq_solver))
+    return rows
+
+
+def generate(out_dir, FAR, P, T, fuel_type="Jet-A(g)", num_procs=None, eq_solver='reduced',
+             inverse=False, keep_rows=False, verbose=True, WAR=None):
+    """
+    Compute a tabular thermo spec on the FAR x P x T grid and save it to `out_dir`.
+
+    With a `WAR` axis, water is mixed into the air as well and the grid is FAR x WAR x P x T, for
+    use with `TAB_WET_AIR_FUEL_COMPOSITION`. Both ratios are relative to the dry air.
+
+    Rows that are already in `out_dir` from an earlier, interrupted run are not computed again.
+    That is only allowed for the same grid and fuel, anything else raises a ValueError.
+    `num_procs` defaults to the number of cpus; 1 runs everything in this process.
+    With `inverse`, the inverse tables for total_hP and total_SP are added as well.
+
+    Returns the spec.
+    """
+    axes = {'FAR': np.asarray(FAR, dtype=float)}
+    if WAR is not None:
+        axes['WAR'] = np.asarray(WAR, dtype=float)
+    axes['P'] = np.asarray(P, dtype=float)
+    axes['T'] = np.asarray(T, dtype=float)
+
+    chunk_dir = os.path.join(out_dir, 'rows')
+    os.makedirs(chunk_dir, exist_ok=True)
+
+    grid_path = os.path.join(chunk_dir, 'grid.npz')
+    if os.path.exists(grid_path):
+        with np.load(grid_path) as grid:
+            same = (str(grid['fuel_type']) == str(fuel_type) and
+                    sorted(grid.files) == sorted(list(axes) + ['fuel_type']) and
+                    all(np.array_equal(grid[name], val) for name, val in axes.items()))
+        if not same:
+            raise ValueError(f'{out_dir} holds a partial table for a different grid or fuel. '
+                             'Use a new output directory, or delete the old one.')
+    else:
+        np.savez(grid_path, fuel_type=str(fuel_type), **axes)
+
+    rows = _rows(axes['FAR'], axes.get('WAR'), axes['P'], axes['T'], fuel_type, eq_solver)
+    todo = [row for row in rows if not os.path.exists(_row_path(chunk_dir, row[0]))]
+
+    if verbose:
+        print(f'{len(rows) - len(todo)} of {len(rows)} rows already done')
+
+    if num_procs is None:
+        num_procs = os.cpu_count()
+
+    st = time.perf_counter()
+    if num_procs == 1:
+        results = map(_compute_row, todo)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(num_procs)
+        results = pool.imap_unordered(_compute_row, todo)
+
+    try:
+        for count, (idx, row) in enumerate(results):
+            # write and rename, so a row on disk is always complete
+            path = _row_path(chunk_dir, idx)
+            np.save(path + '.tmp.npy', row)
+            os.replace(path + '.tmp.npy', path)
+
+            if verbose and ((count + 1) % 100 == 0 or count + 1 == len(todo)):
+                print(f'{count + 1} of {len(todo)} rows in {time.perf_counter() - st:.1f} s')
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    spec = dict(axes)
+    tables = np.empty((len(PROP_UNITS),) + tuple(len(axis) for axis in axes.values()))
+    for row in rows:
+        idx = row[0]
+        tables[(slice(None),) + idx] = np.load(_row_path(chunk_dir, idx))
+    for name, table in zip(PROP_UNITS, tables):
+        spec[name] = table
+
+    if inverse:
+        spec = add_inverse_tables(spec)
+
+    save_spec(spec, out_dir)
+    if not keep_rows:
+        shutil.rmtree(chunk_dir)
+
+    return spec
+
+
+def _compute_table(FAR, P, T, fuel_type, eq_solver, pool):
+    """
+    (num props, len(FAR), len(P), len(T)) array of every property on the grid.
+    """
+    todo = _rows(FAR, None, P, T, fuel_type, eq_solver)
+    results = map(_compute_row, todo) if pool is None else pool.imap_unordered(_compute_row, todo)
+
+    tables = np.empty((len(PROP_UNITS), len(FAR), len(P), len(T)))
+    for (i, j), row in results:
+        tables[:, i, j] = row
+    return tables
+
+
+def _midpoints(name, axis):
+    # pressures are refined in log space, everything else linearly
+    if name == 'P':
+        return np.sqrt(axis[:-1]*axis[1:])
+    return 0.5*(axis[:-1] + axis[1:])
+
+
+def interpolation_error(axes, tables, mid_tables):
+    """
+    Largest relative error of linear interpolation in every interval of every axis.
+
+    `axes` is the list of the FAR, P and T axes, `tables` the properties on that grid and
+    `mid_tables[d]` the properties computed at the midpoints of axis d (on the grid nodes of the others).
+    Returns {prop: [errors of each interval of axis d for each d]}.
+    """
+    names = list(PROP_UNITS)
+    errors = {}
+    for prop, scale in REFINE_PROPS.items():
+        table = tables[names.index(prop)]
+        spread = np.ptp(table)
+        errors[prop] = []
+        for d, axis in enumerate(axes):
+            exact = mid_tables[d][names.index(prop)]
+            lo = np.take(table, np.arange(len(axis) - 1), axis=d)
+            hi = np.take(table, np.arange(1, len(axis)), axis=d)
+
+            # the interpolation is linear in every axis, even when the midpoint is not
+            shape = [1, 1, 1]
+            shape[d] = -1
+            mid = _midpoints(('FAR', 'P', 'T')[d], axis)
+            t = ((mid - axis[:-1]) / np.diff(axis)).reshape(shape)
+            err = np.abs(lo + t*(hi - lo) - exact)
+            err /= spread if scale == 'spread' else np.abs(exact)
+
+            other = tuple(k for k in range(3) if k != d)
+            errors[prop].append(err.max(axis=other))
+    return errors
+
+
+def refine_grid(FAR, P, T, tol=1e-3, fuel_type="Jet-A(g)", num_procs=None, eq_solver='reduced',
+                max_iter=10, min_fraction=2.**-8, verbose=True):
+    """
+    Refine the FAR, P and T axes until linear interpolation in the table is within `tol`
+    relative error of CEA for h, S, gamma and Cp.
+
+    Every iteration computes the table and CEA at the midpoints of every interval of every axis.
+    Intervals that miss by more than `tol` are split in two (in log space for P), the rest are left
+    alone, so the points end up where the properties are changing quickly. Intervals narrower than
+    `min_fraction` of their axis are never split, so a jump in the data (like the one between the pure
+    air and the vitiated species sets at FAR=0) can't soak up all the points. Stops when nothing
+    needs to be split or after `max_iter` iterations.
+
+    Returns the spec on the final grid and a history with the shape, size in bytes and largest error
+    of each property for every iteration.
+    """
+    axes = [np.asarray(FAR, dtype=float), np.asarray(P, dtype=float), np.asarray(T, dtype=float)]
+
+    if num_procs is None:
+        num_procs = os.cpu_count()
+    pool = multiprocessing.Pool(num_procs) if num_procs > 1 else None
+
+    history = []
+    try:
+        for it in range(max_iter + 1):
+            tables = _compute_table(*axes, fuel_type, eq_solver, pool)
+
+            mid_tables = []
+            for d, name in enumerate(('FAR', 'P', 'T')):
+                mid_axes = list(axes)
+                mid_axes[d] = _midpoints(name, axes[d])
+                mid_tables.append(_compute_table(*mid_axes, fuel_type, eq_solver, pool))
+            errors = interpolation_error(axes, tables, mid_tables)
+
+            shape = tuple(len(axis) for axis in axes)
+            max_errors = {prop: max(err.max() for err in errs) for prop, errs in errors.items()}
+            history.append({'shape': shape, 'bytes': tables.nbytes, 'errors': max_errors})
+            if verbose:
+                print(f'{it}: {"x".join(str(n) for n in shape)} grid, {tables.nbytes/2**20:.2f} MB, max error ' +
+                      ', '.join(f'{prop} {err:.2e}' for prop, err in max_errors.items()))
+
+            split = []
+            for d, name in enumerate(('FAR', 'P', 'T')):
+                axis = np.log(axes[d]) if name == 'P' else axes[d]
+                wide = np.diff(axis) > min_fraction*(axis[-1] - axis[0])
+                split.append((np.max([errs[d] for errs in errors.values()], axis=0) > tol) & wide)
+            if it == max_iter or not any(np.any(s) for s in split):
+                break
+
+            for d, name in enumerate(('FAR', 'P', 'T')):
+                new = _midpoints(name, axes[d])[split[d]]
+                axes[d] = np.sort(np.concatenate((axes[d], new)))
+    finally:
+        if pool is not None:
+            pool.terminate()
+
+    if verbose and max(max_errors.values()) > tol:
+        print(f'Stopped short of the {tol:.1e} error target.')
+
+    spec = {'FAR': axes[0], 'P': axes[1], 'T': axes[2]}
+    for name, table in zip(PROP_UNITS, tables):
+        spec[name] = table
+
+    return spec, history
+
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Generate tabular thermo data with CEA')
+    parser.add_argument('out_dir', help='directory to write the table to. Rerun with the same one to resume')
+    parser.add_argument('--FAR', nargs=3, type=float, default=[0., 0.05, 20], metavar=('START', 'STOP', 'NUM'),
+                        help='evenly spaced fuel-air ratios')
+    parser.add_argument('--P', nargs=3, type=float, default=[1., 1e7, 110], metavar=('START', 'STOP', 'NUM'),
+                        help='log spaced pressures in Pa')
+    parser.add_argument('--T', nargs=3, type=float, default=[100., 3500., 100], metavar=('START', 'STOP', 'NUM'),
+                        help='evenly spaced temperatures in degK')
+    parser.add_argument('--logT', action='store_true',
+                        help='log space the temperatures instead, for finer steps at low T')
+    parser.add_argument('--WAR', nargs=3, type=float, default=None, metavar=('START', 'STOP', 'NUM'),
+                        help='evenly spaced water-air ratios, for a table of wet air')
+    parser.add_argument('--fuel', default='Jet-A(g)', help='reactant mixed into the air')
+    parser.add_argument('--procs', type=int, default=None, help='number of processes. Defaults to the number of cpus')
+    parser.add_argument('--eq_solver', default='reduced', choices=('newton', 'reduced'),
+                        help='method used to converge the chemical equilibrium')
+    parser.add_argument('--inverse', action='store_true',
+                        help='also write the inverse tables used by TABULAR total_hP and total_SP')
+    parser.add_argument('--keep_rows', action='store_true', help="don't delete the per row files when done")
+    parser.add_argument('--tol', type=float, default=None,
+                        help='refine the axes until interpolation is within this relative error of CEA. '
+                             'Refined runs can not be resumed')
+    parser.add_argument('--max_iter', type=int, default=10, help='most refinement iterations with --tol')
+    args = parser.parse_args()
+
+    FAR = np.linspace(args.FAR[0], args.FAR[1], int(args.FAR[2]))
+    P = np.logspace(np.log10(args.P[0]), np.log10(args.P[1]), int(args.P[2]))
+    if args.logT:
+        T = np.geomspace(args.T[0], args.T[1], int(args.T[2]))
+    else:
+        T = np.linspace(args.T[0], args.T[1], int(args.T[2]))
+    WAR = None if args.WAR is None else np.linspace(args.WAR[0], args.WAR[1], int(args.WAR[2]))
+
+    if args.tol is None:
+        generate(args.out_dir, FAR, P, T, fuel_type=args.fuel, num_procs=args.procs, eq_solver=args.eq_solver,
+                 inverse=args.inverse, keep_rows=args.keep_rows, WAR=WAR)
+    else:
+        if WAR is not None:
+            parser.error('--tol only refines FAR, P and T tables, it can not be used with --WAR')
+        spec, history = refine_grid(FAR, P, T, tol=args.tol, fuel_type=args.fuel, num_procs=args.procs,
+                                    eq_solver=args.eq_solver, max_iter=args.max_iter)
+        if args.inverse:
+            spec = add_inverse_tables(spec)
+        save_spec(spec, args.out_dir)
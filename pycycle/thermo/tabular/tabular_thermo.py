@@ -2,6 +2,8 @@ import numpy as np
 import openmdao.api as om
 
 from pycycle.constants import TAB_AIR_FUEL_COMPOSITION, AIR_JETA_TAB_SPEC
+from pycycle.thermo.tabular.tab_props import TabularProps, TAB_MODES, TAB_INTERP_METHODS
+from pycycle.thermo.tabular.tab_static import TabularStatic
 
 
 class SetTotalTP(om.Group):
@@ -21,6 +23,23 @@ class SetTotalTP(om.Group):
 
         sorted_compo = sorted(composition.keys())
 
+        if interp_method in TAB_INTERP_METHODS:
+            # all the properties share one grid, so find the cell once for all of them
+            self.add_subsystem('tab', TabularProps(spec=spec, composition=composition,
+                                                   interp_method=interp_method),
+                               promotes_inputs=['composition', 'P', 'T'],
+                               promotes_outputs=['h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R'])
+        else:
+            self._add_metamodel(interp_method, spec, composition)
+
+        # required part of the SetTotalTP API for flow setup
+        # use a sorted list of keys, so dictionary hash ordering doesn't bite us 
+        # loop over keys and create a vector of mass fractions
+        self.composition = [composition[k] for k in sorted_compo]
+
+    def _add_metamodel(self, interp_method, spec, composition):
+        sorted_compo = sorted(composition.keys())
+
         interp = om.MetaModelStructuredComp(method=interp_method, extrapolate=True)
         self.add_subsystem('tab', interp, promotes_inputs=['P', 'T'], 
                                           promotes_outputs=['h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R'])
@@ -41,7 +60,36 @@ class SetTotalTP(om.Group):
         interp.add_output('rho', 1.0, units='kg/m**3', training_data=spec['rho'])
         interp.add_output('R', 287.0, units='J/kg/degK', training_data=spec['R'])
 
-        # required part of the SetTotalTP API for flow setup
-        # use a sorted list of keys, so dictionary hash ordering doesn't bite us 
-        # loop over keys and create a vector of mass fractions
-        self.composition = [composition[k] for k in sorted_compo]
+
+
+def inverse_lookup(mode, spec=None, composition=None, interp_method='slinear', **kwargs):
+    """
+    Explicit T lookup for 'hP' or 'SP' from the inverse tables of the spec.
+
+    Returns None when the spec doesn't have the inverse table for that mode, so the caller can
+    fall back to converging a balance on T. The inverse tables invert the multilinear
+    interpolation, so they're only used with 'slinear'.
+    """
+    if spec is None or interp_method != 'slinear' or TAB_MODES[mode][1][1] not in spec:
+        return None
+
+    if composition is None:
+        composition = TAB_AIR_FUEL_COMPOSITION
+
+    return TabularProps(spec=spec, composition=composition, mode=mode)
+
+
+def static_solve(mode, spec=None, composition=None, interp_method='slinear', **kwargs):
+    """
+    Explicit static state for 'MN', 'area' or 'Ps' mode, solved inside a TabularStatic.
+
+    Returns None for the interpolation methods SetTotalTP leaves to MetaModelStructuredComp, since
+    the solve interpolates the table itself and has to agree with the properties computed from it.
+    """
+    if spec is None or interp_method not in TAB_INTERP_METHODS:
+        return None
+
+    if composition is None:
+        composition = TAB_AIR_FUEL_COMPOSITION
+
+    return TabularStatic(spec=spec, composition=composition, mode=mode, interp_method=interp_method)
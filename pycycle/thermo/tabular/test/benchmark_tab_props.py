@@ -0,0 +1,47 @@
+import time
+import unittest
+
+import openmdao.api as om
+
+from pycycle.constants import TAB_AIR_FUEL_COMPOSITION
+from pycycle.thermo.tabular.tabular_thermo import SetTotalTP
+from pycycle.thermo.tabular.test.test_tab_props import metamodel, TAB_SPEC
+
+
+class TabularPropsBenchmark(unittest.TestCase):
+
+    def benchmark_eval(self):
+        n_evals = 2000
+
+        for label, model, compo_name in (('MetaModelStructuredComp', metamodel(TAB_SPEC), 'FAR'),
+                                         ('TabularProps', SetTotalTP(spec=TAB_SPEC,
+                                                                     composition=TAB_AIR_FUEL_COMPOSITION),
+                                          'composition')):
+            p = om.Problem(model)
+            p.setup()
+            p.final_setup()
+            p[compo_name] = 0.02
+            p['P'] = 3e5
+            comp = p.model.tab if label == 'TabularProps' else p.model
+
+            # move T every time, so nothing is reused from the previous evaluation
+            st = time.perf_counter()
+            for i in range(n_evals):
+                p['T'] = 1000. + i*0.1
+                comp.run_apply_nonlinear()
+                comp.run_linearize()
+            t_total = (time.perf_counter() - st) / n_evals
+
+            # just the interpolation, without the framework around it
+            st = time.perf_counter()
+            for i in range(n_evals):
+                comp._inputs['T'] = 1000. + i*0.1
+                comp.compute(comp._inputs, comp._outputs)
+            t_compute = (time.perf_counter() - st) / n_evals
+
+            print(f'\n{label}: {t_total*1e6:.1f} us per compute + compute_partials, '
+                  f'{t_compute*1e6:.1f} us per compute')
+
+
+if __name__ == "__main__":
+    unittest.main()
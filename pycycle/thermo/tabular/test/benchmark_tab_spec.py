@@ -0,0 +1,71 @@
+import os
+import sys
+import pickle
+import time
+import shutil
+import subprocess
+import tempfile
+import unittest
+
+import numpy as np
+
+from pycycle.constants import tab_spec_path
+from pycycle.thermo.tabular.tab_spec import save_spec, load_spec
+
+
+_IMPORT_SCRIPT = """
+import time
+st = time.perf_counter()
+import pycycle.api as pyc
+t_import = time.perf_counter() - st
+st = time.perf_counter()
+pyc.AIR_JETA_TAB_SPEC['h']
+t_first = time.perf_counter() - st
+print(t_import, t_first)
+"""
+
+
+class TabSpecBenchmark(unittest.TestCase):
+
+    def benchmark_import_time(self):
+        # fresh interpreters, so nothing is already imported
+        t_import = []
+        t_first = []
+        for i in range(5):
+            out = subprocess.check_output([sys.executable, '-c', _IMPORT_SCRIPT])
+            t_i, t_f = (float(v) for v in out.split())
+            t_import.append(t_i)
+            t_first.append(t_f)
+
+        print(f'\nimport pycycle.api: {min(t_import)*1e3:.1f} ms  '
+              f'first access of AIR_JETA_TAB_SPEC: {min(t_first)*1e3:.1f} ms')
+
+    def benchmark_load(self):
+        # the default table, and a made up one on a much finer grid
+        fine = {'FAR': np.linspace(0., 0.05, 50), 'P': np.linspace(1e3, 5e6, 100), 'T': np.linspace(150., 2500., 200)}
+        for name in ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R'):
+            fine[name] = np.random.random((50, 100, 200))
+
+        tempdir = tempfile.mkdtemp()
+        try:
+            for label, spec in (('default', load_spec(tab_spec_path)), ('fine', fine)):
+                pkl_path = os.path.join(tempdir, f'{label}.pkl')
+                with open(pkl_path, 'wb') as f:
+                    pickle.dump(spec, f)
+                npy_dir = os.path.join(tempdir, label)
+                save_spec(spec, npy_dir)
+
+                for path in (pkl_path, npy_dir):
+                    st = time.perf_counter()
+                    for i in range(10):
+                        spec = load_spec(path)
+                        # touch everything, so the memory mapped version pays for reading the pages too
+                        total = sum(np.sum(val) for val in spec.values())
+                    print(f'\n{label} table, {os.path.basename(path)}: '
+                          f'{(time.perf_counter() - st)/10*1e3:.2f} ms per load')
+        finally:
+            shutil.rmtree(tempdir)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import time
+import unittest
+
+import numpy as np
+
+from pycycle.thermo.tabular.tab_thermo_gen import refine_grid, interpolation_error, _compute_table, _midpoints
+
+
+class TabThermoGenBenchmark(unittest.TestCase):
+
+    def benchmark_refine(self):
+        tol = 1e-3
+
+        st = time.perf_counter()
+        spec, history = refine_grid(np.linspace(0., 0.05, 3), np.logspace(0, 7, 8), np.linspace(100., 3500., 10),
+                                    tol=tol)
+        print(f'\nadaptive, {tol:.0e} target: {time.perf_counter() - st:.1f} s')
+
+        # the hand picked uniform grid of the default table, with the same error measure
+        axes = [np.linspace(0., 0.05, 20), np.logspace(0, 7, 110), np.linspace(100., 3500., 100)]
+        tables = _compute_table(*axes, "Jet-A(g)", 'reduced', None)
+        mid_tables = []
+        for d, name in enumerate(('FAR', 'P', 'T')):
+            mid_axes = list(axes)
+            mid_axes[d] = _midpoints(name, axes[d])
+            mid_tables.append(_compute_table(*mid_axes, "Jet-A(g)", 'reduced', None))
+        errors = interpolation_error(axes, tables, mid_tables)
+        print(f'uniform 20x110x100 grid, {tables.nbytes/2**20:.2f} MB, max error ' +
+              ', '.join(f'{prop} {max(err.max() for err in errs):.2e}' for prop, errs in errors.items()))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import os
+import json
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from pycycle.thermo.tabular.tab_thermo_gen import generate, PROP_UNITS
+from pycycle.thermo.tabular.tab_cea_comparison import envelope_points, compare_points, run_cycle, \
+    write_results
+
+
+class TabCEAComparisonTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_envelope_points(self):
+        FAR, P, T = envelope_points(50, seed=3, FAR=(0., 0.04), P=(1e4, 1e6), T=(300., 2000.))
+        FAR2, P2, T2 = envelope_points(50, seed=3, FAR=(0., 0.04), P=(1e4, 1e6), T=(300., 2000.))
+
+        np.testing.assert_array_equal(FAR, FAR2)
+        np.testing.assert_array_equal(P, P2)
+        np.testing.assert_array_equal(T, T2)
+
+        self.assertTrue(np.all((FAR >= 0.) & (FAR <= 0.04)))
+        self.assertTrue(np.all((P >= 1e4) & (P <= 1e6)))
+        self.assertTrue(np.all((T >= 300.) & (T <= 2000.)))
+
+        FAR3, _, _ = envelope_points(50, seed=4)
+        self.assertFalse(np.array_equal(FAR, FAR3))
+
+    def test_compare_points_on_grid(self):
+        FAR = np.array([0., 0.03])
+        P = np.array([1e4, 1e6])
+        T = np.array([300., 800., 1500., 2200.])
+        spec = generate(os.path.join(self.tempdir, 'air_jetA'), FAR, P, T, num_procs=1, verbose=False)
+
+        # the table is exact at its own grid points
+        res = compare_points([0., 0.03, 0.03], [1e4, 1e6, 1e4], [800., 1500., 2200.], spec=spec)
+
+        self.assertEqual(res['num_points'], 3)
+        self.assertEqual(len(res['points']), 3)
+        self.assertEqual(sorted(res['max_error']), sorted(PROP_UNITS))
+        for name, err in res['max_error'].items():
+            assert_near_equal(err, 0., 1e-6)
+        self.assertGreater(res['CEA_time_per_point'], 0.)
+        self.assertGreater(res['TABULAR_time_per_point'], 0.)
+
+    def test_run_cycle(self):
+
+        def make_problem():
+            prob = om.Problem()
+            prob.model.add_subsystem('comp', om.ExecComp('y = 2.*x'), promotes=['*'])
+            return prob
+
+        def setup_values(prob):
+            prob['x'] = 3.
+
+        res = run_cycle(make_problem, setup_values, outputs=('y',))
+
+        self.assertTrue(res['converged'])
+        self.assertEqual(res['newton_iterations'], 0)
+        self.assertEqual(res['outputs'], {'y': [6.]})
+
+        path = os.path.join(self.tempdir, 'results.json')
+        write_results(path, {'cycles': {'double': res}, 'error': np.float64(1e-3)})
+
+        with open(path) as f:
+            data = json.load(f)
+
+        self.assertIn('pycycle', data['versions'])
+        self.assertEqual(data['cycles']['double']['outputs'], {'y': [6.]})
+        self.assertEqual(data['error'], 1e-3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import gc
+import os
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
+
+from pycycle.constants import TAB_AIR_FUEL_COMPOSITION, pkg_path
+from pycycle.thermo.tabular import tab_props
+from pycycle.thermo.tabular.tab_props import TabularProps, TAB_PROPS
+from pycycle.thermo.tabular.tabular_thermo import SetTotalTP
+from pycycle.thermo.tabular.tab_spec import LazySpec
+
+
+# the coarse table that ships with pycycle, so these tests don't depend on the default one
+TAB_SPEC = LazySpec(os.path.join(pkg_path, 'thermo', 'tabular', 'air_jetA_coarse.pkl'))
+
+
+PROPS = [name for name, _, _ in TAB_PROPS]
+
+# well past the grid. Not as far for splines, whose cubic terms blow up the values and the round off
+EXTRAPOLATED = {'slinear': (0.08, 1e8, 4000.), 'cubic': (0.06, 2e6, 2800.)}
+
+
+def metamodel(spec, method='slinear'):
+    # the generic interpolator TabularProps replaces
+    interp = om.MetaModelStructuredComp(method=method, extrapolate=True)
+    interp.add_input('FAR', 0.0, training_data=spec['FAR'])
+    interp.add_input('P', 101325.0, units='Pa', training_data=spec['P'])
+    interp.add_input('T', 273.0, units='degK', training_data=spec['T'])
+    for name, val, units in TAB_PROPS:
+        interp.add_output(name, val, units=units, training_data=spec[name])
+    return interp
+
+
+class TabularPropsTestCase(unittest.TestCase):
+
+    def _problem(self, model):
+        p = om.Problem(model)
+        p.setup(force_alloc_complex=True)
+        return p
+
+    def test_metamodel_match(self):
+        for method in ('slinear', 'cubic'):
+            p = self._problem(SetTotalTP(spec=TAB_SPEC, composition=TAB_AIR_FUEL_COMPOSITION,
+                                         interp_method=method))
+            p_mm = self._problem(metamodel(TAB_SPEC, method))
+            self.assertIsInstance(p.model.tab, TabularProps)
+
+            # inside the grid, on grid points and extrapolated beyond every edge
+            for FAR, P, T in ((0.0, 101325., 518.67), (0.02, 3e5, 1500.), (0.035, 1.4e6, 1733.),
+                              (TAB_SPEC['FAR'][1], TAB_SPEC['P'][2], TAB_SPEC['T'][3]),
+                              (TAB_SPEC['FAR'][-1], TAB_SPEC['P'][-1], TAB_SPEC['T'][-1]),
+                              (-0.001, 1e3, 100.), EXTRAPOLATED[method]):
+                p['composition'] = FAR
+                p_mm['FAR'] = FAR
+                for prob in (p, p_mm):
+                    prob['P'] = P
+                    prob['T'] = T
+                    prob.run_model()
+
+                for name in PROPS:
+                    assert_near_equal(p[name], p_mm[name], 1e-10)
+
+    def test_partials(self):
+        for method in ('slinear', 'cubic'):
+            p = self._problem(SetTotalTP(spec=TAB_SPEC, composition=TAB_AIR_FUEL_COMPOSITION,
+                                         interp_method=method))
+
+            for FAR, P, T in ((0.02, 3e5, 1500.), EXTRAPOLATED[method]):
+                p['composition'] = FAR
+                p['P'] = P
+                p['T'] = T
+                p.run_model()
+
+                data = p.check_partials(out_stream=None, method='cs')
+                assert_check_partials(data, atol=1e-4, rtol=1e-8)
+
+    def test_spline_coeffs_cache(self):
+        grid = [np.linspace(0., 1., 4), np.linspace(1., 2., 5), np.linspace(2., 3., 6)]
+        spec = {'h': np.random.default_rng(0).random((4, 5, 6))}
+
+        coeffs = tab_props._spec_spline_coeffs(spec, grid, 'h', 'cubic')
+        self.assertIs(tab_props._spec_spline_coeffs(spec, grid, 'h', 'cubic'), coeffs)
+
+        # a replaced table gets its own
+        spec['h'] = 2*spec['h']
+        assert_near_equal(tab_props._spec_spline_coeffs(spec, grid, 'h', 'cubic'), 2*coeffs, 1e-12)
+
+        # and they don't outlive it
+        key = (id(spec['h']), 'cubic')
+        self.assertIn(key, tab_props._SPLINE_COEFFS)
+        del spec
+        gc.collect()
+        self.assertNotIn(key, tab_props._SPLINE_COEFFS)
+
+
+if __name__ == "__main__":
+    unittest.main()
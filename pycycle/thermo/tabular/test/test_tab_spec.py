@@ -0,0 +1,162 @@
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal
+
+from pycycle.constants import TAB_AIR_FUEL_COMPOSITION
+from pycycle.thermo.tabular.tab_spec import LazySpec, save_spec, load_spec, add_inverse_tables, \
+    add_spline_coeffs
+from pycycle.thermo.tabular.tabular_thermo import SetTotalTP
+
+
+def _spec():
+    FAR = np.array([0., 0.02, 0.04])
+    P = np.array([1e4, 1e5, 1e6])
+    T = np.array([300., 1000., 2000.])
+    shape = (len(FAR), len(P), len(T))
+
+    FAR_g, P_g, T_g = np.meshgrid(FAR, P, T, indexing='ij')
+    R = 287. + 10.*FAR_g
+    Cp = 1000. + 0.2*T_g + 500.*FAR_g
+
+    return {'FAR': FAR, 'P': P, 'T': T, 'h': Cp*T_g, 'S': Cp*np.log(T_g) - R*np.log(P_g),
+            'gamma': Cp/(Cp - R), 'Cp': Cp, 'Cv': Cp - R, 'rho': P_g/(R*T_g), 'R': R}
+
+
+class TabSpecTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.spec = _spec()
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def _check(self, spec):
+        self.assertEqual(sorted(spec), sorted(self.spec))
+        for name, val in self.spec.items():
+            assert_near_equal(np.asarray(spec[name]), val, 1e-15)
+
+    def test_npy_dir(self):
+        path = os.path.join(self.tempdir, 'air')
+        save_spec(self.spec, path)
+
+        spec = load_spec(path)
+        self._check(spec)
+        self.assertIsInstance(spec['h'], np.memmap)
+        # shared pages, so nobody gets to write to them
+        self.assertFalse(spec['h'].flags.writeable)
+
+        spec = load_spec(path, mmap=False)
+        self._check(spec)
+        self.assertNotIsInstance(spec['h'], np.memmap)
+
+    def test_npz(self):
+        path = os.path.join(self.tempdir, 'air.npz')
+        np.savez(path, **self.spec)
+        self._check(load_spec(path))
+
+    def test_pickle(self):
+        path = os.path.join(self.tempdir, 'air.pkl')
+        with open(path, 'wb') as f:
+            pickle.dump(self.spec, f)
+        self._check(load_spec(path))
+
+    def test_lazy(self):
+        pkl_path = os.path.join(self.tempdir, 'air.pkl')
+        npy_path = os.path.join(self.tempdir, 'air')
+
+        spec = LazySpec(npy_path, pkl_path)
+        self.assertFalse(spec.loaded)
+
+        with self.assertRaises(FileNotFoundError):
+            spec['h']
+
+        # only the legacy pickle is there
+        with open(pkl_path, 'wb') as f:
+            pickle.dump(self.spec, f)
+        spec = LazySpec(npy_path, pkl_path)
+        self._check(spec)
+        self.assertTrue(spec.loaded)
+        self.assertNotIsInstance(spec['h'], np.memmap)
+
+        # the npy directory takes precedence
+        save_spec(self.spec, npy_path)
+        spec = LazySpec(npy_path, pkl_path)
+        self.assertFalse(spec.loaded)
+        self._check(spec)
+        self.assertIsInstance(spec['h'], np.memmap)
+
+    def test_set_total_tp(self):
+        path = os.path.join(self.tempdir, 'air')
+        save_spec(self.spec, path)
+
+        results = []
+        for spec in (self.spec, LazySpec(path)):
+            p = om.Problem()
+            p.model = SetTotalTP(spec=spec, composition=TAB_AIR_FUEL_COMPOSITION)
+            p.setup()
+            p['composition'] = 0.03
+            p['P'] = 3e5
+            p['T'] = 1500.
+            p.run_model()
+            results.append([p.get_val(name)[0] for name in ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R')])
+
+        assert_near_equal(results[1], results[0], 1e-15)
+
+    def test_inverse_tables(self):
+        spec = add_inverse_tables(self.spec, num=11, refine=2)
+
+        assert_near_equal(spec['FAR_inv'], [0., 0.01, 0.02, 0.03, 0.04], 1e-15)
+        assert_near_equal(spec['P_inv'], [1e4, 5.5e4, 1e5, 5.5e5, 1e6], 1e-15)
+        self.assertEqual(spec['T_hP'].shape, (5, 5, 11))
+        self.assertEqual(spec['T_SP'].shape, (5, 5, 11))
+
+        # rows on the original grid are exact inverses of the linear interpolation in T
+        for prop, T_name, axis_name in (('h', 'T_hP', 'h_hP'), ('S', 'T_SP', 'S_SP')):
+            row = self.spec[prop][1, 2]
+            axis = spec[axis_name]
+            inside = (axis >= row[0]) & (axis <= row[-1])
+            assert_near_equal(spec[T_name][2, 4][inside], np.interp(axis[inside], row, self.spec['T']), 1e-12)
+
+        # the original data is still there
+        self._check({name: spec[name] for name in self.spec})
+
+        bad = dict(self.spec, h=-self.spec['h'])
+        with self.assertRaises(ValueError):
+            add_inverse_tables(bad)
+
+    def test_spline_coeffs(self):
+        spec = add_spline_coeffs(self.spec)
+
+        for name in ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R'):
+            self.assertEqual(spec[f'{name}_cubic'].shape, (8, 3, 3, 3))
+            assert_near_equal(spec[f'{name}_cubic'][0], self.spec[name], 1e-15)
+        self._check({name: spec[name] for name in self.spec})
+
+        # saved and loaded with the spec, and giving the same properties as computing them at setup
+        path = os.path.join(self.tempdir, 'air')
+        save_spec(spec, path)
+
+        results = []
+        for spec in (self.spec, LazySpec(path)):
+            p = om.Problem()
+            p.model = SetTotalTP(spec=spec, composition=TAB_AIR_FUEL_COMPOSITION, interp_method='cubic')
+            p.setup()
+            p['composition'] = 0.03
+            p['P'] = 3e5
+            p['T'] = 1500.
+            p.run_model()
+            results.append([p.get_val(name)[0] for name in ('h', 'S', 'gamma', 'Cp', 'Cv', 'rho', 'R')])
+
+        assert_near_equal(results[1], results[0], 1e-14)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import itertools
+import os
+import unittest
+
+import numpy as np
+
+import openmdao.api as om
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
+
+from pycycle.constants import TAB_AIR_FUEL_COMPOSITION, pkg_path
+from pycycle.thermo.tabular.tab_static import TabularStatic
+from pycycle.thermo.tabular.tabular_thermo import SetTotalTP
+from pycycle.thermo.thermo import Thermo
+from pycycle.thermo.tabular.tab_spec import LazySpec
+
+
+# the coarse table that ships with pycycle, so these tests don't depend on the default one
+TAB_SPEC = LazySpec(os.path.join(pkg_path, 'thermo', 'tabular', 'air_jetA_coarse.pkl'))
+
+
+class TabularStaticTestCase(unittest.TestCase):
+
+    def _problem(self, mode, method):
+        p = om.Problem()
+        p.model.add_subsystem('static', TabularStatic(spec=TAB_SPEC, composition=TAB_AIR_FUEL_COMPOSITION,
+                                                      mode=mode, interp_method=method), promotes=['*'])
+        p.setup(force_alloc_complex=True)
+        p['composition'] = 0.02
+        p.set_val('S', 7600., units='J/kg/degK')
+        if mode != 'Ps':
+            p.set_val('ht', 1.2e6, units='J/kg')
+            p.set_val('W', 20., units='kg/s')
+            p.set_val('guess:Pt', 3., units='bar')
+        return p
+
+    def _props(self, FAR, Ps, Ts, method):
+        p = om.Problem(SetTotalTP(spec=TAB_SPEC, composition=TAB_AIR_FUEL_COMPOSITION, interp_method=method))
+        p.setup()
+        p['composition'] = FAR
+        p.set_val('P', Ps, units='Pa')
+        p.set_val('T', Ts, units='degK')
+        p.run_model()
+        return p
+
+    def test_static_state(self):
+        for method, (mode, var, val) in itertools.product(('slinear', 'cubic'),
+                                                          (('MN', 'MN', 0.6), ('area', 'area', 0.05), ('Ps', 'Ps', 2e5))):
+            p = self._problem(mode, method)
+            p[var] = val
+            p.run_model()
+
+            Ps = p.get_val('Ps', units='Pa')
+            props = self._props(0.02, Ps, p.get_val('T', units='degK'), method)
+
+            # same entropy as the total state, with the kinetic energy making up the difference in h
+            assert_near_equal(props.get_val('S', units='J/kg/degK'), 7600., 1e-10)
+            if mode == 'Ps':
+                continue
+
+            V = p.get_val('V', units='m/s')
+            assert_near_equal(props.get_val('h', units='J/kg') + V**2/2, 1.2e6, 1e-10)
+            Vsonic = np.sqrt(props['gamma'] * props.get_val('R', units='J/kg/degK') * p.get_val('T', units='degK'))
+            assert_near_equal(p.get_val('Vsonic', units='m/s'), Vsonic, 1e-10)
+            rho = props.get_val('rho', units='kg/m**3')
+            if mode == 'MN':
+                assert_near_equal(V, 0.6 * Vsonic, 1e-10)
+                assert_near_equal(p.get_val('area', units='m**2'), 20. / (rho * V), 1e-10)
+            else:
+                assert_near_equal(V, 20. / (rho * 0.05), 1e-10)
+                assert_near_equal(p['MN'], V / Vsonic, 1e-10)
+
+            data = p.check_partials(out_stream=None, method='cs')
+            assert_check_partials(data, atol=1e-4, rtol=1e-8)
+
+    def test_thermo_explicit(self):
+        # TABULAR statics don't need a Newton solver in the Thermo group
+        for mode in ('static_MN', 'static_A', 'static_Ps'):
+            p = om.Problem()
+            p.model.add_subsystem('thermo', Thermo(mode=mode, method='TABULAR',
+                                                   thermo_kwargs={'composition': TAB_AIR_FUEL_COMPOSITION,
+                                                                  'spec': TAB_SPEC}))
+            p.setup()
+            self.assertIsInstance(p.model.thermo.nonlinear_solver, om.NonlinearRunOnce)
+            self.assertIsInstance(p.model.thermo.static, TabularStatic)
+
+
+if __name__ == "__main__":
+    unittest.main()
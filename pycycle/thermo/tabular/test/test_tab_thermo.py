@@ -25,12 +25,12 @@ class TabThermoUnitTest(unittest.TestCase):
         p.run_model()
 
         TOL = 5e-4 
-        assert_near_equal(p.get_val('h'), -940746.85004758, tolerance=TOL)
-        assert_near_equal(p.get_val('S'),  7967.73852287, tolerance=TOL)
-        assert_near_equal(p.get_val('gamma'),  1.3094714, tolerance=TOL)
-        assert_near_equal(p.get_val('Cp'),  1214.3836316, tolerance=TOL)
-        assert_near_equal(p.get_val('Cv'),  927.3899091, tolerance=TOL)
-        assert_near_equal(p.get_val('rho'),  1.05951464, tolerance=TOL)
+        assert_near_equal(p.get_val('h'), -940543.79345154, tolerance=TOL)
+        assert_near_equal(p.get_val('S'),  7970.88097093, tolerance=TOL)
+        assert_near_equal(p.get_val('gamma'),  1.30954288, tolerance=TOL)
+        assert_near_equal(p.get_val('Cp'),  1214.26666961, tolerance=TOL)
+        assert_near_equal(p.get_val('Cv'),  927.27292463, tolerance=TOL)
+        assert_near_equal(p.get_val('rho'),  1.06115668, tolerance=TOL)
         assert_near_equal(p.get_val('R'),  286.9948147750743, tolerance=TOL)
 
 
@@ -0,0 +1,132 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from openmdao.utils.assert_utils import assert_near_equal
+
+from pycycle.thermo.tabular.tab_spec import load_spec
+from pycycle.thermo.tabular.tab_thermo_gen import generate, compute_row, refine_grid, interpolation_error, \
+    PROP_UNITS
+
+
+FAR = np.array([0., 0.03])
+P = np.array([1e4, 1e6])
+T = np.array([300., 800., 1500., 2200.])
+
+
+class TabThermoGenTestCase(unittest.TestCase):
+
+    def setUp(self):
+        self.tempdir = tempfile.mkdtemp()
+        self.out_dir = os.path.join(self.tempdir, 'air_jetA')
+
+    def tearDown(self):
+        shutil.rmtree(self.tempdir)
+
+    def test_generate(self):
+        spec = generate(self.out_dir, FAR, P, T, num_procs=1, verbose=False)
+        self.assertFalse(os.path.exists(os.path.join(self.out_dir, 'rows')))
+
+        loaded = load_spec(self.out_dir)
+        self.assertEqual(sorted(loaded), sorted(spec))
+        self.assertEqual(loaded['h'].shape, (2, 2, 4))
+
+        # a row solved on its own, one point at a time
+        for k, T_k in enumerate(T):
+            row = compute_row(0.03, 1e6, T[k:k+1])
+            assert_near_equal(loaded['h'][1, 1, k], row[0, 0], 1e-8)
+            assert_near_equal(loaded['gamma'][1, 1, k], row[2, 0], 1e-8)
+
+        # sanity check against ideal gas
+        assert_near_equal(loaded['rho'], loaded['P'][:, np.newaxis]/(loaded['R']*loaded['T']), 1e-8)
+
+    def test_resume(self):
+        generate(self.out_dir, FAR, P, T, num_procs=1, keep_rows=True, verbose=False)
+        rows = os.path.join(self.out_dir, 'rows')
+
+        # pretend the run got interrupted: one row never finished, and mark one that did
+        os.remove(os.path.join(rows, 'row_1_0.npy'))
+        np.save(os.path.join(rows, 'row_0_1.npy'), np.full((7, 4), 42.))
+
+        spec = generate(self.out_dir, FAR, P, T, num_procs=2, keep_rows=True, verbose=False)
+        assert_near_equal(spec['h'][0, 1], np.full(4, 42.))
+        self.assertTrue(np.all(spec['h'][1, 0] != 42.))
+
+        with self.assertRaises(ValueError):
+            generate(self.out_dir, FAR, P, T + 1., num_procs=1, verbose=False)
+
+    def test_generate_wet(self):
+        WAR = np.array([0., 0.02])
+        generate(self.out_dir, FAR, P, T, num_procs=1, keep_rows=True, verbose=False, WAR=WAR)
+
+        loaded = load_spec(self.out_dir)
+        assert_near_equal(loaded['WAR'], WAR)
+        self.assertEqual(loaded['h'].shape, (2, 2, 2, 4))
+
+        # the dry slice is the same table a dry run makes
+        dry = compute_row(0.03, 1e4, T)
+        assert_near_equal(loaded['h'][1, 0, 0], dry[0], 1e-8)
+
+        # water in pure air, without any fuel
+        wet = compute_row(0., 1e6, T, WAR=0.02)
+        assert_near_equal(loaded['S'][0, 1, 1], wet[1], 1e-8)
+        self.assertTrue(np.all(loaded['R'][:, 1] > loaded['R'][:, 0]))
+
+        # a partial run can't be resumed without its WAR axis
+        with self.assertRaises(ValueError):
+            generate(self.out_dir, FAR, P, T, num_procs=1, verbose=False)
+
+    def test_inverse(self):
+        spec = generate(self.out_dir, FAR, P, T, num_procs=1, inverse=True, verbose=False)
+        self.assertIn('T_hP', load_spec(self.out_dir))
+        self.assertIn('T_SP', spec)
+
+
+class RefineGridTestCase(unittest.TestCase):
+
+    def test_interpolation_error(self):
+        axes = [np.array([0., 0.05]), np.array([1e3, 1e5, 1e7]), np.array([100., 300., 500.])]
+        mids = [np.array([0.025]), np.array([1e4, 1e6]), np.array([200., 400.])]
+
+        def props(FAR, P, T):
+            FAR, P, T = np.meshgrid(FAR, P, T, indexing='ij')
+            # linear in FAR and P, quadratic in T
+            return np.array([1. + FAR + P*1e-7 + (T/100.)**2 for name in PROP_UNITS])
+
+        errors = interpolation_error(axes, props(*axes), [props(mids[0], axes[1], axes[2]),
+                                                          props(axes[0], mids[1], axes[2]),
+                                                          props(axes[0], axes[1], mids[2])])
+        for prop in ('gamma', 'Cp'):
+            assert_near_equal(errors[prop][0], [0.], 1e-15)
+            assert_near_equal(errors[prop][1], [0., 0.], 1e-15)
+            # interpolating (T/100)**2 between nodes 200 K apart misses by 1 at the midpoint,
+            # relative to a value of about 1 + (T/100)**2
+            assert_near_equal(errors[prop][2], [1./(1. + 4.), 1./(1. + 16.)], 1e-4)
+
+        # h and S errors are relative to their spread over the table
+        spread = np.ptp(props(*axes)[0])
+        assert_near_equal(errors['h'][2], [1./spread, 1./spread], 1e-12)
+
+    def test_refine(self):
+        spec, history = refine_grid([0., 0.05], [1e3, 1e6], [300., 1500., 2500.], tol=1e-2, num_procs=1,
+                                    max_iter=2, verbose=False)
+
+        self.assertEqual(len(history), 3)
+        self.assertEqual(history[0]['shape'], (2, 2, 3))
+        self.assertEqual(spec['h'].shape, history[-1]['shape'])
+        for name in ('FAR', 'P', 'T'):
+            self.assertTrue(np.all(np.diff(spec[name]) > 0.))
+
+        # refining only ever helps
+        for prop in ('h', 'S', 'gamma', 'Cp'):
+            self.assertLess(history[-1]['errors'][prop], history[0]['errors'][prop])
+
+        # the points go where the table needs them, which isn't evenly
+        self.assertGreater(len(np.unique(np.round(np.diff(spec['T']), 6))), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,10 @@ class ThermoAddTestCase(unittest.TestCase):
         assert_near_equal(p['fuel:W'], W_fuel_mix, tolerance=tol)
         assert_near_equal(p['composition_out'], (W_fuel_in+W_fuel_mix)/W_air_in, tolerance=tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
+
     def test_mix_2fuel(self): 
 
         p = om.Problem()
@@ -73,6 +77,9 @@ class ThermoAddTestCase(unittest.TestCase):
         assert_near_equal(p['fuel1:W'], p['Fl_I:stat:W']*ratio, tolerance=tol)
         assert_near_equal(p['fuel1:W'], p['Fl_I:stat:W']*ratio, tolerance=tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
 
     def test_mix_1flow(self): 
 
@@ -110,6 +117,9 @@ class ThermoAddTestCase(unittest.TestCase):
         mass_avg_h = (1+2*10)/3.0
         assert_near_equal(p['mass_avg_h'], mass_avg_h, tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
 
     def test_mix_2flow(self): 
 
@@ -155,6 +165,9 @@ class ThermoAddTestCase(unittest.TestCase):
         mass_avg_h = (10*2.+1*10.+2*20.)/13
         assert_near_equal(p['mass_avg_h'], mass_avg_h, tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
 
     def test_mix_1flow2compo(self): 
 
@@ -182,6 +195,9 @@ class ThermoAddTestCase(unittest.TestCase):
 
         assert_near_equal(p['mass_avg_h'], 2., tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
 
     def test_mix_1fuel2compo(self): 
 
@@ -217,6 +233,9 @@ class ThermoAddTestCase(unittest.TestCase):
         assert_near_equal(p['composition_out'][0], (W_fuel_in+W_fuel_mix)/W_air_in, tolerance=tol)
         assert_near_equal(p['composition_out'][1], 0, tolerance=tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
 
     def test_mix_1water2compo(self): 
 
@@ -253,6 +272,20 @@ class ThermoAddTestCase(unittest.TestCase):
         assert_near_equal(p['composition_out'][0], W_fuel_in/W_air_in, tolerance=tol)
         assert_near_equal(p['composition_out'][1], (W_water_in+W_water_mix)/W_air_in, tolerance=tol)
 
+        data = p.check_partials(out_stream=None, method='cs')
+        assert_check_partials(data, atol=1.e-10, rtol=1.e-10)
+
+
+    def test_output_port_data(self): 
+
+        # the outflow keeps the inflow composition keys, so elements downstream get the WAR axis too
+        add = ThermoAdd(mix_mode='reactant', inflow_composition={'FAR':0., 'WAR':0.}, 
+                        mix_composition='WAR', mix_names='water1')
+        self.assertEqual(add.output_port_data(), {'FAR':0., 'WAR':0.})
+
+        add = ThermoAdd(mix_mode='reactant', mix_composition='FAR')
+        self.assertEqual(add.output_port_data(), {'FAR':0.})
+
 if __name__ == "__main__": 
 
     unittest.main()
\ No newline at end of file
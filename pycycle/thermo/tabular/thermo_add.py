@@ -43,6 +43,9 @@ class ThermoAdd(om.ExplicitComponent):
             reactant = self.options['mix_composition']
             self.idx_compo = self.sorted_compo.index(reactant)
 
+        # mixing only changes the ratios, so the outflow has the same composition keys as the inflow
+        return inflow_composition
+
     def setup(self):
 
         spec = self.options['spec']
@@ -84,8 +87,30 @@ class ThermoAdd(om.ExplicitComponent):
         self.add_output('Wout', shape=1, units="lbm/s", desc="total massflow out")
         self.add_output('composition_out', val=inflow_composition_vec)
 
+        n_compo = len(inflow_composition_vec)
+        ar = np.arange(n_compo)
+
+        self.declare_partials('mass_avg_h', ['Fl_I:stat:W', 'Fl_I:tot:h'])
+
+        if mix_mode == 'reactant':
+            # the outflow composition is the inflow one plus the ratios of the reactant
+            self.declare_partials('composition_out', 'Fl_I:tot:composition', rows=ar, cols=ar, val=1.)
+            self.declare_partials(['Wout', 'mass_avg_h'], ['Fl_I:stat:W', 'Fl_I:tot:composition'])
+
+            for name in mix_names:
+                self.declare_partials('composition_out', f'{name}:ratio', rows=[self.idx_compo], cols=[0], val=1.)
+                self.declare_partials(['Wout', 'mass_avg_h'], f'{name}:ratio')
+                self.declare_partials('mass_avg_h', f'{name}:h')
+                self.declare_partials(f'{name}:W', ['Fl_I:stat:W', 'Fl_I:tot:composition', f'{name}:ratio'])
+
+        else:
+            self.declare_partials('composition_out', ['Fl_I:stat:W', 'Fl_I:tot:composition'])
+            self.declare_partials('Wout', 'Fl_I:stat:W', val=1.)
 
-        self.declare_partials('*', '*', method='cs')
+            for name in mix_names:
+                self.declare_partials('composition_out', [f'{name}:W', f'{name}:composition'])
+                self.declare_partials('Wout', f'{name}:W', val=1.)
+                self.declare_partials('mass_avg_h', [f'{name}:W', f'{name}:h'])
 
     def compute(self, inputs, outputs): 
 
@@ -112,17 +137,20 @@ class ThermoAdd(om.ExplicitComponent):
 
         if mix_mode == "reactant": 
 
+            # the air flow doesn't change, so the reactant ratios just add to the inflow ones
+            compo_out = compo_in.copy()
+
             for mix_name in self.mix_names:  
                 ratio = inputs[f'{mix_name}:ratio'] # scalar for reactant mode
 
                 W_air_mix = W_air_in # for reactant mode, we reference from the incoming air
                 W_other_mix = W_air_mix * ratio 
                 outputs[f'{mix_name}:W'] = W_other_mix
-                W_other_out[self.idx_compo] += W_other_mix
+                compo_out[self.idx_compo] += ratio
                 W_out += W_other_mix
                 W_times_h += W_other_mix*inputs[f'{mix_name}:h']
 
-            outputs['composition_out'] = W_other_out/W_air_in
+            outputs['composition_out'] = compo_out
             outputs['Wout'] = W_out
             outputs['mass_avg_h'] = W_times_h/W_out
 
@@ -143,6 +171,72 @@ class ThermoAdd(om.ExplicitComponent):
             outputs['Wout'] = W_out
             outputs['mass_avg_h'] = W_times_h/W_out
 
+    def compute_partials(self, inputs, J):
 
-
-        
+        compo_in = inputs['Fl_I:tot:composition']
+        W_in = inputs['Fl_I:stat:W']
+        h_in = inputs['Fl_I:tot:h']
+
+        air_frac_in = 1./(1+np.sum(compo_in))
+        W_air_in = W_in*air_frac_in
+
+        if self.options['mix_mode'] == "reactant":
+
+            ratio = sum(inputs[f'{mix_name}:ratio'] for mix_name in self.mix_names)
+            W_out = W_in + W_air_in*ratio
+            W_times_h = W_in*h_in
+            W_mix_h = 0.
+            for mix_name in self.mix_names:
+                W_times_h += W_air_in*inputs[f'{mix_name}:ratio']*inputs[f'{mix_name}:h']
+                W_mix_h += inputs[f'{mix_name}:ratio']*inputs[f'{mix_name}:h']
+            mass_avg_h = W_times_h/W_out
+
+            # W_air_in is the only thing depending on the inflow composition
+            dW_air_dcompo = -W_air_in*air_frac_in*np.ones(len(compo_in))
+
+            dW_out_dW = 1 + air_frac_in*ratio
+            dW_out_dcompo = dW_air_dcompo*ratio
+            J['Wout', 'Fl_I:stat:W'] = dW_out_dW
+            J['Wout', 'Fl_I:tot:composition'] = dW_out_dcompo
+
+            J['mass_avg_h', 'Fl_I:stat:W'] = (h_in + air_frac_in*W_mix_h - mass_avg_h*dW_out_dW)/W_out
+            J['mass_avg_h', 'Fl_I:tot:h'] = W_in/W_out
+            J['mass_avg_h', 'Fl_I:tot:composition'] = (dW_air_dcompo*W_mix_h - mass_avg_h*dW_out_dcompo)/W_out
+
+            for mix_name in self.mix_names:
+                mix_ratio = inputs[f'{mix_name}:ratio']
+                mix_h = inputs[f'{mix_name}:h']
+
+                J[f'{mix_name}:W', 'Fl_I:stat:W'] = air_frac_in*mix_ratio
+                J[f'{mix_name}:W', 'Fl_I:tot:composition'] = dW_air_dcompo*mix_ratio
+                J[f'{mix_name}:W', f'{mix_name}:ratio'] = W_air_in
+
+                J['Wout', f'{mix_name}:ratio'] = W_air_in
+                J['mass_avg_h', f'{mix_name}:ratio'] = W_air_in*(mix_h - mass_avg_h)/W_out
+                J['mass_avg_h', f'{mix_name}:h'] = W_air_in*mix_ratio/W_out
+
+        else:
+
+            # every stream, the inflow included, adds its air and its other flows
+            streams = [('Fl_I:stat:W', 'Fl_I:tot:composition', 'Fl_I:tot:h')]
+            streams += [(f'{mix_name}:W', f'{mix_name}:composition', f'{mix_name}:h') for mix_name in self.mix_names]
+
+            W_out = sum(inputs[W_name] for W_name, _, _ in streams)
+            W_times_h = sum(inputs[W_name]*inputs[h_name] for W_name, _, h_name in streams)
+            mass_avg_h = W_times_h/W_out
+
+            air_fracs = [1./(1+np.sum(inputs[compo_name])) for _, compo_name, _ in streams]
+            W_air_out = sum(inputs[W_name]*air_frac for (W_name, _, _), air_frac in zip(streams, air_fracs))
+            W_other_out = sum(inputs[W_name]*air_frac*inputs[compo_name]
+                              for (W_name, compo_name, _), air_frac in zip(streams, air_fracs))
+            compo_out = W_other_out/W_air_out
+
+            for (W_name, compo_name, h_name), air_frac in zip(streams, air_fracs):
+                compo = inputs[compo_name]
+                W_air = inputs[W_name]*air_frac
+
+                J['composition_out', W_name] = air_frac*(compo - compo_out)/W_air_out
+                J['composition_out', compo_name] = W_air/W_air_out*(np.eye(len(compo)) -
+                                                                    air_frac*np.outer(compo - compo_out, np.ones(len(compo))))
+                J['mass_avg_h', W_name] = (inputs[h_name] - mass_avg_h)/W_out
+                J['mass_avg_h', h_name] = inputs[W_name]/W_out
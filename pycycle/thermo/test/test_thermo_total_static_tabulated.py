@@ -5,13 +5,18 @@ import numpy as np
 
 import openmdao.api as om
 
-from openmdao.utils.assert_utils import assert_near_equal
+from openmdao.utils.assert_utils import assert_near_equal, assert_check_partials
 
 from pycycle.thermo.thermo import Thermo
+from pycycle.thermo.tabular.tab_spec import add_inverse_tables, LazySpec
 from pycycle.thermo.cea import species_data
 from pycycle import constants
 
 
+# the coarse table that ships with pycycle, so TestInverseTabular doesn't depend on the default one
+TAB_SPEC = LazySpec(os.path.join(constants.pkg_path, 'thermo', 'tabular', 'air_jetA_coarse.pkl'))
+
+
 class SetTotalSimpleTestCase(unittest.TestCase):
     """Sanity check that compares TP, hP, SP sets manually""" 
 
@@ -182,6 +187,56 @@ class TestSetTotalTabular(unittest.TestCase):
         check(1500., 80.)
 
 
+class TestInverseTabular(unittest.TestCase): 
+    """
+    hP and SP with the inverse tables should land on the same T as the balance, 
+    without any solver
+    """
+
+    def _problem(self, mode, spec): 
+        p = om.Problem()
+        ivc = p.model.add_subsystem('ivc', om.IndepVarComp(), promotes=['*'])
+        ivc.add_output('composition', val=np.zeros(1))
+
+        p.model.add_subsystem('thermo', Thermo(mode=mode, 
+                            method='TABULAR', 
+                            thermo_kwargs={'composition': constants.TAB_AIR_FUEL_COMPOSITION, 
+                                           'spec': spec }), promotes=['*']) 
+        p.setup(force_alloc_complex=True)
+        p.set_solver_print(level=-1)
+        return p
+
+    def test_inverse(self): 
+        spec = add_inverse_tables(TAB_SPEC)
+        p_TP = self._problem('total_TP', TAB_SPEC)
+
+        for mode, var, units in (('total_hP', 'h', 'J/kg'), ('total_SP', 'S', 'J/kg/degK')): 
+            p_bal = self._problem(mode, TAB_SPEC)
+            p_inv = self._problem(mode, spec)
+
+            self.assertIn('balance', p_bal.model.thermo._subsystems_allprocs)
+            self.assertNotIn('balance', p_inv.model.thermo._subsystems_allprocs)
+            self.assertIsInstance(p_inv.model.thermo.nonlinear_solver, om.NonlinearRunOnce)
+
+            for FAR, T, P in ((0., 518.67, 101325.), (0.02, 1500., 3e5), (0.035, 2000., 8e5), (0.01, 800., 5e3)): 
+                p_TP['composition'] = FAR
+                p_TP.set_val('T', T, units='degK')
+                p_TP.set_val('P', P, units='Pa')
+                p_TP.run_model()
+
+                for p in (p_bal, p_inv): 
+                    p['composition'] = FAR
+                    p.set_val(var, p_TP.get_val(f'flow:{var}', units=units), units=units)
+                    p.set_val('P', P, units='Pa')
+                    p.run_model()
+                assert_near_equal(p_bal.get_val('flow:T', units='degK'), T, 1e-6)
+                assert_near_equal(p_inv.get_val('flow:T', units='degK'), T, 5e-3)
+                assert_near_equal(p_inv['flow:gamma'], p_bal['flow:gamma'], 1e-3)
+
+            data = p_inv.check_partials(out_stream=None, method='cs')
+            assert_check_partials(data, atol=1e-6, rtol=1e-6)
+
+
 class TestStaticTabular(unittest.TestCase): 
 
 
@@ -6,6 +6,7 @@ from pycycle.thermo.unit_comps import EngUnitStaticProps, EngUnitProps
 
 from pycycle.thermo.cea import chem_eq as cea_thermo
 from pycycle.thermo.cea import thermo_add as cea_thermo_add
+from pycycle.thermo.cea import frozen as frozen_thermo
 from pycycle.constants import ALLOWED_THERMOS
 
 from pycycle.thermo.tabular import tabular_thermo as tab_thermo
@@ -52,6 +53,39 @@ class Thermo(om.Group):
         #     pass
         elif method == 'TABULAR':
               base_thermo = tab_thermo.SetTotalTP(**thermo_kwargs)
+        elif method == 'FROZEN': 
+            # same species data and compositions as CEA, but without the equilibrium solve
+            base_thermo = frozen_thermo.SetTotalTP(**thermo_kwargs)
+
+        # TABULAR specs with inverse tables give T from h or S directly, so no balance is needed
+        inverse_lookup = None
+        if method == 'TABULAR' and mode in ('total_hP', 'total_SP'):
+            inverse_lookup = tab_thermo.inverse_lookup(mode[-2:], **thermo_kwargs)
+
+        if inverse_lookup is not None:
+            self.add_subsystem('inverse', inverse_lookup,
+                               promotes_inputs=('composition', 'P', mode[-2]),
+                               promotes_outputs=('T',))
+
+        # TABULAR statics solve for Ts (and Ps) inside one explicit component instead of a balance and PsResid
+        static_solve = None
+        if method == 'TABULAR' and 'static' in mode:
+            static_mode = {'static_MN': 'MN', 'static_A': 'area', 'static_Ps': 'Ps'}[mode]
+            static_solve = tab_thermo.static_solve(static_mode, **thermo_kwargs)
+
+        if static_solve is not None:
+            if mode == 'static_Ps':
+                self.add_subsystem('static', static_solve,
+                                   promotes_inputs=('composition', 'S', 'Ps'),
+                                   promotes_outputs=('T',))
+            else:
+                promotes_outputs = ('T', 'Ps', 'V', 'Vsonic', 'area' if mode == 'static_MN' else 'MN')
+                self.add_subsystem('static', static_solve,
+                                   promotes_inputs=('composition', 'S', 'ht', 'W', 'guess:*',
+                                                    'MN' if mode == 'static_MN' else 'area'),
+                                   promotes_outputs=promotes_outputs)
+
+        explicit_T = inverse_lookup is not None or static_solve is not None
 
         in_vars = ('T', 'composition')
         # TODO: remove 'n', 'n_moles' variable from flow station
@@ -78,7 +112,7 @@ class Thermo(om.Group):
            
         # Add implicit components/balances to depending on the mode and connect them to
         # the properties calculation components
-        if mode != "total_TP": 
+        if mode != "total_TP" and not explicit_T: 
             bal = self.add_subsystem('balance', om.BalanceComp(), promotes_outputs=['T'])
 
             # TODO: need to add some kind of T/P ranges to the tabular thermo somehow
@@ -98,16 +132,17 @@ class Thermo(om.Group):
                 self.promotes('balance', inputs=[('rhs:T','h')])
                 self.connect('base_thermo.h', 'balance.lhs:T')
 
-            ##############################################
-            #extra stuff for statics beyond the S balance
-            ##############################################
-            if 'Ps' in mode: 
-                self.add_subsystem('ps_calc', PsCalc(),
-                                   promotes_inputs=['gamma', 'R', 'ht', 'W', 'rho',
-                                                    ('Ts', 'T'), ('hs', 'h')],
-                                   promotes_outputs=['MN', 'V', 'Vsonic', 'area']
-                                   )
-            elif 'A' in mode: 
+        ##############################################
+        #extra stuff for statics beyond the S balance
+        ##############################################
+        if 'Ps' in mode: 
+            self.add_subsystem('ps_calc', PsCalc(),
+                               promotes_inputs=['gamma', 'R', 'ht', 'W', 'rho',
+                                                ('Ts', 'T'), ('hs', 'h')],
+                               promotes_outputs=['MN', 'V', 'Vsonic', 'area']
+                               )
+        elif static_solve is None:
+            if 'A' in mode: 
                 self.add_subsystem('ps_resid', PsResid(mode='area'),
                                    promotes_inputs=['ht', 'R', 'gamma', 'W',
                                                     'rho', 'area', 'guess:*', ('Ts', 'T'), ('hs', 'h')],
@@ -159,6 +194,9 @@ class Thermo(om.Group):
             if 'SP' in mode or 'static' in mode: 
                 self.set_input_defaults('S', 1., units='cal/(g*degK)')
 
+        if explicit_T:
+            # explicit all the way through
+            return
 
         newton = self.nonlinear_solver = om.NewtonSolver()
         newton.options['maxiter'] = 100
@@ -213,7 +251,7 @@ class ThermoAdd(om.Group):
         thermo_kwargs = self.options['thermo_kwargs']
 
         if self.thermo_adder is None: # just in case output_port_data is not called
-            if method == 'CEA': 
+            if method in ('CEA', 'FROZEN'): 
                 self.thermo_adder = cea_thermo_add.ThermoAdd(mix_mode=mix_mode, 
                                                              mix_names=mix_names, 
                                                              **thermo_kwargs)
@@ -235,7 +273,7 @@ class ThermoAdd(om.Group):
         thermo_kwargs = self.options['thermo_kwargs']
 
         if self.thermo_adder is None: # they might call this twice, so just in case we check to make sure it hasn't been set already
-            if method == 'CEA': 
+            if method in ('CEA', 'FROZEN'): 
                 self.thermo_adder = cea_thermo_add.ThermoAdd(mix_mode=mix_mode, 
                                                              mix_names=mix_names, 
                                                              **thermo_kwargs)
@@ -3,11 +3,13 @@ import numpy as np
 
 from openmdao.api import ExplicitComponent
 
+from pycycle.flow_in import PackedOutputs
+
 _full_out_args = inspect.getfullargspec(ExplicitComponent.add_output)
 _allowed_out_args = set(_full_out_args.args[3:] + _full_out_args.kwonlyargs)
 
 
-class UnitCompBase(ExplicitComponent):
+class UnitCompBase(PackedOutputs, ExplicitComponent):
 
     def initialize(self): 
         self.options.declare('fl_name')
@@ -44,8 +46,13 @@ class UnitCompBase(ExplicitComponent):
             else: 
                 self.declare_partials(of=out_name, wrt=in_name, val=1)
 
+    def _copied_from(self, out_name):
+        return out_name[len(self.options['fl_name'])+1:]
+
     def compute(self, inputs, outputs):
-        outputs._data[:] = inputs._data
+        # any packed outputs come after the copies
+        outputs._data[:inputs._data.size] = inputs._data
+        self.compute_packed(inputs, outputs)
 
 class EngUnitProps(UnitCompBase):
     """only job is to provide flow in english units"""
@@ -11,6 +11,10 @@ setup(name='pycycle',
           'pycycle/maps',
           'pycycle/thermo/tabular'
       ],
+      package_data={
+          'pycycle/thermo/cea/thermo_data': ['*.npz'],
+          'pycycle/thermo/tabular': ['air_jetA_wet/*.npy'],
+      },
 
       install_requires=[
         'openmdao>=3.5.0',